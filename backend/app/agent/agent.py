@@ -1,41 +1,52 @@
 from app.agent.prompts.utils import load_prompts
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
+from typing import Optional
+import asyncio
 import time
 import logging
 
-from agents import Agent, Runner
+from agents import Agent, MaxTurnsExceeded, Runner, set_default_openai_api, set_default_openai_client
+from agents.exceptions import AgentsException
 
+from app.agent.budget import AgentBudget, BudgetExceededError, BudgetHooks, use_budget
 from app.agent.tools.generate_coordinates_tool import generate_coordinates
 from app.agent.tools.validate_crossword_tool import validate_crossword
+from app.core.config import AGENT_MAX_SECONDS, AGENT_MAX_TOKENS, AGENT_MAX_TURNS, LAYOUT_MODE, OPENAI_BASE_URL
+from app.core.metrics import AGENT_BUDGET_EXCEEDED, AGENT_TURNS
+from app.core.stages import stage_timer
+from app.core.openai import async_client
+from app.crossword.layout import LayoutConfig, LayoutMode, generate_local_layout
+from app.crossword.models import CrosswordOutput, CrosswordWord
+from app.crossword.repair import repair_layout
+from app.crossword.validation import validate_layout
 
 logger = logging.getLogger(__name__)
 prompts = load_prompts("generate_coordinates.yml")
 
-class CrosswordWord(BaseModel):
-    id: str = Field(description="Number identifier for the word")
-    word: str = Field(description="The word for the crossword")
-    row: int = Field(description="Starting row position (0-9)")
-    col: int = Field(description="Starting column position (0-9)")
-    direction: str = Field(description="Direction: 'across' or 'down'")
-
-class CrosswordOutput(BaseModel):
-    words: list[CrosswordWord] = Field(
-        description="List of words with their positions and coordinates"
-    )
+# Agent runs share the connection pool of the tools
+set_default_openai_client(async_client)
+# Alternative endpoints (like the benchmarks' stand-in server) implement Chat Completions, not the Responses API
+if OPENAI_BASE_URL:
+    set_default_openai_api("chat_completions")
 
 class ValidationResult(BaseModel):
     is_valid_crossword: bool
     reasoning: str
 
+class InvalidLayoutError(Exception):
+    """Raised when no valid layout could be produced for a word list."""
+
 orchestrator = Agent(
         name="Orchestrator",
         instructions="""
         You are the crossword generation coordinator.
         Follow this workflow:
-        1. Send ALL words to generate_coordinates to create maximum coverage
+        1. Send ALL words together with the board size line to generate_coordinates to create maximum coverage
         2. Validate the structured result from generate_coordinates using validate_crossword
-        3. If invalid due to conflicts, iteratively remove problematic words
+        3. If invalid, validate_crossword also returns a 'repaired' layout: the conflicting words are moved
+           or dropped around the valid rest of the grid. Validate that layout instead of calling
+           generate_coordinates again
         4. Goal: maximize the number of words placed while maintaining validity
         """,
         tools=[
@@ -46,26 +57,123 @@ orchestrator = Agent(
 )
 
 
-async def generate_crossword_agent(words: list[dict]) -> CrosswordOutput:
+async def generate_crossword_agent(
+    words: list[dict],
+    mode: Optional[str] = None,
+    rows: int = 10,
+    cols: int = 10
+) -> CrosswordOutput:
     """ Generate crossword coordinates for a list of words.
     Args:
         words_list (list[dict]): A list of dictionaries with 'word' and 'definition' keys.
+        mode (str): Coordinate stage implementation, 'local', 'fused' or 'agent'. Defaults to LAYOUT_MODE.
+        rows (int): Number of board rows.
+        cols (int): Number of board columns.
     Returns:
         CrosswordOutput: Raw agent output with crossword coordinates.
     """
 
+    if LayoutMode(mode or LAYOUT_MODE) != LayoutMode.AGENT:
+        return await _generate_local(words, rows, cols)
+
+    return await _generate_budgeted(words, rows, cols)
+
+
+async def _generate_local(words: list[dict], rows: int, cols: int) -> CrosswordOutput:
+    # The search is CPU-bound; keep it off the event loop
+    output = await asyncio.to_thread(generate_local_layout, words, LayoutConfig(rows=rows, cols=cols))
+    with stage_timer("validate"):
+        validation = validate_layout(output.words, rows=rows, cols=cols)
+    if validation.is_valid_crossword:
+        return output
+
+    logger.error(f"Local layout failed validation: {validation.reasoning}")
+    repair = repair_layout(output.words, rows=rows, cols=cols, validation=validation)
+    if not repair.validation.is_valid_crossword:
+        raise InvalidLayoutError(f"Local layout could not be repaired: {repair.validation.reasoning}")
+    logger.info(f"Repaired local layout (moved {repair.moved}, dropped {repair.dropped})")
+    return repair.output
+
+
+def _budget_reason(error: BaseException) -> Optional[str]:
+    """Reason of the BudgetExceededError an exception was raised from, if any."""
+    while error is not None:
+        if isinstance(error, BudgetExceededError):
+            return error.reason
+        error = error.__cause__ or error.__context__
+    return None
+
+
+async def _generate_budgeted(words: list[dict], rows: int, cols: int) -> CrosswordOutput:
+    """Run the orchestrator within AGENT_MAX_TURNS, AGENT_MAX_TOKENS and AGENT_MAX_SECONDS.
+
+    When the budget runs out, or the final layout is invalid, the best valid
+    layout offered by the tools (or repaired from the final one) is returned,
+    or a local layout if there is none.
+    """
     start_time = time.time()
     logger.info(f"Starting crossword generation for {len(words)} words")
     print("\n\nGenerate Crossword Agent\n")
 
     # Convert words list to string format for the prompt
-    input_message = "\n".join([f"- {item['word']}" for item in words])
+    input_message = f"Board size: {rows}x{cols}\n" + "\n".join([f"- {item['word']}" for item in words])
 
-    # Use the gen_coords_agent to generate crossword coordinates
-    runner = await Runner.run(starting_agent=orchestrator, input=input_message)
+    budget = AgentBudget(
+        max_turns=AGENT_MAX_TURNS,
+        max_tokens=AGENT_MAX_TOKENS,
+        max_seconds=AGENT_MAX_SECONDS,
+        rows=rows,
+        cols=cols
+    )
+    output: Optional[CrosswordOutput] = None
+    with use_budget(budget):
+        try:
+            runner = await asyncio.wait_for(
+                Runner.run(
+                    starting_agent=orchestrator,
+                    input=input_message,
+                    max_turns=budget.max_turns,
+                    hooks=BudgetHooks(budget)
+                ),
+                timeout=budget.max_seconds
+            )
+            output = runner.final_output
+        except MaxTurnsExceeded:
+            reason = "turns"
+        except BudgetExceededError as e:
+            reason = e.reason
+        except AgentsException as e:
+            # The SDK wraps errors raised by hooks around tool calls in UserError
+            reason = _budget_reason(e)
+            if reason is None:
+                raise
+        except asyncio.TimeoutError:
+            reason = "time"
+        else:
+            reason = None
 
     elapsed_time = time.time() - start_time
-    logger.info(f"Crossword generation completed in {elapsed_time:.2f}s")
-    print("Generated coordinates:", runner.final_output)
+    AGENT_TURNS.observe(budget.turns)
+    if reason is not None:
+        AGENT_BUDGET_EXCEEDED.labels(reason=reason).inc()
+        logger.warning(f"Agent budget exceeded ({reason}) after {budget.turns} turns and {budget.usage.tokens} tokens")
+    else:
+        logger.info(f"Crossword generation completed in {elapsed_time:.2f}s after {budget.turns} turns")
+
+    print("Generated coordinates:", output)
+
+    # The final layout wins if it is valid and not smaller than the best one the tools saw
+    if output is not None and (budget.best is None or len(output.words) >= len(budget.best.words)):
+        validation = validate_layout(output.words, rows=rows, cols=cols)
+        if validation.is_valid_crossword:
+            return output
+        logger.warning(f"Agent layout failed validation: {validation.reasoning}")
+        # Fixing the final layout locally is cheaper than falling back to a full one
+        repair = repair_layout(output.words, rows=rows, cols=cols, validation=validation)
+        budget.offer(repair.output.words, repair.validation)
+    if budget.best is not None:
+        logger.info(f"Using best valid layout seen by the agent ({len(budget.best.words)} words)")
+        return budget.best
 
-    return runner.final_output
\ No newline at end of file
+    logger.warning("Agent produced no valid layout, falling back to the local layout engine")
+    return await _generate_local(words, rows, cols)
\ No newline at end of file
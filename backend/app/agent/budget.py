@@ -0,0 +1,122 @@
+"""
+Budgets of agent-mode layout runs.
+
+An AgentBudget bounds one orchestrator run by model turns, tokens (the
+orchestrator's turns plus the completions made by its tools) and
+wall-clock time. Tools offer every layout they see; the best valid one is
+kept so a run that is cut short still has a result.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Sequence
+
+from agents import RunHooks
+
+from app.core.usage import UsageCounter, count_usage
+from app.crossword.models import CrosswordOutput, CrosswordWord
+from app.crossword.validation import CrosswordValidationResult, validate_layout
+
+
+class BudgetExceededError(Exception):
+    """Raised to stop an agent run whose token or time budget is spent."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Agent budget exceeded: {reason}")
+        self.reason = reason
+
+
+@dataclass
+class AgentBudget:
+    """Limits and bookkeeping of one agent run."""
+    max_turns: int
+    max_tokens: int
+    max_seconds: float
+    rows: int = 10
+    cols: int = 10
+    turns: int = 0
+    usage: UsageCounter = field(default_factory=UsageCounter)
+    best: Optional[CrosswordOutput] = None
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def remaining_seconds(self) -> float:
+        return self.max_seconds - (time.perf_counter() - self.started)
+
+    def check(self) -> None:
+        """
+        Raises:
+            BudgetExceededError: If the token or time budget is spent
+        """
+        if self.usage.tokens >= self.max_tokens:
+            raise BudgetExceededError("tokens")
+        if self.remaining_seconds <= 0:
+            raise BudgetExceededError("time")
+
+    def offer(
+        self,
+        words: Sequence[Any],
+        validation: Optional[CrosswordValidationResult] = None
+    ) -> bool:
+        """
+        Keep a layout if it is valid and places more words than the best so far.
+
+        Args:
+            words: Placed words (CrosswordWord instances or equivalent dicts)
+            validation: Validation result of the layout, if already known
+
+        Returns:
+            Whether the layout became the best one
+        """
+        if self.best is not None and len(words) <= len(self.best.words):
+            return False
+        try:
+            validation = validation or validate_layout(words, rows=self.rows, cols=self.cols)
+            if not validation.is_valid_crossword:
+                return False
+            placed = [word if isinstance(word, CrosswordWord) else CrosswordWord.model_validate(word) for word in words]
+        except ValueError:
+            return False
+        self.best = CrosswordOutput(words=placed)
+        return True
+
+
+_budget: ContextVar[Optional[AgentBudget]] = ContextVar("agent_budget", default=None)
+
+
+def current_budget() -> Optional[AgentBudget]:
+    """Budget of the agent run the caller is part of, if any."""
+    return _budget.get()
+
+
+@contextmanager
+def use_budget(budget: AgentBudget) -> Iterator[AgentBudget]:
+    """Make `budget` the current one and count the tokens of every call made inside the block."""
+    token = _budget.set(budget)
+    try:
+        with count_usage(budget.usage):
+            yield budget
+    finally:
+        _budget.reset(token)
+
+
+class BudgetHooks(RunHooks):
+    """Run hooks counting the orchestrator's turns and tokens and stopping spent runs."""
+
+    def __init__(self, budget: AgentBudget):
+        self.budget = budget
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        self.budget.check()
+
+    async def on_llm_end(self, context, agent, response) -> None:
+        self.budget.turns += 1
+        if response.usage is not None:
+            self.budget.usage.tokens += response.usage.total_tokens
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self.budget.check()
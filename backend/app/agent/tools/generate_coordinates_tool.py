@@ -1,25 +1,45 @@
-from app.core.ttt import TTT
+from app.agent.budget import current_budget
+from app.core.ttt import AsyncTTT
 from app.agent.prompts.utils import load_prompts, replace_multiple_placeholders
 from agents import function_tool
+from typing import Tuple
+import re
 
 prompts = load_prompts("generate_coordinates.yml")
 
+BOARD_SIZE_PATTERN = re.compile(r"board size:\s*(\d+)\s*[x×]\s*(\d+)", re.IGNORECASE)
+
+
+def _board_size(input: str) -> Tuple[int, int]:
+    """Read the 'Board size: RxC' line of the input, defaulting to 10x10."""
+    match = BOARD_SIZE_PATTERN.search(input)
+    if match is None:
+        return 10, 10
+    return int(match.group(1)), int(match.group(2))
+
 @function_tool
 async def generate_coordinates(input: str) -> dict:
     """
     Generate crossword coordinates for a list of words.
 
     Args:
-        input (str): A string containing a list of words, each with its definition, formatted as:
+        input (str): A 'Board size: RxC' line followed by the list of words, one per line.
 
     Returns:
         dict: A dictionary with crossword data including words and board_size for frontend.
     """
     print("\n\nGenerate Coordinates tool\n")
 
-    ttt = TTT(model="o3-2025-04-16")
+    ttt = AsyncTTT(model="o3-2025-04-16")
+    rows, cols = _board_size(input)
 
-    system_prompt = prompts["system_prompt"]
+    system_prompt = replace_multiple_placeholders(
+        prompts["system_prompt"],
+        {
+            "rows": str(rows),
+            "cols": str(cols)
+        }
+    )
     print("input\n", input)
     user_prompt = replace_multiple_placeholders(
         prompts["user_prompt"],
@@ -55,11 +75,11 @@ async def generate_coordinates(input: str) -> dict:
                                 },
                                 "row": {
                                     "type": "integer",
-                                    "description": "Starting row position (0-9)"
+                                    "description": f"Starting row position (0-{rows - 1})"
                                 },
                                 "col": {
                                     "type": "integer",
-                                    "description": "Starting column position (0-9)"
+                                    "description": f"Starting column position (0-{cols - 1})"
                                 },
                                 "direction": {
                                     "type": "string",
@@ -75,13 +95,16 @@ async def generate_coordinates(input: str) -> dict:
             }
         )
     ]
-    response = ttt.generate_response_with_tools(messages=messages, tools=tools)
+    response = await ttt.generate_response_with_tools(messages=messages, tools=tools)
     print("Response from generate_coordinates\n", response)
     if response and isinstance(response, dict):
         if response.get("function_name") == "generate_coordinates":
             arguments = response.get("arguments", {})
+            budget = current_budget()
+            if budget is not None:
+                budget.offer(arguments.get("words", []))
             return {
                 "words": arguments.get("words", []),
-                "board_size": {"rows": 10, "cols": 10}
+                "board_size": {"rows": rows, "cols": cols}
             }
     return response
@@ -1,18 +1,124 @@
-from app.core.ttt import TTT
+from typing import Optional
+
+from app.core.ttt import AsyncTTT
+from app.core.config import LAYOUT_MODE, VOCABULARY_ENABLED, VOCABULARY_MIN_POOL, VOCABULARY_SAMPLE_SIZE
+from app.crossword.layout import LayoutMode
+from app.core.vocabulary import get_vocabulary_store
 from app.agent.prompts.utils import load_prompts, replace_multiple_placeholders
+import logging
 
+logger = logging.getLogger(__name__)
 prompts = load_prompts("generate_words.yml")
 
-async def generate_words(theme: str, language: str, level: str) -> list[dict]:
+# Longest word asked for when the board size is not known
+DEFAULT_MAX_WORD_LENGTH = 10
+
+WORDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "words": {
+            "type": "array",
+            "description": "List of words with their definitions",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "word": {
+                        "type": "string",
+                        "description": "The word for the crossword"
+                    },
+                    "definition": {
+                        "type": "string",
+                        "description": "Concise definition of the word"
+                    }
+                },
+                "required": ["word", "definition"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["words"],
+    "additionalProperties": False
+}
+
+async def generate_words(
+    theme: str,
+    language: str,
+    level: str,
+    count: int = VOCABULARY_SAMPLE_SIZE,
+    max_length: Optional[int] = None,
+    mode: Optional[str] = None
+) -> list[dict]:
     """ Generate a list of words based on the given theme, language, and level.
+    Words are sampled from the vocabulary store when its pool for the
+    theme, language and level is large enough (at least three times the
+    requested count); otherwise the model is called and its answer is
+    added to the pool.
+    Args:
+        theme (str): The theme for the words.
+        language (str): The language of the words.
+        level (str): The difficulty level of the words.
+        count (int): Number of words wanted, scaled with the board size.
+        max_length (int): Longest word that fits the board, if known; longer pool words are not sampled.
+        mode (str): Layout mode the words are generated for. Defaults to LAYOUT_MODE.
+    Returns:
+        list[dict]: A list of dictionaries with 'word' and 'definition' keys.
+    """
+    if not VOCABULARY_ENABLED:
+        return await generate_words_llm(
+            theme=theme,
+            language=language,
+            level=level,
+            count=count,
+            max_length=max_length,
+            mode=mode
+        )
+
+    store = get_vocabulary_store()
+    if await store.count(theme, language, level, max_length=max_length) >= max(VOCABULARY_MIN_POOL, 3 * count):
+        return await store.sample(theme, language, level, count, max_length=max_length)
+
+    words = await generate_words_llm(
+        theme=theme,
+        language=language,
+        level=level,
+        count=count,
+        max_length=max_length,
+        mode=mode
+    )
+    await store.add_words(theme, language, level, words)
+    logger.info(f"Vocabulary pool for {theme}/{language}/{level} has {await store.count(theme, language, level)} words")
+    return words
+
+async def generate_words_llm(
+    theme: str,
+    language: str,
+    level: str,
+    count: int = VOCABULARY_SAMPLE_SIZE,
+    max_length: Optional[int] = None,
+    mode: Optional[str] = None
+) -> list[dict]:
+    """ Generate a list of words with the model, bypassing the vocabulary store.
+    In fused layout mode this is a single strict structured-output call.
     Args:
         theme (str): The theme for the words.
         language (str): The language of the words.
         level (str): The difficulty level of the words.
+        count (int): Number of words to ask for.
+        max_length (int): Longest word that fits the board, if known.
+        mode (str): Layout mode the words are generated for. Defaults to LAYOUT_MODE.
     Returns:
         list[dict]: A list of dictionaries with 'word' and 'definition' keys.
     """
-    ttt = TTT(model="gpt-4.1")
+    if LayoutMode(mode or LAYOUT_MODE) == LayoutMode.FUSED:
+        return await generate_words_structured(
+            theme=theme,
+            language=language,
+            level=level,
+            count=count,
+            max_length=max_length or DEFAULT_MAX_WORD_LENGTH
+        )
+
+    ttt = AsyncTTT(model="gpt-4.1")
     
     system_prompt = prompts["system_prompt"]
     user_prompt = replace_multiple_placeholders(
@@ -20,7 +126,9 @@ async def generate_words(theme: str, language: str, level: str) -> list[dict]:
         {
             "theme": theme,
             "language": language, 
-            "level": level
+            "level": level,
+            "count": str(count),
+            "max_length": str(max_length or DEFAULT_MAX_WORD_LENGTH)
         }
     )
 
@@ -60,11 +168,47 @@ async def generate_words(theme: str, language: str, level: str) -> list[dict]:
         )
     ]
     
-    response = ttt.generate_response_with_tools(messages=messages, tools=tools)
+    response = await ttt.generate_response_with_tools(messages=messages, tools=tools)
     
     if response and isinstance(response, dict):
         if response.get("function_name") == "generate_words_list":
             arguments = response.get("arguments", {})
             return arguments.get("words", [])
     
-    return []
\ No newline at end of file
+    return []
+
+async def generate_words_structured(theme: str, language: str, level: str, count: int, max_length: int) -> list[dict]:
+    """ Generate a list of words with one strict structured-output call.
+    The response is guaranteed to match WORDS_SCHEMA, so it goes straight to
+    the local layout engine; words that cannot fit the board are dropped.
+    Args:
+        theme (str): The theme for the words.
+        language (str): The language of the words.
+        level (str): The difficulty level of the words.
+        count (int): Number of words to ask for.
+        max_length (int): Longest word that fits the board.
+    Returns:
+        list[dict]: A list of dictionaries with 'word' and 'definition' keys.
+    """
+    ttt = AsyncTTT(model="gpt-4.1")
+
+    user_prompt = replace_multiple_placeholders(
+        prompts["structured_user_prompt"],
+        {
+            "theme": theme,
+            "language": language,
+            "level": level,
+            "count": str(count),
+            "max_length": str(max_length)
+        }
+    )
+    messages = [
+        ttt.create_system_message(prompts["structured_system_prompt"]),
+        ttt.create_user_message(user_prompt)
+    ]
+
+    response = await ttt.generate_structured_response(messages=messages, name="words_list", schema=WORDS_SCHEMA)
+    words = [item for item in response["words"] if 3 <= len(item["word"].strip()) <= max_length]
+    if len(words) < len(response["words"]):
+        logger.info(f"Dropped {len(response['words']) - len(words)} words that do not fit a board side of {max_length}")
+    return words
@@ -1,23 +1,77 @@
-from app.core.ttt import TTT
+from app.agent.budget import current_budget
+from app.core.ttt import AsyncTTT
 from app.agent.prompts.utils import load_prompts, replace_multiple_placeholders
+from app.core.stages import stage_timer
+from app.crossword.repair import repair_layout
+from app.crossword.validation import validate_layout
 from agents import function_tool
+from typing import Optional, Tuple
+import json
+import logging
 
+logger = logging.getLogger(__name__)
 prompts = load_prompts("validate_crossword.yml")
 
+
+def _parse_words(input: str) -> Optional[Tuple[list[dict], int, int]]:
+    """
+    Extract a list of placed words and the board size from the tool input.
+
+    Accepts either a JSON list of words or an object with a 'words' key and
+    an optional 'board_size', as produced by generate_coordinates. The board
+    defaults to 10x10. Returns None if the input is not structured data.
+    """
+    try:
+        data = json.loads(input)
+    except (TypeError, ValueError):
+        return None
+    board_size = {}
+    if isinstance(data, dict):
+        board_size = data.get("board_size") or {}
+        data = data.get("words")
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        return None
+    try:
+        return data, int(board_size.get("rows", 10)), int(board_size.get("cols", 10))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
 @function_tool
 async def validate_crossword(input: str) -> dict:
     """
     Validate the structure of a crossword grid.
 
     Args:
-        input (str): The input string containing the crossword grid data.
+        input (str): The crossword grid data, preferably the JSON result of generate_coordinates.
 
     Returns:
         dict: A dictionary indicating whether the crossword is valid and any error messages.
+              Structured input is validated locally and also includes the conflicting
+              cells and 'conflicting_word_ids'; an invalid layout comes with a
+              'repaired' layout built around its valid words.
     """
     print("\n\nValidate Crossword tool\n")
 
-    ttt = TTT(model="gpt-4.1")
+    parsed = _parse_words(input)
+    if parsed is not None:
+        words, rows, cols = parsed
+        try:
+            with stage_timer("validate"):
+                validation = validate_layout(words, rows=rows, cols=cols)
+            budget = current_budget()
+            if validation.is_valid_crossword:
+                if budget is not None:
+                    budget.offer(words, validation)
+                return validation.to_dict()
+
+            repair = repair_layout(words, rows=rows, cols=cols, validation=validation)
+            if budget is not None:
+                budget.offer(repair.output.words, repair.validation)
+            return {**validation.to_dict(), "repaired": repair.to_dict(rows, cols)}
+        except ValueError as e:
+            logger.warning(f"Local validation failed, falling back to LLM: {str(e)}")
+
+    ttt = AsyncTTT(model="gpt-4.1")
 
     system_prompt = prompts["system_prompt"]
     print("input\n", input)
@@ -52,7 +106,7 @@ async def validate_crossword(input: str) -> dict:
             }
         )
     ]
-    response = ttt.generate_response_with_tools(messages=messages, tools=tools)
+    response = await ttt.generate_response_with_tools(messages=messages, tools=tools)
     print("Response from validate_crossword\n", response)
     if response and isinstance(response, dict):
         if response.get("function_name") == "validate_crossword":
@@ -0,0 +1,316 @@
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+import asyncio
+import math
+import multiprocessing
+import random
+import time
+import logging
+
+from app.agent.agent import InvalidLayoutError
+from app.agent.tools.generate_words import generate_words_llm
+from app.api.generate_crossword import (
+    DEFAULT_BOARD_SIZE,
+    _index_puzzle,
+    _save_crossword,
+    _transform_crossword_data,
+    _word_count,
+)
+from app.api.schemas import BatchRequest, CrosswordResponse
+from app.core.config import (
+    BATCH_IMAGE_WINDOW,
+    BATCH_LAYOUT_PROCESSES,
+    BATCH_MAX_WORDS_PER_CALL,
+    IMAGE_BATCH_DEADLINE_SECONDS,
+    VOCABULARY_ENABLED,
+)
+from app.core.tti import deadline_placeholder, get_image_scheduler
+from app.core.vocabulary import get_vocabulary_store, pool_key
+from app.crossword.layout import LayoutConfig, generate_local_layout
+from app.crossword.repair import repair_layout
+from app.crossword.validation import validate_layout
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@dataclass(frozen=True)
+class PuzzleSpec:
+    """One puzzle of a batch."""
+    theme: str
+    language: str
+    level: str
+    rows: int = DEFAULT_BOARD_SIZE["rows"]
+    cols: int = DEFAULT_BOARD_SIZE["cols"]
+
+    @property
+    def group(self) -> Tuple[str, str, str]:
+        """Puzzles of a group share one word generation."""
+        return pool_key(self.theme, self.language, self.level)
+
+    @property
+    def word_count(self) -> int:
+        return _word_count({"rows": self.rows, "cols": self.cols})
+
+def parse_puzzle_specs(batch: BatchRequest) -> List[PuzzleSpec]:
+    """Expand a batch request into puzzle specs.
+
+    The request has a "puzzles" list; each entry takes theme, language,
+    level, board_size like /api/generate_crossword and an optional "count"
+    of puzzles to generate with these parameters.
+    """
+    specs: List[PuzzleSpec] = []
+    for entry in batch.puzzles:
+        spec = PuzzleSpec(
+            theme=entry.theme,
+            language=entry.language,
+            level=entry.level,
+            rows=entry.board_size.rows,
+            cols=entry.board_size.cols
+        )
+        specs.extend([spec] * entry.count)
+    return specs
+
+_layout_executor: Optional[ProcessPoolExecutor] = None
+
+def _get_layout_executor() -> ProcessPoolExecutor:
+    global _layout_executor
+    if _layout_executor is None:
+        # spawn: workers must not inherit the event loop, locks or sockets of this process
+        _layout_executor = ProcessPoolExecutor(
+            max_workers=BATCH_LAYOUT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _layout_executor
+
+def shutdown_layout_executor() -> None:
+    """Stop the layout worker processes, if they were started."""
+    global _layout_executor
+    if _layout_executor is not None:
+        _layout_executor.shutdown(wait=False, cancel_futures=True)
+        _layout_executor = None
+
+async def _generate_word_pool(
+    theme: str,
+    language: str,
+    level: str,
+    needed: int,
+    max_length: int,
+    stats: Dict[str, int]
+) -> List[Dict]:
+    """Words for every puzzle of a group, from the vocabulary store or a few large model calls."""
+    store = get_vocabulary_store() if VOCABULARY_ENABLED else None
+    if store is not None and await store.count(theme, language, level, max_length=max_length) >= needed:
+        return await store.sample(theme, language, level, needed, max_length=max_length)
+
+    calls = math.ceil(needed / BATCH_MAX_WORDS_PER_CALL)
+    chunk = math.ceil(needed / calls)
+    stats["word_calls"] += calls
+    results = await asyncio.gather(*(
+        generate_words_llm(theme=theme, language=language, level=level, count=chunk, max_length=max_length)
+        for _ in range(calls)
+    ))
+
+    words: Dict[str, Dict] = {}
+    for result in results:
+        for item in result:
+            if item.get("word") and item.get("definition"):
+                words.setdefault(item["word"].strip().upper(), item)
+    if store is not None:
+        await store.add_words(theme, language, level, list(words.values()))
+        # Widen the pool with earlier words when the model returned fewer than needed
+        if len(words) < needed:
+            for item in await store.sample(theme, language, level, needed):
+                words.setdefault(item["word"].strip().upper(), item)
+    return list(words.values())
+
+def _deal_words(pool: List[Dict], counts: List[int], rng: random.Random) -> List[List[Dict]]:
+    """Split a shuffled word pool across puzzles.
+
+    Every puzzle takes the next `count` words, wrapping around when the pool
+    is exhausted, so puzzles only share words when there are not enough.
+    """
+    pool = list(pool)
+    rng.shuffle(pool)
+    dealt: List[List[Dict]] = []
+    offset = 0
+    for count in counts:
+        count = min(count, len(pool))
+        dealt.append([pool[(offset + i) % len(pool)] for i in range(count)])
+        offset += count
+    return dealt
+
+async def _layout(words: List[Dict], spec: PuzzleSpec):
+    loop = asyncio.get_running_loop()
+    output = await loop.run_in_executor(
+        _get_layout_executor(),
+        generate_local_layout,
+        words,
+        LayoutConfig(rows=spec.rows, cols=spec.cols)
+    )
+    validation = validate_layout(output.words, rows=spec.rows, cols=spec.cols)
+    if validation.is_valid_crossword:
+        return output
+    logger.error(f"Batch layout failed validation: {validation.reasoning}")
+    repair = repair_layout(output.words, rows=spec.rows, cols=spec.cols, validation=validation)
+    if not repair.validation.is_valid_crossword:
+        raise InvalidLayoutError(f"Batch layout could not be repaired: {repair.validation.reasoning}")
+    return repair.output
+
+async def generate_crossword_batch(
+    specs: List[PuzzleSpec],
+    rng: Optional[random.Random] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Generate many crosswords, yielding one record per puzzle as it is finished.
+
+    Puzzles with the same theme, language and level share one word
+    generation, every distinct definition gets one image however many
+    puzzles use it, and layouts run in worker processes. Images are queued
+    one puzzle at a time, for at most BATCH_IMAGE_WINDOW puzzles at once,
+    and each puzzle waits for its images at most IMAGE_BATCH_DEADLINE_SECONDS,
+    so a large batch neither floods the shared image queue nor waits on it
+    forever. Records are
+    {"index", "spec", "crossword"} or {"index", "spec", "error"}; a final
+    {"summary"} record reports the number of model calls saved.
+    """
+    start_time = time.time()
+    rng = rng or random.Random()
+    stats = {"word_calls": 0}
+
+    # Step 1: One word generation per group, split across its puzzles
+    groups: Dict[Tuple[str, str, str], List[int]] = {}
+    for index, spec in enumerate(specs):
+        groups.setdefault(spec.group, []).append(index)
+
+    group_keys = list(groups)
+    pools = await asyncio.gather(*(
+        _generate_word_pool(
+            theme=specs[groups[key][0]].theme,
+            language=specs[groups[key][0]].language,
+            level=specs[groups[key][0]].level,
+            needed=sum(specs[i].word_count for i in groups[key]),
+            max_length=max(max(specs[i].rows, specs[i].cols) for i in groups[key]),
+            stats=stats
+        )
+        for key in group_keys
+    ), return_exceptions=True)
+
+    puzzle_words: Dict[int, List[Dict]] = {}
+    failed: Dict[int, str] = {}
+    for key, pool in zip(group_keys, pools):
+        indices = groups[key]
+        if isinstance(pool, BaseException) or not pool:
+            logger.error(f"Batch word generation for {key} failed: {pool!r}")
+            failed.update({i: "Word generation failed" for i in indices})
+            continue
+        for i, words in zip(indices, _deal_words(pool, [specs[i].word_count for i in indices], rng)):
+            puzzle_words[i] = words
+
+    # Step 2: One image per distinct definition, shared by every puzzle using it
+    definitions = list(dict.fromkeys(
+        item["definition"] for words in puzzle_words.values() for item in words
+    ))
+    requested_images = sum(len(words) for words in puzzle_words.values())
+    logger.info(
+        f"Batch of {len(specs)} puzzles: {stats['word_calls']} word calls, "
+        f"{len(definitions)} images for {requested_images} clues"
+    )
+    image_futures: Dict[str, asyncio.Future] = {}
+    image_window = asyncio.Semaphore(max(1, BATCH_IMAGE_WINDOW))
+
+    async def images(words: List[Dict]) -> List[Optional[str]]:
+        """Queue the images of one puzzle not queued by an earlier one, and wait for them until the deadline."""
+        async with image_window:
+            new = [
+                definition for definition in dict.fromkeys(item["definition"] for item in words)
+                if definition not in image_futures or image_futures[definition].cancelled()
+            ]
+            image_futures.update(zip(new, get_image_scheduler().submit_batch(new)))
+            futures = [image_futures[item["definition"]] for item in words]
+            await asyncio.wait(set(futures), timeout=IMAGE_BATCH_DEADLINE_SECONDS)
+
+        urls: List[Optional[str]] = []
+        for item, future in zip(words, futures):
+            if future.done() and not future.cancelled():
+                urls.append(future.result().url)
+            else:
+                future.cancel()
+                urls.append(deadline_placeholder(item["definition"]).url)
+        return urls
+
+    # Step 3: Lay out every puzzle in the process pool, then wait for its images
+    async def build(index: int) -> CrosswordResponse:
+        spec = specs[index]
+        words = puzzle_words[index]
+        coordinates = await _layout(words, spec)
+        image_urls = await images(words)
+        board_size = {"rows": spec.rows, "cols": spec.cols}
+        puzzle_index = _index_puzzle(words, coordinates, board_size)
+        crossword_data = _transform_crossword_data(
+            words,
+            coordinates,
+            image_urls,
+            board_size,
+            puzzle_index
+        )
+        await _save_crossword(crossword_data, puzzle_index.grid, spec.theme, spec.language, spec.level)
+        return crossword_data
+
+    async def indexed(index: int) -> Tuple[int, Optional[CrosswordResponse], Optional[str]]:
+        try:
+            return index, await build(index), None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Batch puzzle {index} failed: {str(e)}")
+            return index, None, str(e)
+
+    tasks = [asyncio.ensure_future(indexed(i)) for i in puzzle_words]
+    completed = 0
+    try:
+        for index, error in failed.items():
+            yield {"index": index, "spec": asdict(specs[index]), "error": error}
+        for next_puzzle in asyncio.as_completed(tasks):
+            index, crossword_data, error = await next_puzzle
+            record = {"index": index, "spec": asdict(specs[index])}
+            if error is None:
+                completed += 1
+                record["crossword"] = crossword_data
+            else:
+                record["error"] = error
+            yield record
+    finally:
+        # Consumer stopped early: drop the remaining work
+        for task in tasks:
+            task.cancel()
+        for future in image_futures.values():
+            future.cancel()
+
+    yield {
+        "summary": {
+            "puzzles": len(specs),
+            "completed": completed,
+            "wordCalls": stats["word_calls"],
+            "imagesGenerated": len(definitions),
+            "imagesShared": requested_images - len(definitions),
+            "seconds": round(time.time() - start_time, 3)
+        }
+    }
+
+async def _ndjson_lines(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for record in records:
+        yield to_json(record) + b"\n"
+
+@router.post("/api/crosswords/batch")
+async def generate_crossword_batch_endpoint(body: BatchRequest):
+    """Endpoint to generate many crosswords at once, streamed as NDJSON (one puzzle per line)."""
+    specs = parse_puzzle_specs(body)
+    logger.info(f"Generating batch of {len(specs)} crosswords")
+
+    return StreamingResponse(
+        _ndjson_lines(generate_crossword_batch(specs)),
+        media_type="application/x-ndjson"
+    )
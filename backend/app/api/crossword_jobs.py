@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException
+from typing import Dict, Any
+import logging
+
+from app.api.generate_crossword import _generate_crossword_data
+from app.api.schemas import CrosswordRequest
+from app.core.config import JOB_MAX_QUEUED, JOB_RESULT_RETENTION, JOB_WORKERS
+from app.core.jobs import Job, JobManager, JobQueueFullError
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+async def _run_crossword_job(job: Job) -> Dict[str, Any]:
+    crossword_data = await _generate_crossword_data(
+        theme=job.params["theme"],
+        language=job.params["language"],
+        level=job.params["level"],
+        board_size=job.params["board_size"],
+        on_stage=job.record_stage,
+        crossword_id=job.id
+    )
+    return crossword_data.model_dump()
+
+job_manager = JobManager(
+    runner=_run_crossword_job,
+    workers=JOB_WORKERS,
+    max_queued=JOB_MAX_QUEUED,
+    max_finished=JOB_RESULT_RETENTION
+)
+
+@router.post("/api/crosswords/jobs", status_code=202)
+async def create_crossword_job(body: CrosswordRequest):
+    """Endpoint to queue crossword generation; returns the job id immediately."""
+    try:
+        job = job_manager.submit(body.model_dump())
+    except JobQueueFullError as e:
+        logger.warning(f"Rejected crossword job: {str(e)}")
+        raise HTTPException(status_code=503, detail="Too many crosswords are being generated. Please try again later.")
+
+    logger.info(f"Queued crossword job {job.id} with theme: {job.params['theme']}")
+    return job.to_dict(include_result=False)
+
+@router.get("/api/crosswords/jobs/{job_id}")
+async def get_crossword_job(job_id: str):
+    """Endpoint to poll a crossword job: status, per-stage timings and result."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job.to_dict()
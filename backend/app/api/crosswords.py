@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
+from typing import Optional
+import logging
+
+from app.api.crossword_jobs import job_manager
+from app.core.config import CROSSWORD_LIST_MAX_LIMIT, CROSSWORD_STORE_ENABLED
+from app.core.crossword_store import get_crossword_store
+from app.core.jobs import JobStatus
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/api/crosswords")
+async def list_crosswords(
+    limit: int = Query(default=10, ge=1, le=CROSSWORD_LIST_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    theme: Optional[str] = None,
+    language: Optional[str] = None,
+    level: Optional[str] = None
+):
+    """Endpoint to list stored crosswords, newest first; pass nextCursor back to get the next page."""
+    if not CROSSWORD_STORE_ENABLED:
+        return {"crosswords": [], "nextCursor": None}
+
+    try:
+        summaries, next_cursor = await get_crossword_store().list(
+            limit,
+            cursor=cursor,
+            theme=theme,
+            language=language,
+            level=level
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "crosswords": [summary.to_dict() for summary in summaries],
+        "nextCursor": next_cursor
+    }
+
+@router.get("/api/crosswords/{crossword_id}")
+async def get_crossword(crossword_id: str):
+    """Endpoint to fetch a crossword by id: a running job (202), a job result or a stored crossword."""
+    job = job_manager.get(crossword_id)
+    if job is not None:
+        if job.status == JobStatus.FAILED:
+            raise HTTPException(status_code=500, detail=f"Crossword generation failed: {job.error}")
+        if job.status != JobStatus.COMPLETED:
+            return JSONResponse(status_code=202, content=job.to_dict(include_result=False))
+        return job.result
+
+    data = await get_crossword_store().get(crossword_id) if CROSSWORD_STORE_ENABLED else None
+    if data is None:
+        raise HTTPException(status_code=404, detail="Crossword not found")
+
+    # Stored as served: no decoding or re-encoding
+    return Response(content=data, media_type="application/json")
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import logging
+
+from app.api.schemas import (
+    GameSessionCreateRequest,
+    GameSessionResponse,
+    GameSessionUpdateRequest,
+)
+from app.core.answers import AnswerIndex, get_answer_store
+from app.core.config import CROSSWORD_STORE_ENABLED
+from app.core.crossword_store import get_crossword_store
+from app.core.game_sessions import WrongLetterLimitError, get_game_session_store
+from app.core.player_stats import get_player_stats_store
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+async def _answer_index(crossword_id: str) -> Optional[AnswerIndex]:
+    """Answer index of a crossword, rebuilt from its stored solution when it is no longer in memory."""
+    answers = get_answer_store()
+    index = answers.get(crossword_id)
+    if index is not None or not CROSSWORD_STORE_ENABLED:
+        return index
+
+    stored = await get_crossword_store().get_solution(crossword_id)
+    if stored is None:
+        return None
+    solution, rows, cols = stored
+    return answers.build(crossword_id, solution, rows, cols)
+
+@router.post("/api/game-sessions", status_code=201)
+async def start_game_session(body: GameSessionCreateRequest) -> GameSessionResponse:
+    """Endpoint to start a game of a generated crossword."""
+    index = await _answer_index(body.crosswordId)
+    if index is None:
+        raise HTTPException(status_code=404, detail="Crossword not found")
+
+    session = get_game_session_store().create(index, user_id=body.userId)
+    get_player_stats_store().record_game_started(session.user_id)
+    logger.info(f"Started game session {session.id} for crossword {index.crossword_id}")
+    return GameSessionResponse(**session.to_dict())
+
+@router.put("/api/game-sessions/{session_id}")
+async def update_game_session(session_id: str, body: GameSessionUpdateRequest) -> GameSessionResponse:
+    """Endpoint to submit a batch of cells, returning which submitted letters are correct.
+
+    Score and completion are computed from the solved cells; a batch that
+    exceeds the session's budget of wrong letters is rejected with 429.
+    """
+    sessions = get_game_session_store()
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Game session not found")
+
+    previous_score, previous_completed = session.score, session.completed
+    results = None
+    if body.cells:
+        index = await _answer_index(session.crossword_id)
+        if index is None:
+            raise HTTPException(status_code=410, detail="Crossword of this game session is no longer available")
+        try:
+            results = sessions.submit(session, index, ((cell.row, cell.col, cell.letter) for cell in body.cells))
+        except WrongLetterLimitError as e:
+            logger.warning(str(e))
+            raise HTTPException(status_code=429, detail="Too many wrong letters in this game session")
+
+    sessions.touch(session)
+    get_player_stats_store().record_game_updated(
+        session.user_id,
+        previous_score,
+        previous_completed,
+        session.score,
+        session.completed
+    )
+
+    return GameSessionResponse(**session.to_dict(), results=results)
@@ -1,102 +1,428 @@
-from fastapi import APIRouter, Request, HTTPException
-from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, AsyncIterator, Callable, Tuple
 import asyncio
+import random
+import sqlite3
 import time
+import uuid
 import logging
 
 from app.agent.tools.generate_words import generate_words
 from app.agent.agent import generate_crossword_agent
-from app.core.tti import generate_images_for_crossword
+from app.api.schemas import (
+    DEFAULT_BOARD_COLS,
+    DEFAULT_BOARD_ROWS,
+    BoardSize,
+    CrosswordRequest,
+    CrosswordResponse,
+    CrosswordWordResponse,
+)
+from app.core.config import (
+    BOARD_MAX_SIZE,
+    BOARD_MIN_SIZE,
+    COALESCE_SHUFFLE_WORDS,
+    CROSSWORD_STORE_ENABLED,
+    IMAGE_BATCH_DEADLINE_SECONDS,
+    IMAGE_CACHE_ENABLED,
+    LAYOUT_MODE,
+    POOL_WATERMARK,
+    VOCABULARY_SAMPLE_SIZE,
+)
+from app.core.answers import get_answer_store
+from app.core.crossword_store import get_crossword_store
+from app.core.image_cache import get_image_cache, thumbnail_srcset
+from app.core.pool import CrosswordPool
+from app.core.singleflight import SingleFlight
+from app.core.stages import record_stage, stage_timer
+from app.core.tti import deadline_placeholder, get_image_scheduler
+from app.crossword.grid import CrosswordGrid, build_grid
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-DEFAULT_BOARD_SIZE = {"rows": 10, "cols": 10}
+DEFAULT_BOARD_SIZE = {"rows": DEFAULT_BOARD_ROWS, "cols": DEFAULT_BOARD_COLS}
 DIFFICULTY_MAPPING = {
     "easy": {"level": "easy", "theme": "animals"},
     "medium": {"level": "medium", "theme": "nature"},
     "hard": {"level": "hard", "theme": "science"}
 }
 
-async def _generate_crossword_data(theme: str, language: str, level: str) -> Dict[str, Any]:
+def _word_count(board_size: Dict[str, int]) -> int:
+    """Number of words to request, scaled from the default board by area."""
+    area_ratio = board_size["rows"] * board_size["cols"] / (DEFAULT_BOARD_SIZE["rows"] * DEFAULT_BOARD_SIZE["cols"])
+    return max(3, round(VOCABULARY_SAMPLE_SIZE * area_ratio))
+
+async def _generate_crossword_events(
+    theme: str,
+    language: str,
+    level: str,
+    board_size: Dict[str, int] = DEFAULT_BOARD_SIZE,
+    mode: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Run the generation pipeline, yielding (stage, payload) as each stage completes.
+
+    Stages are "words" (word list), "layout" (CrosswordOutput) and one "image"
+    per definition with payload (index, ImageGenerationResult), in completion order.
+    The word and layout stages both run in `mode` (defaults to LAYOUT_MODE).
+    """
+    mode = mode or LAYOUT_MODE
     # Step 1: Generate words first
-    generated_words = await generate_words(theme=theme, language=language, level=level)
+    with stage_timer("words"):
+        generated_words = await generate_words(
+            theme=theme,
+            language=language,
+            level=level,
+            count=_word_count(board_size),
+            max_length=max(board_size["rows"], board_size["cols"]),
+            mode=mode
+        )
     print("Generated words:", generated_words)
+    yield "words", generated_words
 
     # Step 2: Extract definitions for image generation  
     definitions = [word_data["definition"] for word_data in generated_words]
     
-    # Step 3: Start image generation and coordinate generation in parallel
-    image_task = asyncio.create_task(generate_images_for_crossword(definitions))
-    coordinates_task = asyncio.create_task(generate_crossword_agent(generated_words))
-    
-    # Wait for both tasks to complete
-    image_urls, generated_coordinates = await asyncio.gather(image_task, coordinates_task)
-    
-    print("Generated coordinates:", generated_coordinates)
+    # Step 3: Queue image generation, then lay out the words while images are generated
+    image_futures = get_image_scheduler().submit_batch(definitions)
+    images_start = time.perf_counter()
+    try:
+        with stage_timer("layout"):
+            generated_coordinates = await generate_crossword_agent(
+                generated_words,
+                mode=mode,
+                rows=board_size["rows"],
+                cols=board_size["cols"]
+            )
+        print("Generated coordinates:", generated_coordinates)
+        yield "layout", generated_coordinates
+
+        async def indexed(index: int, future: asyncio.Future) -> Tuple[int, Any]:
+            return index, await future
+
+        # Images still missing at the deadline are replaced by placeholders
+        missing = set(range(len(image_futures)))
+        remaining = max(0.0, images_start + IMAGE_BATCH_DEADLINE_SECONDS - time.perf_counter())
+        try:
+            for next_image in asyncio.as_completed(
+                [indexed(i, f) for i, f in enumerate(image_futures)],
+                timeout=remaining
+            ):
+                index, result = await next_image
+                missing.discard(index)
+                yield "image", (index, result)
+        except asyncio.TimeoutError:
+            logger.warning(f"Image deadline of {IMAGE_BATCH_DEADLINE_SECONDS:g}s exceeded, {len(missing)} images missing")
+            for index in sorted(missing):
+                image_futures[index].cancel()
+                yield "image", (index, deadline_placeholder(definitions[index]))
+        record_stage("images", time.perf_counter() - images_start)
+    finally:
+        # Consumer stopped early or a stage failed: drop images nobody will use
+        for future in image_futures:
+            future.cancel()
+
+async def _generate_crossword_data(
+    theme: str,
+    language: str,
+    level: str,
+    board_size: Dict[str, int] = DEFAULT_BOARD_SIZE,
+    on_stage: Optional[Callable[[str], None]] = None,
+    crossword_id: Optional[str] = None
+) -> CrosswordResponse:
+    """Generate a complete crossword; on_stage is called with "words", "layout" and "images"."""
+    generated_words: List[Dict] = []
+    generated_coordinates = None
+    image_urls: List[Optional[str]] = []
+
+    async for stage, payload in _generate_crossword_events(theme, language, level, board_size):
+        if stage == "words":
+            generated_words = payload
+            image_urls = [None] * len(generated_words)
+        elif stage == "layout":
+            generated_coordinates = payload
+        elif stage == "image":
+            index, result = payload
+            image_urls[index] = result.url
+            continue
+        if on_stage:
+            on_stage(stage)
+
+    if on_stage:
+        on_stage("images")
     print("Generated image URLs:", len([url for url in image_urls if url is not None]), "successful out of", len(image_urls))
 
-    return _transform_crossword_data(generated_words, generated_coordinates, image_urls)
+    puzzle_index = _index_puzzle(generated_words, generated_coordinates, board_size, crossword_id)
+    crossword_data = _transform_crossword_data(generated_words, generated_coordinates, image_urls, board_size, puzzle_index)
+    await _save_crossword(crossword_data, puzzle_index.grid, theme, language, level)
+    return crossword_data
+
+_in_flight: SingleFlight[CrosswordResponse] = SingleFlight()
 
-def _transform_crossword_data(generated_words: List[Dict], generated_coordinates, image_urls: List[str]) -> Dict[str, Any]:
-    # Create mappings
-    word_to_definition = {word_data["word"]: word_data["definition"] for word_data in generated_words}
-    word_to_image = {
-        generated_words[i]["word"]: image_urls[i] 
-        for i in range(min(len(generated_words), len(image_urls))) 
-        if image_urls[i]
-    }
-    
-    # Transform data to match frontend expectations
-    transformed_words = [
-        {
-            "id": word.id,
-            "word": word.word,
-            "coordinate": {
-                "row": word.row,
-                "col": word.col,
-                "direction": word.direction
-            },
-            "definition": word_to_definition.get(word.word, ""),
-            "clueImage": word_to_image.get(word.word, "")
-        }
-        for word in generated_coordinates.words
-    ]
+async def _generate_crossword_data_coalesced(
+    theme: str,
+    language: str,
+    level: str,
+    board_size: Dict[str, int] = DEFAULT_BOARD_SIZE
+) -> CrosswordResponse:
+    """Generate a crossword, sharing one generation among concurrent identical requests."""
+    key = (
+        theme.strip().lower(),
+        language.strip().lower(),
+        level.strip().lower(),
+        board_size["rows"],
+        board_size["cols"]
+    )
+    crossword_data, shared = await _in_flight.do(
+        key,
+        lambda: _generate_crossword_data(theme=theme, language=language, level=level, board_size=board_size)
+    )
+    if not shared:
+        return crossword_data
 
-    return {
-        "words": transformed_words,
-        "board_size": DEFAULT_BOARD_SIZE
+    # Every attached requester gets its own copy, optionally with its own word order
+    crossword_data = crossword_data.model_copy(deep=True)
+    if COALESCE_SHUFFLE_WORDS:
+        order = list(range(len(crossword_data.words)))
+        random.shuffle(order)
+        crossword_data.words = [crossword_data.words[i] for i in order]
+        crossword_data.grid = crossword_data.grid.permuted(order)
+    return crossword_data
+
+@dataclass(frozen=True)
+class _PuzzleIndex:
+    """Lookups computed once per layout: word id -> generated word index, and the solved compact grid."""
+    crossword_id: str
+    sources: Dict[str, int]
+    grid: CrosswordGrid
+
+def _index_puzzle(
+    generated_words: List[Dict],
+    generated_coordinates,
+    board_size: Dict[str, int],
+    crossword_id: Optional[str] = None
+) -> _PuzzleIndex:
+    """Index a new layout and register its hashed answers for game sessions."""
+    index_by_word: Dict[str, int] = {}
+    for index, word_data in enumerate(generated_words):
+        index_by_word.setdefault(word_data["word"], index)
+    sources = {
+        word.id: index_by_word[word.word]
+        for word in generated_coordinates.words
+        if word.word in index_by_word
     }
+    crossword_id = crossword_id or uuid.uuid4().hex
+    grid = build_grid(generated_coordinates.words, board_size["rows"], board_size["cols"])
+    get_answer_store().build(crossword_id, grid.letters, board_size["rows"], board_size["cols"])
+    return _PuzzleIndex(crossword_id=crossword_id, sources=sources, grid=grid)
+
+def _transform_crossword_data(
+    generated_words: List[Dict],
+    generated_coordinates,
+    image_urls: List[Optional[str]],
+    board_size: Dict[str, int] = DEFAULT_BOARD_SIZE,
+    puzzle_index: Optional[_PuzzleIndex] = None
+) -> CrosswordResponse:
+    """Build the served, solution-free crossword; pass `puzzle_index` from _index_puzzle to reuse the lookups and grid."""
+    if puzzle_index is None:
+        puzzle_index = _index_puzzle(generated_words, generated_coordinates, board_size)
+    sources = puzzle_index.sources
+
+    transformed_words = []
+    for word in generated_coordinates.words:
+        index = sources.get(word.id)
+        definition = generated_words[index]["definition"] if index is not None else ""
+        image_url = image_urls[index] if index is not None and index < len(image_urls) else None
+        transformed_words.append(CrosswordWordResponse(
+            id=word.id,
+            definition=definition,
+            clueImage=image_url or "",
+            clueImageSrcSet=thumbnail_srcset(image_url) or ""
+        ))
+
+    return CrosswordResponse(
+        id=puzzle_index.crossword_id,
+        words=transformed_words,
+        board_size=BoardSize(**board_size),
+        grid=puzzle_index.grid.masked(),
+        tiles=puzzle_index.grid.tiles()
+    )
+
+async def _save_crossword(
+    crossword_data: CrosswordResponse,
+    solution: CrosswordGrid,
+    theme: str,
+    language: str,
+    level: str
+) -> None:
+    """Keep a finished crossword and its solved grid in the persistent store; failures only cost the copy.
+
+    The clue images of a stored crossword are pinned in the image cache,
+    so eviction can't break the links of a puzzle served from the store.
+    """
+    if not CROSSWORD_STORE_ENABLED:
+        return
+    try:
+        await get_crossword_store().save(
+            crossword_data.id,
+            crossword_data.model_dump_json(),
+            theme=theme,
+            language=language,
+            level=level,
+            rows=crossword_data.board_size.rows,
+            cols=crossword_data.board_size.cols,
+            word_count=len(crossword_data.words),
+            solution=solution.letters
+        )
+    except sqlite3.Error as e:
+        logger.error(f"Failed to store crossword {crossword_data.id}: {str(e)}")
+        return
+    if IMAGE_CACHE_ENABLED:
+        cache = get_image_cache()
+        cache.pin(word.clueImage for word in crossword_data.words)
+        await cache.persist()
+
+async def _generate_random_crossword(difficulty: str) -> CrosswordResponse:
+    params = DIFFICULTY_MAPPING[difficulty]
+    crossword_data = await _generate_crossword_data(
+        theme=params["theme"],
+        language="english",
+        level=params["level"]
+    )
+    # Pooled puzzles keep their clue images until they are served
+    if IMAGE_CACHE_ENABLED:
+        get_image_cache().hold(word.clueImage for word in crossword_data.words)
+    return crossword_data
+
+crossword_pool = CrosswordPool(
+    factory=_generate_random_crossword,
+    difficulties=DIFFICULTY_MAPPING.keys(),
+    watermark=POOL_WATERMARK
+)
 
 @router.post("/api/generate_crossword")
-async def generate_crossword(request: Request):
+async def generate_crossword(body: CrosswordRequest) -> CrosswordResponse:
     """Endpoint to generate a crossword puzzle based on the provided request data."""
-    data = await request.json()
-    logger.info(f"Generating crossword with theme: {data.get('theme', 'default')}")
+    logger.info(f"Generating crossword with theme: {body.theme}")
 
-    crossword_data = await _generate_crossword_data(
-        theme=data.get("theme", "default"),
-        language=data.get("language", "en"),
-        level=data.get("level", "easy")
+    crossword_data = await _generate_crossword_data_coalesced(
+        theme=body.theme,
+        language=body.language,
+        level=body.level,
+        board_size=body.board_size.model_dump()
     )
 
     return crossword_data
 
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {to_json(data).decode()}\n\n"
+
+async def _stream_crossword_events(
+    theme: str,
+    language: str,
+    level: str,
+    board_size: Dict[str, int] = DEFAULT_BOARD_SIZE
+) -> AsyncIterator[str]:
+    generated_words: List[Dict] = []
+    generated_coordinates = None
+    image_urls: List[Optional[str]] = []
+    puzzle_index: Optional[_PuzzleIndex] = None
+    word_ids: Dict[int, List[str]] = {}
+
+    try:
+        # Closing the pipeline on a client disconnect cancels its images, queued or running
+        async with aclosing(_generate_crossword_events(theme, language, level, board_size)) as events:
+            async for stage, payload in events:
+                if stage == "words":
+                    generated_words = payload
+                    image_urls = [None] * len(generated_words)
+                    # Only the count: the words are the answers
+                    yield _sse_event("words", {"count": len(generated_words)})
+                elif stage == "layout":
+                    generated_coordinates = payload
+                    puzzle_index = _index_puzzle(generated_words, generated_coordinates, board_size)
+                    for word_id, index in puzzle_index.sources.items():
+                        word_ids.setdefault(index, []).append(word_id)
+                    # Playable grid; clue images follow as separate events
+                    yield _sse_event(
+                        "layout",
+                        _transform_crossword_data(generated_words, generated_coordinates, image_urls, board_size, puzzle_index)
+                    )
+                elif stage == "image":
+                    index, result = payload
+                    image_urls[index] = result.url
+                    for word_id in word_ids.get(index, []):
+                        yield _sse_event("image", {
+                            "id": word_id,
+                            "clueImage": result.url or "",
+                            "clueImageSrcSet": thumbnail_srcset(result.url) or ""
+                        })
+
+        crossword_data = _transform_crossword_data(generated_words, generated_coordinates, image_urls, board_size, puzzle_index)
+        await _save_crossword(crossword_data, puzzle_index.grid, theme, language, level)
+    except Exception as e:
+        logger.error(f"Streaming crossword generation failed: {str(e)}")
+        yield _sse_event("error", {"detail": "Crossword generation failed"})
+        return
+
+    yield _sse_event("done", crossword_data)
+
+@router.post("/api/generate_crossword/stream")
+async def generate_crossword_stream(body: CrosswordRequest):
+    """Endpoint to generate a crossword puzzle as Server-Sent Events.
+
+    Emits "words" (the number of words), then "layout" (the playable
+    crossword without images), one "image" event per clue image as it is
+    ready, and finally "done" with the complete crossword (or "error").
+    """
+    logger.info(f"Streaming crossword with theme: {body.theme}")
+
+    return StreamingResponse(
+        _stream_crossword_events(
+            theme=body.theme,
+            language=body.language,
+            level=body.level,
+            board_size=body.board_size.model_dump()
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/api/crosswords/random")
-async def get_random_crossword(difficulty: Optional[str] = "medium"):
-    """Endpoint to get a random crossword puzzle with specified difficulty."""
+async def get_random_crossword(
+    difficulty: Optional[str] = "medium",
+    rows: int = Query(default=DEFAULT_BOARD_ROWS, ge=BOARD_MIN_SIZE, le=BOARD_MAX_SIZE),
+    cols: int = Query(default=DEFAULT_BOARD_COLS, ge=BOARD_MIN_SIZE, le=BOARD_MAX_SIZE)
+) -> CrosswordResponse:
+    """Endpoint to get a random crossword puzzle with specified difficulty and board size."""
     start_time = time.time()
-    logger.info(f"Starting random crossword generation with difficulty: {difficulty}")
+    difficulty = difficulty if difficulty in DIFFICULTY_MAPPING else "medium"
+    board_size = {"rows": rows, "cols": cols}
+
+    # The pool only holds puzzles of the default size
+    crossword_data = crossword_pool.take(difficulty) if board_size == DEFAULT_BOARD_SIZE else None
+    if crossword_data is not None:
+        logger.info(f"Served {difficulty} crossword from pool ({crossword_pool.size(difficulty)} left)")
+        if IMAGE_CACHE_ENABLED:
+            cache = get_image_cache()
+            cache.release(word.clueImage for word in crossword_data.words)
+            await cache.persist()
+        return crossword_data
 
-    params = DIFFICULTY_MAPPING.get(difficulty, DIFFICULTY_MAPPING["medium"])
+    logger.info(f"Crossword pool is empty, starting random crossword generation with difficulty: {difficulty}")
     
     try:
         # Устанавливаем таймаут в 8 минут для генерации
+        params = DIFFICULTY_MAPPING[difficulty]
         crossword_data = await asyncio.wait_for(
-            _generate_crossword_data(
+            _generate_crossword_data_coalesced(
                 theme=params["theme"],
                 language="english",
-                level=params["level"]
+                level=params["level"],
+                board_size=board_size
             ),
             timeout=480.0  # 8 минут
         )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+import asyncio
+
+from app.core.image_cache import IMAGE_ROUTE, get_image_cache
+
+router = APIRouter()
+
+# Blobs are content-addressed, so a URL never changes its content
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+@router.get(IMAGE_ROUTE + "/{filename}")
+async def get_image(filename: str):
+    """Endpoint to serve a cached clue image or one of its WebP thumbnails."""
+    cache = get_image_cache()
+    path = cache.path(filename)
+    if path is None:
+        # Thumbnails of blobs cached before they were enabled are rendered on first request
+        path = await asyncio.to_thread(cache.thumbnail, filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    return FileResponse(path, headers={"Cache-Control": CACHE_CONTROL})
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+import app.core.metrics  # noqa: F401  registers the pipeline metrics
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def metrics():
+    """Endpoint exposing Prometheus metrics."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
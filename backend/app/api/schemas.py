@@ -0,0 +1,93 @@
+"""
+Request and response models of the crossword API.
+
+Requests are validated by FastAPI before a route runs, so malformed input is
+rejected with 422 before any model call. Routes return the response models
+directly, which FastAPI serializes to JSON bytes with pydantic-core.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.config import BATCH_MAX_PUZZLES, BOARD_MAX_SIZE, BOARD_MIN_SIZE
+from app.crossword.grid import CrosswordGrid
+
+DEFAULT_BOARD_ROWS = 10
+DEFAULT_BOARD_COLS = 10
+
+
+class BoardSize(BaseModel):
+    rows: int = Field(default=DEFAULT_BOARD_ROWS, ge=BOARD_MIN_SIZE, le=BOARD_MAX_SIZE)
+    cols: int = Field(default=DEFAULT_BOARD_COLS, ge=BOARD_MIN_SIZE, le=BOARD_MAX_SIZE)
+
+
+class CrosswordRequest(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    theme: str = Field(default="default", min_length=1, max_length=100)
+    language: str = Field(default="en", min_length=1, max_length=32)
+    level: str = Field(default="easy", min_length=1, max_length=32)
+    board_size: BoardSize = Field(default_factory=BoardSize)
+
+
+class BatchPuzzleRequest(CrosswordRequest):
+    count: int = Field(default=1, ge=0, description="Number of puzzles to generate with these parameters")
+
+
+class BatchRequest(BaseModel):
+    puzzles: List[BatchPuzzleRequest] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def _check_total(self) -> "BatchRequest":
+        if sum(puzzle.count for puzzle in self.puzzles) > BATCH_MAX_PUZZLES:
+            raise ValueError(f"A batch can have at most {BATCH_MAX_PUZZLES} puzzles")
+        return self
+
+
+class CrosswordWordResponse(BaseModel):
+    """A clue of a crossword; its cells are given by the grid's cell-to-word index."""
+    id: str
+    definition: str = ""
+    clueImage: str = ""
+    clueImageSrcSet: str = ""
+
+
+class CrosswordResponse(BaseModel):
+    id: str
+    words: List[CrosswordWordResponse]
+    board_size: BoardSize
+    # Masked: the solution is only kept on the server
+    grid: CrosswordGrid
+    tiles: str = Field(description="Letters to place, in alphabetical order")
+
+
+class GameSessionCreateRequest(BaseModel):
+    crosswordId: str = Field(min_length=1, max_length=64)
+    userId: Optional[str] = Field(default=None, max_length=128)
+
+
+class CellSubmission(BaseModel):
+    row: int = Field(ge=0, lt=BOARD_MAX_SIZE)
+    col: int = Field(ge=0, lt=BOARD_MAX_SIZE)
+    letter: str = Field(max_length=1, description="Letter in the cell, empty when cleared")
+
+
+class GameSessionUpdateRequest(BaseModel):
+    # Score, completion and end time are computed by the server from the solved cells
+    cells: List[CellSubmission] = Field(default_factory=list, max_length=BOARD_MAX_SIZE * BOARD_MAX_SIZE)
+
+
+class GameSessionResponse(BaseModel):
+    id: str
+    crosswordId: str
+    userId: Optional[str] = None
+    score: int
+    completed: bool
+    startTime: str
+    endTime: Optional[str] = None
+    createdAt: str
+    updatedAt: str
+    solvedCells: int
+    totalCells: int
+    results: Optional[List[bool]] = Field(default=None, description="Correctness of each submitted cell")
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from typing import Optional
+
+from app.core.player_stats import get_player_stats_store
+
+router = APIRouter()
+
+@router.get("/api/stats")
+async def get_player_stats(userId: Optional[str] = None):
+    """Endpoint to get a player's totalGames, completedGames, averageScore and bestScore."""
+    stats = await get_player_stats_store().get(userId)
+    return stats.to_dict()
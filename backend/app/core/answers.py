@@ -0,0 +1,134 @@
+"""
+Hashed answer index of generated crosswords.
+
+Every filled cell of a puzzle keeps a truncated HMAC of (crossword id, cell,
+letter) under a server secret, so submitted letters are checked in O(cells)
+without the solution being kept or sent anywhere in plain form. Indexes are
+built once when a puzzle is generated and kept in a bounded LRU store.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import secrets
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import ANSWER_INDEX_MAX_PUZZLES, ANSWER_INDEX_SECRET
+from app.crossword.grid import BLOCK
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SIZE = 8
+
+
+@dataclass(frozen=True)
+class AnswerIndex:
+    """Digests of the correct letter of every filled cell of one puzzle."""
+    crossword_id: str
+    rows: int
+    cols: int
+    digests: Dict[int, bytes]
+
+    @property
+    def total_cells(self) -> int:
+        return len(self.digests)
+
+
+class AnswerIndexStore:
+    """
+    Bounded store of answer indexes, keyed by crossword id.
+
+    The least recently used index is dropped once `max_puzzles` are kept.
+    """
+
+    def __init__(self, secret: bytes, max_puzzles: int = 10000):
+        self._secret = secret
+        self._max_puzzles = max_puzzles
+        self._indexes: "OrderedDict[str, AnswerIndex]" = OrderedDict()
+
+    def _hasher(self, crossword_id: str) -> "hmac.HMAC":
+        # Keyed once per puzzle; every cell digest copies it
+        return hmac.new(self._secret, crossword_id.encode() + b":", hashlib.sha256)
+
+    @staticmethod
+    def _digest(hasher: "hmac.HMAC", position: int, letter: str) -> bytes:
+        cell = hasher.copy()
+        cell.update(f"{position}:{letter}".encode())
+        return cell.digest()[:DIGEST_SIZE]
+
+    def build(self, crossword_id: str, solution: str, rows: int, cols: int) -> AnswerIndex:
+        """
+        Build and keep the answer index of a puzzle.
+
+        Args:
+            crossword_id: Id of the puzzle
+            solution: Row-major cells of the solved grid (CrosswordGrid.letters)
+            rows: Number of board rows
+            cols: Number of board columns
+
+        Returns:
+            The stored AnswerIndex
+        """
+        hasher = self._hasher(crossword_id)
+        digests = {
+            position: self._digest(hasher, position, letter)
+            for position, letter in enumerate(solution)
+            if letter != BLOCK
+        }
+        index = AnswerIndex(crossword_id=crossword_id, rows=rows, cols=cols, digests=digests)
+        self._indexes[crossword_id] = index
+        self._indexes.move_to_end(crossword_id)
+        while len(self._indexes) > self._max_puzzles:
+            self._indexes.popitem(last=False)
+        return index
+
+    def get(self, crossword_id: str) -> Optional[AnswerIndex]:
+        index = self._indexes.get(crossword_id)
+        if index is not None:
+            self._indexes.move_to_end(crossword_id)
+        return index
+
+    def check(self, index: AnswerIndex, cells: Iterable[Tuple[int, int, str]]) -> List[bool]:
+        """
+        Check submitted letters against a puzzle's answers.
+
+        Args:
+            index: Answer index of the puzzle
+            cells: (row, col, letter) submissions
+
+        Returns:
+            Whether each submitted letter is correct, in submission order
+        """
+        hasher = self._hasher(index.crossword_id)
+        results: List[bool] = []
+        for row, col, letter in cells:
+            letter = letter.strip().upper()
+            expected = None
+            if 0 <= row < index.rows and 0 <= col < index.cols:
+                expected = index.digests.get(row * index.cols + col)
+            results.append(
+                expected is not None
+                and len(letter) == 1
+                and hmac.compare_digest(expected, self._digest(hasher, row * index.cols + col, letter))
+            )
+        return results
+
+
+_answer_store: Optional[AnswerIndexStore] = None
+
+
+def get_answer_store() -> AnswerIndexStore:
+    """Get the shared answer index store."""
+    global _answer_store
+    if _answer_store is None:
+        if ANSWER_INDEX_SECRET:
+            secret = ANSWER_INDEX_SECRET.encode()
+        else:
+            logger.warning("ANSWER_INDEX_SECRET is not set, answer indexes only hold for this process")
+            secret = secrets.token_bytes(32)
+        _answer_store = AnswerIndexStore(secret, ANSWER_INDEX_MAX_PUZZLES)
+    return _answer_store
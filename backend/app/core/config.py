@@ -3,4 +3,128 @@ from dotenv import load_dotenv
 
 load_dotenv(".env")
 
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
\ No newline at end of file
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+# Alternative OpenAI-compatible endpoint, e.g. the local stand-in server of the benchmarks
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or None
+
+# Coordinate stage implementation: "local" (in-process layout engine), "agent" (LLM orchestrator)
+# or "fused" (local layout of words from one structured-output call)
+LAYOUT_MODE = os.environ.get("LAYOUT_MODE", "local")
+
+# Range of board sides accepted by the API; the word count scales with the board area
+BOARD_MIN_SIZE = int(os.environ.get("BOARD_MIN_SIZE", "5"))
+BOARD_MAX_SIZE = int(os.environ.get("BOARD_MAX_SIZE", "25"))
+
+# Connection pool of the shared async OpenAI client
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Client-side rate limiting and retries of OpenAI calls. Quotas per model start
+# at these defaults and follow the x-ratelimit-* headers of the responses
+RATE_LIMIT_DEFAULT_RPM = int(os.environ.get("RATE_LIMIT_DEFAULT_RPM", "500"))
+RATE_LIMIT_DEFAULT_TPM = int(os.environ.get("RATE_LIMIT_DEFAULT_TPM", "200000"))
+OPENAI_MAX_ATTEMPTS = int(os.environ.get("OPENAI_MAX_ATTEMPTS", "5"))
+OPENAI_BACKOFF_BASE_SECONDS = float(os.environ.get("OPENAI_BACKOFF_BASE_SECONDS", "0.5"))
+OPENAI_BACKOFF_MAX_SECONDS = float(os.environ.get("OPENAI_BACKOFF_MAX_SECONDS", "20"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.environ.get("CIRCUIT_RESET_SECONDS", "30"))
+
+# Global limit of concurrent image generation calls per process
+IMAGE_MAX_CONCURRENCY = int(os.environ.get("IMAGE_MAX_CONCURRENCY", "8"))
+
+# Clue image tier: model, size and quality of generated images. Sizes the model
+# does not support are replaced by the closest one it does
+IMAGE_MODEL = os.environ.get("IMAGE_MODEL", "dall-e-3")
+IMAGE_SIZE = os.environ.get("IMAGE_SIZE", "1024x1024")
+IMAGE_QUALITY = os.environ.get("IMAGE_QUALITY", "standard")
+
+# Faster model used while IMAGE_FALLBACK_QUEUE_DEPTH images are queued or the
+# circuit of IMAGE_MODEL is open (0 disables the fallback)
+IMAGE_FALLBACK_MODEL = os.environ.get("IMAGE_FALLBACK_MODEL", "dall-e-2")
+IMAGE_FALLBACK_SIZE = os.environ.get("IMAGE_FALLBACK_SIZE", "512x512")
+IMAGE_FALLBACK_QUEUE_DEPTH = int(os.environ.get("IMAGE_FALLBACK_QUEUE_DEPTH", "16"))
+
+# WebP thumbnails of cached images (widths in pixels, empty disables them);
+# clue images link to the default width
+IMAGE_THUMBNAIL_WIDTHS = [int(width) for width in os.environ.get("IMAGE_THUMBNAIL_WIDTHS", "128,256,512").split(",") if width.strip()]
+IMAGE_THUMBNAIL_DEFAULT_WIDTH = int(os.environ.get("IMAGE_THUMBNAIL_DEFAULT_WIDTH", "256"))
+IMAGE_THUMBNAIL_QUALITY = int(os.environ.get("IMAGE_THUMBNAIL_QUALITY", "80"))
+
+# Image deadlines: per image (including retries) and for the images of one crossword,
+# after which missing images are replaced by placeholders
+IMAGE_TIMEOUT_SECONDS = float(os.environ.get("IMAGE_TIMEOUT_SECONDS", "30"))
+IMAGE_BATCH_DEADLINE_SECONDS = float(os.environ.get("IMAGE_BATCH_DEADLINE_SECONDS", "90"))
+
+# Hedged image requests: a duplicate is sent once a request is slower than this
+# percentile of recent generations (needs IMAGE_HEDGE_MIN_SAMPLES samples first)
+IMAGE_HEDGE_ENABLED = os.environ.get("IMAGE_HEDGE_ENABLED", "false").lower() == "true"
+IMAGE_HEDGE_PERCENTILE = float(os.environ.get("IMAGE_HEDGE_PERCENTILE", "90"))
+IMAGE_HEDGE_MIN_SAMPLES = int(os.environ.get("IMAGE_HEDGE_MIN_SAMPLES", "20"))
+
+# Public origin of this API, used to build URLs of locally served files
+PUBLIC_BASE_URL = os.environ.get("PUBLIC_BASE_URL", "http://localhost:8000").rstrip("/")
+
+# Local clue image cache
+IMAGE_CACHE_ENABLED = os.environ.get("IMAGE_CACHE_ENABLED", "true").lower() == "true"
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", ".cache/images")
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Vocabulary store: the word stage samples from it once a pool has enough words;
+# the most recently used VOCABULARY_CACHE_POOLS pools are kept in memory
+VOCABULARY_ENABLED = os.environ.get("VOCABULARY_ENABLED", "true").lower() == "true"
+VOCABULARY_DB_PATH = os.environ.get("VOCABULARY_DB_PATH", ".cache/vocabulary.sqlite3")
+VOCABULARY_CACHE_POOLS = int(os.environ.get("VOCABULARY_CACHE_POOLS", "64"))
+VOCABULARY_MIN_POOL = int(os.environ.get("VOCABULARY_MIN_POOL", "36"))
+VOCABULARY_SAMPLE_SIZE = int(os.environ.get("VOCABULARY_SAMPLE_SIZE", "12"))
+
+# Pre-generated crossword pool served by /api/crosswords/random; off by default,
+# as every ready puzzle costs a full generation (model calls and images) up front
+POOL_ENABLED = os.environ.get("POOL_ENABLED", "false").lower() == "true"
+POOL_WATERMARK = int(os.environ.get("POOL_WATERMARK", "2"))
+
+# Background crossword generation jobs
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_MAX_QUEUED = int(os.environ.get("JOB_MAX_QUEUED", "100"))
+JOB_RESULT_RETENTION = int(os.environ.get("JOB_RESULT_RETENTION", "200"))
+
+# Shuffle word order for requesters that share a coalesced generation
+COALESCE_SHUFFLE_WORDS = os.environ.get("COALESCE_SHUFFLE_WORDS", "true").lower() == "true"
+
+# Batch generation of many puzzles (/api/crosswords/batch and `python -m cli.batch`);
+# images are requested per puzzle, for at most BATCH_IMAGE_WINDOW puzzles at once,
+# so a batch doesn't fill the image queue past IMAGE_FALLBACK_QUEUE_DEPTH
+BATCH_MAX_PUZZLES = int(os.environ.get("BATCH_MAX_PUZZLES", "100"))
+BATCH_IMAGE_WINDOW = int(os.environ.get("BATCH_IMAGE_WINDOW", "1"))
+BATCH_MAX_WORDS_PER_CALL = int(os.environ.get("BATCH_MAX_WORDS_PER_CALL", "120"))
+BATCH_LAYOUT_PROCESSES = int(os.environ.get("BATCH_LAYOUT_PROCESSES", str(os.cpu_count() or 1)))
+
+# Server-side answer checking: secret of the hashed answer index (random per
+# process when unset) and in-memory retention of answer indexes and game sessions
+ANSWER_INDEX_SECRET = os.environ.get("ANSWER_INDEX_SECRET") or None
+ANSWER_INDEX_MAX_PUZZLES = int(os.environ.get("ANSWER_INDEX_MAX_PUZZLES", "10000"))
+GAME_SESSION_MAX = int(os.environ.get("GAME_SESSION_MAX", "100000"))
+GAME_SESSION_TTL_SECONDS = float(os.environ.get("GAME_SESSION_TTL_SECONDS", str(24 * 3600)))
+# Wrong letters a session may submit per cell of its puzzle, so cells cannot be
+# found by trying every letter, and the score of a solved cell
+GAME_SESSION_WRONG_LETTERS_PER_CELL = float(os.environ.get("GAME_SESSION_WRONG_LETTERS_PER_CELL", "1"))
+GAME_SESSION_CELL_SCORE = int(os.environ.get("GAME_SESSION_CELL_SCORE", "10"))
+
+# Persistent store of generated crosswords, served by /api/crosswords and
+# /api/crosswords/{id}, with an in-memory LRU of recently read puzzles
+CROSSWORD_STORE_ENABLED = os.environ.get("CROSSWORD_STORE_ENABLED", "true").lower() == "true"
+CROSSWORD_DB_PATH = os.environ.get("CROSSWORD_DB_PATH", ".cache/crosswords.sqlite3")
+CROSSWORD_CACHE_SIZE = int(os.environ.get("CROSSWORD_CACHE_SIZE", "256"))
+CROSSWORD_LIST_MAX_LIMIT = int(os.environ.get("CROSSWORD_LIST_MAX_LIMIT", "100"))
+
+# Player statistics: per-user aggregates with an append-only log of updates; updates are
+# buffered in memory, written and folded into the aggregates every STATS_COMPACTION_INTERVAL_SECONDS
+STATS_DB_PATH = os.environ.get("STATS_DB_PATH", ".cache/stats.sqlite3")
+STATS_COMPACTION_INTERVAL_SECONDS = float(os.environ.get("STATS_COMPACTION_INTERVAL_SECONDS", "10"))
+STATS_CACHE_SIZE = int(os.environ.get("STATS_CACHE_SIZE", "10000"))
+
+# Budget of one agent-mode layout run: orchestrator turns, tokens of all its model
+# calls (tools included) and wall-clock seconds. When it runs out, the best valid
+# layout seen so far is used, or the local layout engine if there is none
+AGENT_MAX_TURNS = int(os.environ.get("AGENT_MAX_TURNS", "8"))
+AGENT_MAX_TOKENS = int(os.environ.get("AGENT_MAX_TOKENS", "100000"))
+AGENT_MAX_SECONDS = float(os.environ.get("AGENT_MAX_SECONDS", "180"))
@@ -0,0 +1,273 @@
+"""
+Persistent store of generated crosswords.
+
+Every finished puzzle is written once to a SQLite database in WAL mode as
+the JSON served by the API, next to its solution (never served, only read
+to check answers) and indexed metadata (theme, language, level, creation
+time). Listing uses keyset pagination over those indexes
+and fetching a puzzle is a single primary-key read, fronted by an LRU of
+recently served puzzles so hot ones never touch the database. Database
+reads and writes run in worker threads, so the event loop never waits on
+SQLite; the LRU is only touched on the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import CROSSWORD_CACHE_SIZE, CROSSWORD_DB_PATH
+from app.core.vocabulary import pool_key
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crosswords (
+    id TEXT PRIMARY KEY,
+    theme TEXT NOT NULL,
+    language TEXT NOT NULL,
+    level TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    solution TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS crosswords_created ON crosswords (created_at, id);
+CREATE INDEX IF NOT EXISTS crosswords_theme ON crosswords (theme, created_at, id);
+CREATE INDEX IF NOT EXISTS crosswords_language ON crosswords (language, created_at, id);
+CREATE INDEX IF NOT EXISTS crosswords_level ON crosswords (level, created_at, id);
+"""
+
+_SUMMARY_COLUMNS = "id, theme, language, level, rows, cols, word_count, created_at"
+
+
+@dataclass(frozen=True)
+class CrosswordSummary:
+    """Listing entry of a stored crossword."""
+    id: str
+    theme: str
+    language: str
+    level: str
+    rows: int
+    cols: int
+    word_count: int
+    created_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "theme": self.theme,
+            "language": self.language,
+            "level": self.level,
+            "board_size": {"rows": self.rows, "cols": self.cols},
+            "wordCount": self.word_count,
+            "createdAt": self.created_at
+        }
+
+
+def encode_cursor(created_at: float, crossword_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at!r}:{crossword_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, crossword_id = raw.split(":", 1)
+        return float(created_at), crossword_id
+    except (UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class CrosswordStore:
+    """SQLite-backed crossword store with an LRU of serialized puzzles."""
+
+    def __init__(self, path: str = CROSSWORD_DB_PATH, cache_size: int = CROSSWORD_CACHE_SIZE):
+        """
+        Open (or create) the crossword database.
+
+        Args:
+            path: SQLite database file
+            cache_size: Number of serialized puzzles kept in memory
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # Durable enough with WAL, and commits skip the fsync of every write
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(crosswords)")}
+        if "solution" not in columns:
+            # Databases created before solutions were kept apart from the served JSON
+            self._connection.execute("ALTER TABLE crosswords ADD COLUMN solution TEXT NOT NULL DEFAULT ''")
+        self._connection.commit()
+        self._lock = threading.Lock()
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    def _remember(self, crossword_id: str, data: str) -> None:
+        self._cache[crossword_id] = data
+        self._cache.move_to_end(crossword_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def save(
+        self,
+        crossword_id: str,
+        data: str,
+        theme: str,
+        language: str,
+        level: str,
+        rows: int,
+        cols: int,
+        word_count: int,
+        solution: str
+    ) -> None:
+        """
+        Store a finished crossword; saving an existing id keeps the first copy.
+
+        Args:
+            crossword_id: Id of the crossword
+            data: The crossword as served by the API (JSON)
+            theme: Theme it was generated for
+            language: Language of its words
+            level: Difficulty level
+            rows: Number of board rows
+            cols: Number of board columns
+            word_count: Number of placed words
+            solution: Row-major cells of the solved grid, kept for answer checks
+        """
+        theme, language, level = pool_key(theme, language, level)
+        row = (crossword_id, theme, language, level, rows, cols, word_count, time.time(), data, solution)
+        if await asyncio.to_thread(self._insert, row):
+            self._remember(crossword_id, data)
+
+    def _insert(self, row: Tuple[Any, ...]) -> bool:
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO crosswords "
+                    "(id, theme, language, level, rows, cols, word_count, created_at, data, solution) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row
+                )
+        return cursor.rowcount > 0
+
+    def _fetch(self, query: str, params: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    async def get(self, crossword_id: str) -> Optional[str]:
+        """
+        Fetch a crossword as served by the API.
+
+        Returns:
+            The crossword JSON, or None if it is not stored
+        """
+        data = self._cache.get(crossword_id)
+        if data is not None:
+            self._cache.move_to_end(crossword_id)
+            return data
+        rows = await asyncio.to_thread(self._fetch, "SELECT data FROM crosswords WHERE id = ?", (crossword_id,))
+        if not rows:
+            return None
+        self._remember(crossword_id, rows[0][0])
+        return rows[0][0]
+
+    async def get_solution(self, crossword_id: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Fetch the solution of a stored crossword; it is never cached or served.
+
+        Returns:
+            The row-major solution cells with the board rows and cols, or None
+            if the crossword is not stored or was stored without its solution
+        """
+        rows = await asyncio.to_thread(
+            self._fetch, "SELECT solution, rows, cols FROM crosswords WHERE id = ?", (crossword_id,)
+        )
+        if not rows or not rows[0][0]:
+            return None
+        return rows[0]
+
+    async def list(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        theme: Optional[str] = None,
+        language: Optional[str] = None,
+        level: Optional[str] = None
+    ) -> Tuple[List[CrosswordSummary], Optional[str]]:
+        """
+        List stored crosswords, newest first.
+
+        Args:
+            limit: Maximum number of crosswords to return
+            cursor: Cursor returned with the previous page
+            theme: Only crosswords of this theme
+            language: Only crosswords in this language
+            level: Only crosswords of this level
+
+        Returns:
+            The page of summaries and the cursor of the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        for column, value in (("theme", theme), ("language", language), ("level", level)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value.strip().lower())
+        if cursor:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = await asyncio.to_thread(
+            self._fetch,
+            f"SELECT {_SUMMARY_COLUMNS} FROM crosswords {where}ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1)
+        )
+
+        summaries = [CrosswordSummary(*row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = summaries[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return summaries, next_cursor
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_store: Optional[CrosswordStore] = None
+
+
+def get_crossword_store() -> CrosswordStore:
+    """
+    Get the process-wide crossword store.
+
+    Returns:
+        Shared CrosswordStore instance
+    """
+    global _store
+    if _store is None:
+        _store = CrosswordStore()
+    return _store
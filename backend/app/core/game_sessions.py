@@ -0,0 +1,187 @@
+"""
+In-memory game sessions with server-side answer checking.
+
+A session tracks which cells of its puzzle the player has solved; batched
+cell submissions are checked against the puzzle's hashed answer index.
+Score and completion follow from the solved cells and are never taken from
+the client, and each session has a budget of wrong letters, so answers
+cannot be found by trying every letter of a cell. Sessions live in a
+bounded store and expire after a period without updates.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.answers import AnswerIndex, AnswerIndexStore, get_answer_store
+from app.core.config import (
+    GAME_SESSION_CELL_SCORE,
+    GAME_SESSION_MAX,
+    GAME_SESSION_TTL_SECONDS,
+    GAME_SESSION_WRONG_LETTERS_PER_CELL,
+)
+
+
+class WrongLetterLimitError(Exception):
+    """Raised when a submission would exceed a session's budget of wrong letters."""
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+@dataclass
+class GameSession:
+    """One player's game of one puzzle."""
+    id: str
+    crossword_id: str
+    total_cells: int
+    user_id: Optional[str] = None
+    score: int = 0
+    completed: bool = False
+    start_time: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    solved: Set[int] = field(default_factory=set, repr=False)
+    wrong_letters: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "crosswordId": self.crossword_id,
+            "userId": self.user_id,
+            "score": self.score,
+            "completed": self.completed,
+            "startTime": _iso(self.start_time),
+            "endTime": _iso(self.end_time),
+            "createdAt": _iso(self.created_at),
+            "updatedAt": _iso(self.updated_at),
+            "solvedCells": len(self.solved),
+            "totalCells": self.total_cells
+        }
+
+
+class GameSessionStore:
+    """
+    Bounded store of game sessions.
+
+    Sessions idle for `ttl_seconds` expire, and the least recently updated
+    session is dropped once `max_sessions` are kept.
+    """
+
+    def __init__(
+        self,
+        answers: AnswerIndexStore,
+        max_sessions: int = 100000,
+        ttl_seconds: float = 86400.0,
+        wrong_letters_per_cell: float = 1.0,
+        cell_score: int = 10
+    ):
+        self._answers = answers
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self._wrong_letters_per_cell = wrong_letters_per_cell
+        self._cell_score = cell_score
+        self._sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, index: AnswerIndex, user_id: Optional[str] = None) -> GameSession:
+        session = GameSession(
+            id=uuid.uuid4().hex,
+            crossword_id=index.crossword_id,
+            total_cells=index.total_cells,
+            user_id=user_id
+        )
+        self._sessions[session.id] = session
+        self._evict()
+        return session
+
+    def get(self, session_id: str) -> Optional[GameSession]:
+        session = self._sessions.get(session_id)
+        if session is not None and time.time() - session.updated_at > self._ttl_seconds:
+            del self._sessions[session_id]
+            return None
+        return session
+
+    def submit(
+        self,
+        session: GameSession,
+        index: AnswerIndex,
+        cells: Iterable[Tuple[int, int, str]]
+    ) -> List[bool]:
+        """
+        Check a batch of cells and update the solved cells of a session.
+
+        A wrong or cleared letter un-solves its cell; cells outside the
+        board are reported as wrong and leave the session untouched. The
+        score follows the solved cells, and the session is completed once
+        every cell of the puzzle is solved.
+
+        Returns:
+            Whether each submitted letter is correct, in submission order
+
+        Raises:
+            WrongLetterLimitError: If the batch has more wrong letters than
+                the session has left; nothing of the batch is applied
+        """
+        cells = list(cells)
+        results = self._answers.check(index, cells)
+        wrong = sum(1 for (_, _, letter), correct in zip(cells, results) if letter.strip() and not correct)
+        if session.wrong_letters + wrong > self._wrong_letters_per_cell * session.total_cells:
+            raise WrongLetterLimitError(f"Game session {session.id} has no wrong letters left")
+        session.wrong_letters += wrong
+
+        for (row, col, _), correct in zip(cells, results):
+            if not (0 <= row < index.rows and 0 <= col < index.cols):
+                continue
+            position = row * index.cols + col
+            if correct:
+                session.solved.add(position)
+            else:
+                session.solved.discard(position)
+        if not session.completed:
+            session.score = self._cell_score * len(session.solved)
+        if session.total_cells and len(session.solved) == session.total_cells and not session.completed:
+            session.completed = True
+            session.end_time = session.end_time or time.time()
+        return results
+
+    def touch(self, session: GameSession) -> None:
+        """Mark a session as updated now."""
+        session.updated_at = time.time()
+        self._sessions.move_to_end(session.id)
+
+    def _evict(self) -> None:
+        now = time.time()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if len(self._sessions) <= self._max_sessions and now - oldest.updated_at <= self._ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+
+
+_session_store: Optional[GameSessionStore] = None
+
+
+def get_game_session_store() -> GameSessionStore:
+    """Get the shared game session store."""
+    global _session_store
+    if _session_store is None:
+        _session_store = GameSessionStore(
+            get_answer_store(),
+            GAME_SESSION_MAX,
+            GAME_SESSION_TTL_SECONDS,
+            GAME_SESSION_WRONG_LETTERS_PER_CELL,
+            GAME_SESSION_CELL_SCORE
+        )
+    return _session_store
@@ -0,0 +1,574 @@
+"""
+Content-addressed cache for generated clue images.
+
+Images are keyed on everything that determines the generation (prompt,
+model, size, quality), downloaded once and stored on local disk under the
+hash of their content. DALL-E URLs expire, so cached images are served
+from our own static route instead. The key -> blob index lives in memory
+and in a SQLite table next to the blobs, updated incrementally off the
+event loop. Every blob also gets WebP thumbnails in
+the configured widths (when Pillow is installed), and clue images link to
+a thumbnail instead of the full-size original. Images of stored crosswords
+are pinned and images of pooled ones held, so eviction never deletes a
+file a served puzzle still links to.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import (
+    IMAGE_CACHE_DIR,
+    IMAGE_CACHE_MAX_BYTES,
+    IMAGE_THUMBNAIL_DEFAULT_WIDTH,
+    IMAGE_THUMBNAIL_QUALITY,
+    IMAGE_THUMBNAIL_WIDTHS,
+    PUBLIC_BASE_URL,
+)
+from app.core.metrics import IMAGE_CACHE_REQUESTS
+from app.core.singleflight import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:  # Thumbnails are optional; originals are served without Pillow
+    Image = None
+
+if TYPE_CHECKING:
+    from app.core.tti import AsyncImageGeneratorProtocol, ImageGenerationConfig
+
+logger = logging.getLogger(__name__)
+
+IMAGE_ROUTE = "/api/images"
+BLOB_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(-\d+)?\.[a-z]+$")
+THUMBNAIL_NAME_PATTERN = re.compile(r"^([0-9a-f]{64})-(\d+)\.webp$")
+STEM_PATTERN = re.compile(r"^([0-9a-f]{64})[-.]")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    key TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL
+)
+"""
+
+# Content hashes of blobs that stored crosswords link to
+_PINS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pinned_images (
+    stem TEXT PRIMARY KEY
+)
+"""
+
+# Index row of a key, or None once the key is dropped: (filename, size, use counter)
+IndexChange = Optional[Tuple[str, int, int]]
+
+_CONTENT_TYPE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+}
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Cached blob referenced by a generation key."""
+    filename: str
+    size: int
+
+
+def image_cache_key(prompt: str, model: str, config: ImageGenerationConfig) -> str:
+    """
+    Build the cache key of an image generation request.
+
+    Args:
+        prompt: Full prompt sent to the model
+        model: Image model name
+        config: Generation configuration (size and quality are part of the key)
+
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps(
+        [prompt, model, config.size.value, config.quality.value],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def image_url(filename: str) -> str:
+    """Public URL of a cached blob."""
+    return f"{PUBLIC_BASE_URL}{IMAGE_ROUTE}/{filename}"
+
+
+def image_stem(url: Optional[str]) -> Optional[str]:
+    """Content hash of the blob behind one of our image or thumbnail URLs, or None for other URLs."""
+    prefix = f"{PUBLIC_BASE_URL}{IMAGE_ROUTE}/"
+    if not url or not url.startswith(prefix):
+        return None
+    match = STEM_PATTERN.match(url[len(prefix):])
+    return match.group(1) if match else None
+
+
+def thumbnails_enabled() -> bool:
+    return Image is not None and bool(IMAGE_THUMBNAIL_WIDTHS)
+
+
+def thumbnail_name(filename: str, width: int) -> str:
+    """Filename of the WebP thumbnail of a blob."""
+    return f"{filename.split('.')[0]}-{width}.webp"
+
+
+def thumbnail_srcset(url: Optional[str]) -> Optional[str]:
+    """
+    Build an <img srcset> of every thumbnail width from a thumbnail URL.
+
+    Returns:
+        The srcset, or None if the URL is not one of our thumbnails
+    """
+    prefix = f"{PUBLIC_BASE_URL}{IMAGE_ROUTE}/"
+    if not url or not url.startswith(prefix):
+        return None
+    match = THUMBNAIL_NAME_PATTERN.match(url[len(prefix):])
+    if match is None:
+        return None
+    return ", ".join(
+        f"{image_url(thumbnail_name(match.group(1), width))} {width}w"
+        for width in sorted(IMAGE_THUMBNAIL_WIDTHS)
+    )
+
+
+def render_thumbnail(data: bytes, width: int, quality: int = IMAGE_THUMBNAIL_QUALITY) -> bytes:
+    """
+    Downscale an image to the given width and encode it as WebP.
+
+    Images narrower than the width are only re-encoded.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        image = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+    if image.width > width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, "WEBP", quality=quality, method=4)
+    return output.getvalue()
+
+
+class ImageCache:
+    """
+    LRU-bounded image blob store on local disk.
+
+    The key -> blob index is kept in memory in LRU order, with a reference
+    count per blob, and persisted to SQLite next to the blobs, so the cache
+    survives restarts. Index changes are collected in memory and written,
+    and evicted blobs deleted, in a worker thread by `persist`.
+
+    Pinned blobs (linked from stored crosswords, kept across restarts) and
+    held blobs (linked from puzzles waiting in memory) are never evicted.
+    """
+
+    INDEX_FILENAME = "index.sqlite3"
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        """
+        Initialize the cache and load the persisted index.
+
+        Args:
+            directory: Directory for blobs and the index
+            max_bytes: Maximum total size of cached blobs
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._refs: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._clock = 0
+        self._changes: Dict[str, IndexChange] = {}
+        self._pinned: Set[str] = set()
+        self._new_pins: Set[str] = set()
+        self._held: Dict[str, int] = {}
+        # Blobs dropped from the index, deleted from disk by the next persist
+        self._orphans: List[str] = []
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(os.path.join(directory, self.INDEX_FILENAME), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.execute(_PINS_SCHEMA)
+        self._connection.commit()
+        self._lock = threading.Lock()
+        # Writes of successive persist calls must not overtake each other
+        self._persist_lock = asyncio.Lock()
+        self._load_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def path(self, filename: str) -> Optional[str]:
+        """
+        Resolve a blob filename to a path on disk.
+
+        Returns:
+            Path of the blob, or None if the name is invalid or the blob is missing
+        """
+        if not BLOB_NAME_PATTERN.match(filename):
+            return None
+        path = os.path.join(self._directory, filename)
+        return path if os.path.isfile(path) else None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a generation key and mark it as recently used.
+
+        Returns:
+            Blob filename, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not os.path.isfile(os.path.join(self._directory, entry.filename)):
+            self._forget(key)
+            return None
+        self._entries.move_to_end(key)
+        self._touch(key, entry)
+        return entry.filename
+
+    def put(self, key: str, data: bytes, extension: str = ".png") -> str:
+        """
+        Store a blob under its content hash and evict least recently used entries.
+
+        Args:
+            key: Generation key
+            data: Image bytes
+            extension: File extension of the blob
+
+        Returns:
+            Blob filename
+        """
+        filename = self.write_blob(data, extension)
+        self.add(key, filename, len(data))
+        self._flush()
+        return filename
+
+    def write_blob(self, data: bytes, extension: str = ".png") -> str:
+        """
+        Write a blob under its content hash without touching the index.
+
+        Safe to run in a worker thread; call `add` afterwards to index it.
+
+        Returns:
+            Blob filename
+        """
+        filename = hashlib.sha256(data).hexdigest() + extension
+        path = os.path.join(self._directory, filename)
+        if not os.path.isfile(path):
+            self._write_atomic(path, data)
+        return filename
+
+    def write_thumbnails(self, filename: str, data: bytes) -> int:
+        """
+        Write the WebP thumbnails of a blob. Safe to run in a worker thread.
+
+        Returns:
+            Total size of the thumbnails in bytes (0 if thumbnails are disabled)
+        """
+        if not thumbnails_enabled():
+            return 0
+        total = 0
+        for width in IMAGE_THUMBNAIL_WIDTHS:
+            thumbnail = render_thumbnail(data, width)
+            self._write_atomic(os.path.join(self._directory, thumbnail_name(filename, width)), thumbnail)
+            total += len(thumbnail)
+        return total
+
+    def thumbnail(self, filename: str) -> Optional[str]:
+        """
+        Resolve a thumbnail filename to a path, rendering it from its blob if needed.
+
+        Blocking; run it in a worker thread.
+
+        Returns:
+            Path of the thumbnail, or None if the width is not configured or the blob is missing
+        """
+        match = THUMBNAIL_NAME_PATTERN.match(filename)
+        if match is None or not thumbnails_enabled() or int(match.group(2)) not in IMAGE_THUMBNAIL_WIDTHS:
+            return None
+        path = os.path.join(self._directory, filename)
+        if os.path.isfile(path):
+            return path
+        sources = [
+            source for source in glob.glob(os.path.join(self._directory, match.group(1) + ".*"))
+            if not source.endswith(".tmp")
+        ]
+        if not sources:
+            return None
+        with open(sources[0], "rb") as file:
+            self._write_atomic(path, render_thumbnail(file.read(), int(match.group(2))))
+        return path
+
+    def add(self, key: str, filename: str, size: int) -> None:
+        """Index a written blob under a generation key and enforce the size bound; see `persist`."""
+        if key in self._entries:
+            self._forget(key)
+        entry = CacheEntry(filename=filename, size=size)
+        self._entries[key] = entry
+        self._refs[filename] = self._refs.get(filename, 0) + 1
+        self._total_bytes += size
+        self._touch(key, entry)
+        self._evict()
+
+    def pin(self, urls: Iterable[Optional[str]]) -> None:
+        """Keep the blobs behind image URLs for good (stored crosswords); see `persist`."""
+        stems = {stem for stem in map(image_stem, urls) if stem is not None} - self._pinned
+        self._pinned |= stems
+        self._new_pins |= stems
+
+    def hold(self, urls: Iterable[Optional[str]]) -> None:
+        """Keep the blobs behind image URLs until they are released; not persisted."""
+        for stem in map(image_stem, urls):
+            if stem is not None:
+                self._held[stem] = self._held.get(stem, 0) + 1
+
+    def release(self, urls: Iterable[Optional[str]]) -> None:
+        """Undo a `hold` of the same URLs and evict whatever no longer fits."""
+        for stem in map(image_stem, urls):
+            if stem is None or stem not in self._held:
+                continue
+            self._held[stem] -= 1
+            if self._held[stem] == 0:
+                del self._held[stem]
+        self._evict()
+
+    async def persist(self) -> None:
+        """Write the index changes and pins made since the last call and delete evicted blobs, in a worker thread."""
+        async with self._persist_lock:
+            changes, self._changes = self._changes, {}
+            pins, self._new_pins = self._new_pins, set()
+            orphans, self._orphans = self._orphans, []
+            if orphans:
+                await asyncio.to_thread(self._remove_blobs, orphans)
+            if not changes and not pins:
+                return
+            try:
+                await asyncio.to_thread(self._write_changes, changes, pins)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist the image cache index: {str(e)}")
+                # Newer changes of the same keys win
+                for key, change in changes.items():
+                    self._changes.setdefault(key, change)
+                self._new_pins |= pins
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _touch(self, key: str, entry: CacheEntry) -> None:
+        self._clock += 1
+        self._changes[key] = (entry.filename, entry.size, self._clock)
+
+    def _forget(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        self._changes[key] = None
+        refs = self._refs.get(entry.filename, 1) - 1
+        if refs > 0:
+            self._refs[entry.filename] = refs
+            return
+        self._refs.pop(entry.filename, None)
+        self._orphans.append(entry.filename)
+
+    def _is_kept(self, filename: str) -> bool:
+        stem = filename.split(".")[0]
+        return stem in self._pinned or stem in self._held
+
+    def _evict(self) -> None:
+        # The most recently used entry always stays, as the one just added
+        for key in list(self._entries)[:-1]:
+            if self._total_bytes <= self._max_bytes:
+                return
+            filename = self._entries[key].filename
+            if self._is_kept(filename):
+                continue
+            logger.debug(f"Evicting cached image {filename}")
+            self._forget(key)
+
+    def _remove_blobs(self, filenames: List[str]) -> None:
+        """Delete evicted blobs and their thumbnails. Blocking; run it in a worker thread."""
+        for filename in filenames:
+            # Written and indexed again since it was dropped
+            if filename in self._refs:
+                continue
+            stem = filename.split(".")[0]
+            for path in [os.path.join(self._directory, filename)] + glob.glob(
+                os.path.join(self._directory, f"{stem}-*.webp")
+            ):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _flush(self) -> None:
+        """Blocking counterpart of `persist`."""
+        changes, self._changes = self._changes, {}
+        pins, self._new_pins = self._new_pins, set()
+        orphans, self._orphans = self._orphans, []
+        self._remove_blobs(orphans)
+        self._write_changes(changes, pins)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix=".tmp", delete=False) as file:
+            file.write(data)
+        os.replace(file.name, path)
+
+    def _write_changes(self, changes: Dict[str, IndexChange], pins: Iterable[str] = ()) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO images (key, filename, size, used) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET filename = excluded.filename, size = excluded.size, used = excluded.used",
+                    [(key, *change) for key, change in changes.items() if change is not None]
+                )
+                self._connection.executemany(
+                    "DELETE FROM images WHERE key = ?",
+                    [(key,) for key, change in changes.items() if change is None]
+                )
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO pinned_images (stem) VALUES (?)",
+                    [(stem,) for stem in pins]
+                )
+
+    def _load_index(self) -> None:
+        with self._lock:
+            rows = self._connection.execute("SELECT key, filename, size, used FROM images ORDER BY used").fetchall()
+            self._pinned = {stem for (stem,) in self._connection.execute("SELECT stem FROM pinned_images")}
+
+        for key, filename, size, used in rows:
+            self._clock = max(self._clock, used)
+            if not os.path.isfile(os.path.join(self._directory, filename)):
+                self._changes[key] = None
+                continue
+            self._entries[key] = CacheEntry(filename=filename, size=size)
+            self._refs[filename] = self._refs.get(filename, 0) + 1
+            self._total_bytes += size
+        changes, self._changes = self._changes, {}
+        self._write_changes(changes)
+        logger.info(f"Loaded image cache with {len(self._entries)} entries ({self._total_bytes} bytes)")
+
+
+class CachedImageGenerator:
+    """
+    Image generator decorator that serves repeated prompts from the ImageCache.
+
+    On a miss the wrapped generator is called, the image is downloaded once
+    and stored; concurrent misses for the same key share one generation.
+    """
+
+    def __init__(
+        self,
+        generator: AsyncImageGeneratorProtocol,
+        cache: ImageCache,
+        model: str,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self._generator = generator
+        self._cache = cache
+        self._model = model
+        self._http_client = http_client
+        self._in_flight: SingleFlight[str] = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+        return self._http_client
+
+    async def generate_single_image(self, prompt: str, config: ImageGenerationConfig) -> str:
+        """
+        Return a cached image URL for the prompt, generating it on a miss.
+
+        Args:
+            prompt: Text prompt for image generation
+            config: Configuration for generation
+
+        Returns:
+            URL of the cached image (or the upstream URL if it couldn't be stored)
+        """
+        key = image_cache_key(prompt, self._model, config)
+        filename = self._cache.get(key)
+        if filename is not None:
+            self.hits += 1
+            IMAGE_CACHE_REQUESTS.labels(result="hit").inc()
+            return self._url(filename)
+
+        if not self._in_flight.in_flight(key):
+            self.misses += 1
+            IMAGE_CACHE_REQUESTS.labels(result="miss").inc()
+        # A caller giving up (e.g. on its deadline) doesn't cancel the generation others wait for
+        url, _ = await self._in_flight.do(key, lambda: self._generate_and_store(key, prompt, config))
+        return url
+
+    async def _generate_and_store(self, key: str, prompt: str, config: ImageGenerationConfig) -> str:
+        url = await self._generator.generate_single_image(prompt, config)
+        try:
+            response = await self._client().get(url)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to download generated image, serving upstream URL: {str(e)}")
+            return url
+
+        content_type = response.headers.get("content-type", "").split(";")[0].strip()
+        extension = _CONTENT_TYPE_EXTENSIONS.get(content_type, ".png")
+        filename, thumbnail_bytes = await asyncio.to_thread(self._write, response.content, extension)
+        self._cache.add(key, filename, len(response.content) + thumbnail_bytes)
+        await self._cache.persist()
+        return self._url(filename)
+
+    def _write(self, data: bytes, extension: str) -> Tuple[str, int]:
+        filename = self._cache.write_blob(data, extension)
+        try:
+            return filename, self._cache.write_thumbnails(filename, data)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to render thumbnails of {filename}: {str(e)}")
+            return filename, 0
+
+    @staticmethod
+    def _url(filename: str) -> str:
+        """URL handed out for a blob: its default-width thumbnail when thumbnails are on."""
+        if thumbnails_enabled() and IMAGE_THUMBNAIL_DEFAULT_WIDTH in IMAGE_THUMBNAIL_WIDTHS:
+            return image_url(thumbnail_name(filename, IMAGE_THUMBNAIL_DEFAULT_WIDTH))
+        return image_url(filename)
+
+
+_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """
+    Get the process-wide image cache.
+
+    Returns:
+        Shared ImageCache instance
+    """
+    global _image_cache
+    if _image_cache is None:
+        _image_cache = ImageCache()
+    return _image_cache
@@ -0,0 +1,191 @@
+"""
+Background job subsystem for long-running crossword generation.
+
+Submitting a job returns immediately; a fixed pool of worker tasks runs
+the jobs and records per-stage timings. Finished jobs are kept in a
+bounded store so their results can be polled later.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    """Raised when no more jobs can be queued."""
+
+
+@dataclass
+class Job:
+    """A queued or finished generation job."""
+    id: str
+    params: Dict[str, Any]
+    status: JobStatus = JobStatus.PENDING
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    _stage_mark: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+
+    def record_stage(self, stage: str) -> None:
+        """Record how many seconds a stage took, counting from the previous stage."""
+        now = time.time()
+        mark = self._stage_mark or self.started_at or now
+        self.stage_timings[stage] = round(now - mark, 3)
+        self._stage_mark = now
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status.value,
+            "params": self.params,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "stageTimings": self.stage_timings,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+JobRunner = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+class JobManager:
+    """
+    Bounded job queue with a fixed pool of worker tasks.
+
+    At most `max_finished` finished jobs are retained; the oldest ones are
+    dropped first.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        workers: int = 4,
+        max_queued: int = 100,
+        max_finished: int = 200
+    ):
+        """
+        Initialize the manager. Workers are started with `start`.
+
+        Args:
+            runner: Coroutine function executing a job and returning its result
+            workers: Number of jobs run concurrently
+            max_queued: Maximum number of jobs waiting for a worker
+            max_finished: Number of finished jobs kept for polling
+        """
+        self._runner = runner
+        self._worker_count = workers
+        self._max_queued = max_queued
+        self._max_finished = max_finished
+        self._jobs: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queued)
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self._worker_count)
+        ]
+        logger.info(f"Started job manager with {self._worker_count} workers")
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; unfinished jobs are marked as failed."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job in self._jobs.values():
+            if not job.is_finished:
+                job.status = JobStatus.FAILED
+                job.error = "Server shut down before the job finished"
+
+    def submit(self, params: Dict[str, Any]) -> Job:
+        """
+        Queue a new job.
+
+        Args:
+            params: Parameters passed to the runner via Job.params
+
+        Returns:
+            The pending job
+
+        Raises:
+            JobQueueFullError: If the queue is full or the manager is not started
+        """
+        if self._queue is None:
+            raise JobQueueFullError("Job manager is not running")
+        job = Job(id=uuid.uuid4().hex, params=params)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(f"Job queue is full ({self._max_queued} jobs)")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _retain(self, job: Job) -> None:
+        self._finished[job.id] = None
+        while len(self._finished) > self._max_finished:
+            job_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(job_id, None)
+
+    async def _worker(self) -> None:
+        while True:
+            job: Job = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = await self._runner(job)
+                job.status = JobStatus.COMPLETED
+            except asyncio.CancelledError:
+                job.status = JobStatus.FAILED
+                job.error = "Job was cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {str(e)}")
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = time.time()
+                self._retain(job)
+                self._queue.task_done()
+            logger.info(f"Job {job.id} {job.status.value} in {job.finished_at - job.started_at:.2f}s")
@@ -0,0 +1,96 @@
+"""
+Prometheus metrics of the crossword pipeline.
+
+Covers per-stage latency, OpenAI call latency, token usage, retries and
+circuit state per model, agent turns and budget overruns, image cache hit
+rate and image queue depth. Exposed on /metrics by app.api.metrics.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.stages import add_stage_listener
+
+STAGE_LATENCY = Histogram(
+    "crossword_stage_duration_seconds",
+    "Duration of crossword pipeline stages",
+    ["stage"],
+    buckets=(0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120, 240, 480)
+)
+
+OPENAI_REQUEST_LATENCY = Histogram(
+    "openai_request_duration_seconds",
+    "Latency of OpenAI API calls",
+    ["model", "endpoint", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, 240)
+)
+
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "Tokens used by OpenAI chat completions",
+    ["model", "type"]
+)
+
+AGENT_TURNS = Histogram(
+    "crossword_agent_turns",
+    "Model turns per orchestrator agent run",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 24)
+)
+
+AGENT_BUDGET_EXCEEDED = Counter(
+    "crossword_agent_budget_exceeded_total",
+    "Agent runs cut short by their budget",
+    ["reason"]
+)
+
+OPENAI_RETRIES = Counter(
+    "openai_retries_total",
+    "Retried OpenAI calls by error type",
+    ["model", "reason"]
+)
+
+OPENAI_CIRCUIT_STATE = Gauge(
+    "openai_circuit_state",
+    "Circuit breaker state per model (0 closed, 1 half-open, 2 open)",
+    ["model"]
+)
+
+IMAGE_CACHE_REQUESTS = Counter(
+    "image_cache_requests_total",
+    "Image cache lookups by result",
+    ["result"]
+)
+
+IMAGE_HEDGED_REQUESTS = Counter(
+    "image_hedged_requests_total",
+    "Duplicate image requests sent after the hedge delay, by winning request",
+    ["winner"]
+)
+
+IMAGE_DEADLINE_EXCEEDED = Counter(
+    "image_deadline_exceeded_total",
+    "Images given up on a deadline",
+    ["scope"]
+)
+
+IMAGE_FALLBACKS = Counter(
+    "image_fallback_generations_total",
+    "Images generated with the fallback model, by reason",
+    ["reason"]
+)
+
+IMAGE_QUEUE_DEPTH = Gauge(
+    "image_queue_depth",
+    "Images waiting for a free generation worker"
+)
+
+IMAGE_ACTIVE = Gauge(
+    "image_active_generations",
+    "Images currently being generated"
+)
+
+
+def _observe_stage(stage: str, seconds: float) -> None:
+    STAGE_LATENCY.labels(stage=stage).observe(seconds)
+
+
+add_stage_listener(_observe_stage)
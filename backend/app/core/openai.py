@@ -1,4 +1,23 @@
-from openai import OpenAI
-from app.core.config import OPENAI_API_KEY
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+from app.core.config import OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE_CONNECTIONS
 
-client = OpenAI(api_key=OPENAI_API_KEY)
\ No newline at end of file
+client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+
+# Blocking calls made through app.core.ratelimit retry on their own
+client_without_retries = client.with_options(max_retries=0)
+
+# Shared non-blocking client: a single connection pool for every request on the event loop
+async_client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    base_url=OPENAI_BASE_URL,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+)
+
+# Calls made through app.core.ratelimit retry on their own; the agents SDK keeps the default retries
+async_client_without_retries = async_client.with_options(max_retries=0)
@@ -0,0 +1,304 @@
+"""
+Incrementally aggregated player statistics.
+
+Every game session change becomes a small delta (games, completed games,
+score change, best score) that is applied to the player's in-memory
+aggregate and buffered. A background task periodically writes the buffer
+to a SQLite log and folds the log into one aggregate row per player, off
+the event loop, so recording an update never touches the database.
+Aggregates of recently seen players stay in an LRU; reading anyone else's
+stats is one indexed read in a worker thread, on its own connection, however
+many games the player has logged. Players without any games are not cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import STATS_CACHE_SIZE, STATS_COMPACTION_INTERVAL_SECONDS, STATS_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+ANONYMOUS = ""
+
+# (user_id, games, completed, score, best, created_at)
+Delta = Tuple[str, int, int, int, int, float]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_stats (
+    user_id TEXT PRIMARY KEY,
+    total_games INTEGER NOT NULL,
+    completed_games INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL,
+    best_score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stat_events (
+    user_id TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    best INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stat_events_user ON stat_events (user_id);
+"""
+
+
+@dataclass
+class PlayerStats:
+    """Aggregate statistics of one player."""
+    total_games: int = 0
+    completed_games: int = 0
+    score_sum: int = 0
+    best_score: int = 0
+
+    def apply(self, games: int, completed: int, score: int, best: int) -> None:
+        self.total_games += games
+        self.completed_games += completed
+        self.score_sum += score
+        self.best_score = max(self.best_score, best)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "totalGames": self.total_games,
+            "completedGames": self.completed_games,
+            "averageScore": round(self.score_sum / self.total_games, 2) if self.total_games else 0,
+            "bestScore": self.best_score
+        }
+
+
+class PlayerStatsStore:
+    """Per-player aggregates cached in memory, buffered, logged to SQLite and compacted in the background."""
+
+    def __init__(
+        self,
+        path: str = STATS_DB_PATH,
+        compaction_interval_seconds: float = STATS_COMPACTION_INTERVAL_SECONDS,
+        cache_size: int = STATS_CACHE_SIZE
+    ):
+        """
+        Open (or create) the statistics database.
+
+        Args:
+            path: SQLite database file
+            compaction_interval_seconds: Pause between flushes and compactions of the buffered updates
+            cache_size: Number of player aggregates kept in memory
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+        # Read-only connection for loading players; WAL lets it read while compaction writes
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # Serializes writes and compaction on the main connection
+        self._lock = threading.Lock()
+        # Held by flushes and loads: while it is held, every update not in the database is pending
+        self._flush_lock = asyncio.Lock()
+        self._cache_size = cache_size
+        self._stats: "OrderedDict[str, PlayerStats]" = OrderedDict()
+        # Updates not written yet
+        self._pending: List[Delta] = []
+        self._compaction_interval_seconds = compaction_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def _cached(self, user_id: str) -> Optional[PlayerStats]:
+        stats = self._stats.get(user_id)
+        if stats is not None:
+            self._stats.move_to_end(user_id)
+        return stats
+
+    def _read(self, user_id: str) -> Optional[PlayerStats]:
+        """Aggregate and logged updates of a player in one snapshot, or None if there are none."""
+        self._reader.execute("BEGIN")
+        try:
+            row = self._reader.execute(
+                "SELECT total_games, completed_games, score_sum, best_score FROM player_stats WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+            logged = self._reader.execute(
+                "SELECT COUNT(*), COALESCE(SUM(games), 0), COALESCE(SUM(completed), 0), COALESCE(SUM(score), 0), "
+                "COALESCE(MAX(best), 0) FROM stat_events WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        finally:
+            self._reader.execute("COMMIT")
+        if row is None and logged[0] == 0:
+            return None
+        stats = PlayerStats(*row) if row else PlayerStats()
+        stats.apply(*logged[1:])
+        return stats
+
+    async def get(self, user_id: Optional[str]) -> PlayerStats:
+        """Statistics of a player (games without a user id count as anonymous)."""
+        user_id = user_id or ANONYMOUS
+        stats = self._cached(user_id)
+        if stats is not None:
+            return stats
+        async with self._flush_lock:
+            # Another request may have loaded the player meanwhile
+            stats = self._cached(user_id)
+            if stats is not None:
+                return stats
+            stats = await asyncio.to_thread(self._read, user_id)
+            # No flush ran since the snapshot, so the pending updates are exactly the ones it lacks
+            unwritten = [delta for delta in self._pending if delta[0] == user_id]
+        if stats is None and not unwritten:
+            # Unknown players are not cached, so made-up ids can't flush the cache
+            return PlayerStats()
+        stats = stats or PlayerStats()
+        for _, games, completed, score, best, _ in unwritten:
+            stats.apply(games, completed, score, best)
+        self._stats[user_id] = stats
+        while len(self._stats) > self._cache_size:
+            self._stats.popitem(last=False)
+        return stats
+
+    def record(self, user_id: Optional[str], games: int = 0, completed: int = 0, score: int = 0, best: int = 0) -> None:
+        """
+        Apply a delta to a player's statistics.
+
+        Args:
+            user_id: Player, None for anonymous games
+            games: Number of new games
+            completed: Number of newly completed games
+            score: Change of the total score
+            best: A score the player reached
+        """
+        user_id = user_id or ANONYMOUS
+        stats = self._cached(user_id)
+        if stats is not None:
+            # Players not in the cache pick the update up from the buffer when loaded
+            stats.apply(games, completed, score, best)
+        self._pending.append((user_id, games, completed, score, best, time.time()))
+
+    def record_game_started(self, user_id: Optional[str]) -> None:
+        self.record(user_id, games=1)
+
+    def record_game_updated(
+        self,
+        user_id: Optional[str],
+        previous_score: int,
+        previous_completed: bool,
+        score: int,
+        completed: bool
+    ) -> None:
+        """Record the change of a game session's score and completion."""
+        newly_completed = int(completed and not previous_completed)
+        if score == previous_score and not newly_completed:
+            return
+        self.record(user_id, completed=newly_completed, score=score - previous_score, best=score)
+
+    async def flush(self) -> int:
+        """
+        Write the buffered updates to the update log in a worker thread.
+
+        Returns:
+            Number of updates written
+        """
+        async with self._flush_lock:
+            deltas, self._pending = self._pending, []
+            if not deltas:
+                return 0
+            try:
+                await asyncio.to_thread(self._write, deltas)
+            except sqlite3.Error:
+                # Keep the updates for the next flush
+                self._pending[:0] = deltas
+                raise
+        return len(deltas)
+
+    def _write(self, deltas: List[Delta]) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO stat_events (user_id, games, completed, score, best, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    deltas
+                )
+
+    def compact(self) -> int:
+        """
+        Fold the update log into the per-player aggregate rows.
+
+        Returns:
+            Number of log entries folded
+        """
+        with self._lock:
+            last = self._connection.execute("SELECT MAX(rowid) FROM stat_events").fetchone()[0]
+            if last is None:
+                return 0
+            with self._connection:
+                folded = self._connection.execute(
+                    "SELECT COUNT(*) FROM stat_events WHERE rowid <= ?", (last,)
+                ).fetchone()[0]
+                self._connection.execute(
+                    "INSERT INTO player_stats (user_id, total_games, completed_games, score_sum, best_score) "
+                    "SELECT user_id, SUM(games), SUM(completed), SUM(score), MAX(best) "
+                    "FROM stat_events WHERE rowid <= ? GROUP BY user_id "
+                    "ON CONFLICT(user_id) DO UPDATE SET "
+                    "total_games = total_games + excluded.total_games, "
+                    "completed_games = completed_games + excluded.completed_games, "
+                    "score_sum = score_sum + excluded.score_sum, "
+                    "best_score = MAX(best_score, excluded.best_score)",
+                    (last,)
+                )
+                self._connection.execute("DELETE FROM stat_events WHERE rowid <= ?", (last,))
+        return folded
+
+    def start(self) -> None:
+        """Start the background compaction task on the running event loop."""
+        if self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._compaction_loop(), name="player-stats-compaction")
+
+    async def stop(self) -> None:
+        """Cancel the compaction task, write the buffered updates and fold what is left of the log."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        await asyncio.to_thread(self.compact)
+
+    async def _compaction_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._compaction_interval_seconds)
+            try:
+                await self.flush()
+                folded = await asyncio.to_thread(self.compact)
+            except sqlite3.Error as e:
+                logger.error(f"Player stats compaction failed: {str(e)}")
+                continue
+            if folded:
+                logger.info(f"Compacted {folded} player stats updates")
+
+
+_store: Optional[PlayerStatsStore] = None
+
+
+def get_player_stats_store() -> PlayerStatsStore:
+    """
+    Get the process-wide player statistics store.
+
+    Returns:
+        Shared PlayerStatsStore instance
+    """
+    global _store
+    if _store is None:
+        _store = PlayerStatsStore()
+    return _store
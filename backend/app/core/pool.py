@@ -0,0 +1,122 @@
+"""
+Pool of pre-generated crosswords.
+
+Finished puzzles are kept per difficulty level and handed out in constant
+time; a background task refills every level back to its watermark.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Generic, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CrosswordFactory = Callable[[str], Awaitable[T]]
+
+
+class CrosswordPool(Generic[T]):
+    """
+    Per-difficulty queues of ready crosswords with background refill.
+
+    A single refill task walks the levels and generates puzzles until each
+    queue reaches the watermark, then sleeps until a puzzle is taken.
+    """
+
+    def __init__(
+        self,
+        factory: CrosswordFactory[T],
+        difficulties: Iterable[str],
+        watermark: int = 2,
+        retry_delay_seconds: float = 30.0
+    ):
+        """
+        Initialize an empty pool.
+
+        Args:
+            factory: Coroutine function generating one crossword for a difficulty
+            difficulties: Difficulty levels to keep puzzles for
+            watermark: Number of puzzles to keep ready per difficulty
+            retry_delay_seconds: Pause after a failed generation
+        """
+        self._factory = factory
+        self._watermark = watermark
+        self._retry_delay_seconds = retry_delay_seconds
+        self._queues: Dict[str, Deque[T]] = {level: deque() for level in difficulties}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def size(self, difficulty: str) -> int:
+        """Number of ready puzzles for a difficulty."""
+        queue = self._queues.get(difficulty)
+        return len(queue) if queue is not None else 0
+
+    def take(self, difficulty: str) -> Optional[T]:
+        """
+        Take a ready puzzle and schedule a refill.
+
+        Returns:
+            Crossword data, or None if the pool for the difficulty is empty
+        """
+        queue = self._queues.get(difficulty)
+        if not queue:
+            return None
+        crossword = queue.popleft()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return crossword
+
+    def start(self) -> None:
+        """Start the background refill task on the running event loop."""
+        if self._task is not None or self._watermark <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._refill_loop(), name="crossword-pool-refill")
+        logger.info(f"Started crossword pool refill (watermark {self._watermark} per difficulty)")
+
+    async def stop(self) -> None:
+        """Cancel the background refill task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _next_level(self) -> Optional[str]:
+        """Level with the fewest ready puzzles below the watermark."""
+        levels = [level for level, queue in self._queues.items() if len(queue) < self._watermark]
+        if not levels:
+            return None
+        return min(levels, key=lambda level: len(self._queues[level]))
+
+    async def _refill_loop(self) -> None:
+        while True:
+            level = self._next_level()
+            if level is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            start_time = time.time()
+            try:
+                crossword = await self._factory(level)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to pre-generate {level} crossword: {str(e)}")
+                await asyncio.sleep(self._retry_delay_seconds)
+                continue
+
+            self._queues[level].append(crossword)
+            logger.info(
+                f"Pre-generated {level} crossword in {time.time() - start_time:.2f}s "
+                f"({len(self._queues[level])}/{self._watermark} ready)"
+            )
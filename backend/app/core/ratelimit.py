@@ -0,0 +1,368 @@
+"""
+Client-side rate limiting, retries and circuit breaking of OpenAI calls.
+
+Every model gets a request bucket and a token bucket that start from
+configured quotas and adapt to the x-ratelimit-* headers of each response,
+so all calls of the process share the remaining quota; the token estimate
+taken before a call is settled against the usage it reports. Retryable
+failures (429, 5xx, timeouts, connection errors) are retried with jittered
+exponential backoff; a circuit breaker fails calls fast while the model
+keeps failing after retries. Blocking calls made from worker threads go
+through the same limiter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import openai
+
+from app.core.config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    OPENAI_BACKOFF_BASE_SECONDS,
+    OPENAI_BACKOFF_MAX_SECONDS,
+    OPENAI_MAX_ATTEMPTS,
+    RATE_LIMIT_DEFAULT_RPM,
+    RATE_LIMIT_DEFAULT_TPM,
+)
+from app.core.metrics import OPENAI_CIRCUIT_STATE, OPENAI_RETRIES
+
+logger = logging.getLogger(__name__)
+
+DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a model whose circuit is open."""
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a reset duration like '6m0s', '1.5s' or '20ms' into seconds."""
+    if not value:
+        return None
+    parts = DURATION_PART_PATTERN.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at capacity per minute.
+
+    Waiters are served in arrival order. The server's view of the remaining
+    quota wins over the local one, since other processes share the quota.
+    Coroutines and blocking callers in worker threads draw from the same level.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._thread_lock = threading.Lock()
+        # Guards the level itself, shared by both kinds of callers
+        self._level_lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self, amount: float) -> float:
+        """Take `amount` if the bucket holds it; otherwise return how long to wait before trying again."""
+        with self._level_lock:
+            amount = min(amount, self.capacity)
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                return pause
+            self._refill()
+            if self.level >= amount:
+                self.level -= amount
+                return 0.0
+            return (amount - self.level) / self.rate
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until `amount` can be taken from the bucket, then take it."""
+        async with self._lock:
+            while (wait := self._take(amount)) > 0:
+                await asyncio.sleep(wait)
+
+    def acquire_blocking(self, amount: float = 1.0) -> None:
+        """Blocking counterpart of `acquire`, for calls made from worker threads."""
+        with self._thread_lock:
+            while (wait := self._take(amount)) > 0:
+                time.sleep(wait)
+
+    def settle(self, reserved: float, used: float) -> None:
+        """Give back what a call reserved but didn't use, or take what it used beyond that."""
+        with self._level_lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + min(reserved, self.capacity) - used)
+
+    def update(self, limit: Optional[int], remaining: Optional[int], reset_seconds: Optional[float]) -> None:
+        """Adopt the quota reported by the rate-limit headers of a response."""
+        with self._level_lock:
+            if limit:
+                self.capacity = float(limit)
+            if remaining is not None:
+                self._refill()
+                self.level = min(self.level, float(remaining))
+        if remaining is not None and remaining <= 0 and reset_seconds:
+            self.pause(reset_seconds)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every waiter for `seconds` (after a 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitState(str, Enum):
+    """States of a circuit breaker."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after `failure_threshold` failed calls in a row, rejects calls for
+    `reset_seconds`, then lets a single probe call through; its outcome
+    closes or re-opens the circuit. Safe to share between the event loop and
+    worker threads.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently rejected."""
+        if self.state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            return False
+        return self.state != CircuitState.CLOSED
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return
+            if self.state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._set_state(CircuitState.HALF_OPEN)
+            if self.state == CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        raise CircuitOpenError(f"Circuit for {self.name} is open")
+
+    def release(self) -> None:
+        """Give back the probe slot of a call that ended without an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self.state != CircuitState.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != CircuitState.OPEN:
+                    logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+                self._set_state(CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> None:
+        self.state = state
+        OPENAI_CIRCUIT_STATE.labels(model=self.name).set(
+            {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}[state]
+        )
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, openai.RateLimitError):
+        # Exhausted billing quota does not recover by waiting
+        return getattr(error, "code", None) != "insufficient_quota"
+    if isinstance(error, (openai.APIConnectionError, openai.InternalServerError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code in (408, 409)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    if "retry-after-ms" in headers:
+        return parse_duration(headers["retry-after-ms"] + "ms")
+    return parse_duration(headers.get("retry-after"))
+
+
+class ModelLimiter:
+    """Request and token buckets plus circuit breaker of one model."""
+
+    def __init__(self, model: str, requests_per_minute: int, tokens_per_minute: int):
+        self.model = model
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.circuit = CircuitBreaker(model, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Adapt the buckets to the x-ratelimit-* headers of a response."""
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            bucket.update(
+                _header_int(headers, f"x-ratelimit-limit-{kind}"),
+                _header_int(headers, f"x-ratelimit-remaining-{kind}"),
+                parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            )
+
+    async def call(self, fn: Callable[[], Awaitable[Any]], tokens: int = 0) -> Any:
+        """
+        Call the API through the limiter, retrying retryable failures.
+
+        Args:
+            fn: Coroutine function making the call with `with_raw_response`
+            tokens: Estimated tokens used by the call, settled against its reported usage
+
+        Returns:
+            The parsed API response
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open
+            openai.OpenAIError: The last error once retries are exhausted, or a non-retryable one
+        """
+        self.circuit.before_call()
+        attempt = 0
+        while True:
+            await self.requests.acquire()
+            if tokens:
+                await self.tokens.acquire(tokens)
+            try:
+                raw = await fn()
+            except asyncio.CancelledError:
+                self.circuit.release()
+                raise
+            except Exception as e:
+                attempt += 1
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            return self._succeeded(raw, tokens)
+
+    def call_blocking(self, fn: Callable[[], Any], tokens: int = 0) -> Any:
+        """
+        Blocking counterpart of `call` for the synchronous client; run it in a worker thread.
+
+        Args:
+            fn: Function making the call with `with_raw_response`
+            tokens: Estimated tokens used by the call, settled against its reported usage
+
+        Returns:
+            The parsed API response
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open
+            openai.OpenAIError: The last error once retries are exhausted, or a non-retryable one
+        """
+        self.circuit.before_call()
+        attempt = 0
+        while True:
+            self.requests.acquire_blocking()
+            if tokens:
+                self.tokens.acquire_blocking(tokens)
+            try:
+                raw = fn()
+            except Exception as e:
+                attempt += 1
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            return self._succeeded(raw, tokens)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt; returns the backoff before the next one, or None to give up."""
+        retry_after = _retry_after(error)
+        if isinstance(error, openai.RateLimitError) and retry_after:
+            self.requests.pause(retry_after)
+        if isinstance(error, openai.APIStatusError):
+            self.observe_headers(error.response.headers)
+
+        if not _is_retryable(error):
+            # A rejected request (400, 401, 404, ...) says nothing about the model's health
+            self.circuit.release()
+            return None
+        if attempt >= OPENAI_MAX_ATTEMPTS:
+            self.circuit.record_failure()
+            return None
+
+        # Full jitter, but never sooner than the server asked for
+        delay = random.uniform(0, min(OPENAI_BACKOFF_MAX_SECONDS, OPENAI_BACKOFF_BASE_SECONDS * 2 ** attempt))
+        delay = max(delay, retry_after or 0.0)
+        OPENAI_RETRIES.labels(model=self.model, reason=type(error).__name__).inc()
+        logger.warning(f"{self.model} call failed ({type(error).__name__}), retry {attempt} in {delay:.2f}s")
+        return delay
+
+    def _succeeded(self, raw: Any, tokens: int) -> Any:
+        self.observe_headers(raw.headers)
+        self.circuit.record_success()
+        response = raw.parse()
+        usage = getattr(response, "usage", None)
+        if tokens and usage is not None and getattr(usage, "total_tokens", None) is not None:
+            self.tokens.settle(tokens, usage.total_tokens)
+        return response
+
+
+_limiters: Dict[str, ModelLimiter] = {}
+
+
+def get_rate_limiter(model: str) -> ModelLimiter:
+    """Get the shared limiter of a model."""
+    limiter = _limiters.get(model)
+    if limiter is None:
+        limiter = ModelLimiter(model, RATE_LIMIT_DEFAULT_RPM, RATE_LIMIT_DEFAULT_TPM)
+        _limiters[model] = limiter
+    return limiter
@@ -0,0 +1,72 @@
+"""
+Single-flight deduplication of concurrent identical calls.
+
+Callers asking for the same key while a call is in flight attach to it
+instead of starting their own, and all of them receive its result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: "asyncio.Task[T]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls by key.
+
+    The shared call is cancelled only when every caller waiting on it has
+    been cancelled.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call[T]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Deduplication key
+            fn: Coroutine function producing the result
+
+        Returns:
+            Tuple of the result and whether it was shared with an earlier caller
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            logger.info(f"Attached to in-flight call for {key} ({call.waiters + 1} waiting)")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call[T]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
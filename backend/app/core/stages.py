@@ -0,0 +1,48 @@
+"""
+Pipeline stage timing hooks.
+
+The crossword pipeline reports how long each stage took; listeners (the
+benchmark harness, metrics) subscribe to those reports.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+StageListener = Callable[[str, float], None]
+
+_listeners: List[StageListener] = []
+
+
+def add_stage_listener(listener: StageListener) -> None:
+    """Subscribe to stage timings; the listener is called with (stage, seconds)."""
+    _listeners.append(listener)
+
+
+def remove_stage_listener(listener: StageListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Report the duration of a pipeline stage to every listener."""
+    for listener in list(_listeners):
+        try:
+            listener(stage, seconds)
+        except Exception as e:
+            logger.warning(f"Stage listener failed for {stage}: {str(e)}")
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Time the enclosed block and report it as a stage (also when it raises)."""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start_time)
@@ -10,27 +10,85 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+import itertools
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Deque, Dict, List, Optional, Protocol, Tuple
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from openai.types.images_response import ImagesResponse
 
-from app.core.openai import client
+from app.core.config import (
+    IMAGE_BATCH_DEADLINE_SECONDS,
+    IMAGE_CACHE_ENABLED,
+    IMAGE_FALLBACK_MODEL,
+    IMAGE_FALLBACK_QUEUE_DEPTH,
+    IMAGE_FALLBACK_SIZE,
+    IMAGE_HEDGE_ENABLED,
+    IMAGE_HEDGE_MIN_SAMPLES,
+    IMAGE_HEDGE_PERCENTILE,
+    IMAGE_MAX_CONCURRENCY,
+    IMAGE_MODEL,
+    IMAGE_QUALITY,
+    IMAGE_SIZE,
+    IMAGE_TIMEOUT_SECONDS,
+)
+from app.core.image_cache import CachedImageGenerator, get_image_cache
+from app.core.metrics import (
+    IMAGE_ACTIVE,
+    IMAGE_DEADLINE_EXCEEDED,
+    IMAGE_FALLBACKS,
+    IMAGE_HEDGED_REQUESTS,
+    IMAGE_QUEUE_DEPTH,
+    OPENAI_REQUEST_LATENCY,
+)
+from app.core.openai import async_client_without_retries, client_without_retries
+from app.core.ratelimit import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
 class ImageSize(str, Enum):
     """Supported image sizes for DALL-E API."""
+    SMALL = "256x256"
+    MEDIUM = "512x512"
     SQUARE = "1024x1024"
     LANDSCAPE = "1792x1024"  
     PORTRAIT = "1024x1792"
 
 
+# Sizes each model accepts, smallest first
+MODEL_SIZES: Dict[str, List[ImageSize]] = {
+    "dall-e-2": [ImageSize.SMALL, ImageSize.MEDIUM, ImageSize.SQUARE],
+    "dall-e-3": [ImageSize.SQUARE, ImageSize.LANDSCAPE, ImageSize.PORTRAIT],
+}
+
+
+def supported_size(model: str, size: ImageSize) -> ImageSize:
+    """
+    Closest size the model can generate.
+    
+    Args:
+        model: Image model name
+        size: Requested size
+        
+    Returns:
+        The requested size if the model supports it, else the smallest
+        supported size at least as large (the largest one otherwise)
+    """
+    sizes = MODEL_SIZES.get(model)
+    if not sizes or size in sizes:
+        return size
+    width = int(size.value.split("x")[0])
+    for candidate in sizes:
+        if int(candidate.value.split("x")[0]) >= width:
+            return candidate
+    return sizes[-1]
+
+
 class ImageQuality(str, Enum):
     """Supported image quality levels for DALL-E API."""
     STANDARD = "standard"
@@ -43,7 +101,7 @@ class ImageGenerationConfig:
     size: ImageSize = ImageSize.SQUARE
     quality: ImageQuality = ImageQuality.STANDARD
     max_workers: int = 5
-    timeout_seconds: float = 30.0
+    timeout_seconds: float = IMAGE_TIMEOUT_SECONDS
 
 
 @dataclass(frozen=True)
@@ -97,6 +155,24 @@ class ImageGeneratorProtocol(Protocol):
         ...
 
 
+class AsyncImageGeneratorProtocol(Protocol):
+    """Protocol for non-blocking image generators."""
+    
+    async def generate_single_image(
+        self, 
+        prompt: str, 
+        config: ImageGenerationConfig
+    ) -> str:
+        """Generate a single image from prompt."""
+        ...
+
+
+def _observe_image_call(model: str, start_time: float, outcome: str) -> None:
+    OPENAI_REQUEST_LATENCY.labels(model=model, endpoint="images", outcome=outcome).observe(
+        time.perf_counter() - start_time
+    )
+
+
 class DallEImageGenerator:
     """DALL-E implementation of image generator."""
     
@@ -122,32 +198,192 @@ class DallEImageGenerator:
         Raises:
             ImageGenerationError: If generation fails
         """
+        start_time = time.perf_counter()
+        try:
+            logger.debug(f"Generating image with prompt: {prompt}")
+            
+            response: ImagesResponse = get_rate_limiter(self._model).call_blocking(
+                lambda: self._client.images.with_raw_response.generate(
+                    model=self._model,
+                    prompt=prompt,
+                    size=config.size.value,
+                    quality=config.quality.value,
+                    response_format="url",
+                    n=1
+                )
+            )
+            
+            if not response.data or not response.data[0].url:
+                raise ImageGenerationError("No image URL returned from API")
+                
+            _observe_image_call(self._model, start_time, "success")
+            return response.data[0].url
+            
+        except Exception as e:
+            _observe_image_call(self._model, start_time, "error")
+            error_msg = f"Failed to generate image: {str(e)}"
+            logger.error(error_msg)
+            raise ImageGenerationError(error_msg, original_error=e)
+
+
+class AsyncDallEImageGenerator:
+    """
+    DALL-E implementation of image generator on the shared async client.
+    
+    Calls go through the model's shared rate limiter, which retries
+    rate-limited and transient failures before an image is given up.
+    """
+    
+    def __init__(self, client: AsyncOpenAI, model: str = "dall-e-3"):
+        self._client = client
+        self._model = model
+        
+    async def generate_single_image(
+        self, 
+        prompt: str, 
+        config: ImageGenerationConfig
+    ) -> str:
+        """
+        Generate a single image using DALL-E API without blocking the event loop.
+        
+        Args:
+            prompt: Text prompt for image generation
+            config: Configuration for generation
+            
+        Returns:
+            URL of generated image
+            
+        Raises:
+            ImageGenerationError: If generation fails
+        """
+        start_time = time.perf_counter()
         try:
             logger.debug(f"Generating image with prompt: {prompt}")
             
-            response: ImagesResponse = self._client.images.generate(
-                model=self._model,
-                prompt=prompt,
-                size=config.size.value,
-                quality=config.quality.value,
-                response_format="url",
-                n=1
+            response: ImagesResponse = await get_rate_limiter(self._model).call(
+                lambda: self._client.images.with_raw_response.generate(
+                    model=self._model,
+                    prompt=prompt,
+                    size=config.size.value,
+                    quality=config.quality.value,
+                    response_format="url",
+                    n=1
+                )
             )
             
             if not response.data or not response.data[0].url:
                 raise ImageGenerationError("No image URL returned from API")
                 
+            _observe_image_call(self._model, start_time, "success")
             return response.data[0].url
             
         except Exception as e:
+            _observe_image_call(self._model, start_time, "error")
             error_msg = f"Failed to generate image: {str(e)}"
             logger.error(error_msg)
             raise ImageGenerationError(error_msg, original_error=e)
 
 
+class LatencyTracker:
+    """Sliding window of recent call latencies."""
+    
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+    
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+    
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (q in 0..100) of the window."""
+        ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[rank]
+
+
+class HedgedImageGenerator:
+    """
+    Image generator decorator that hedges slow requests.
+    
+    Once a request has taken longer than the given percentile of recent
+    successful generations, an identical duplicate is sent; whichever
+    finishes first wins and the other is cancelled. Costs at most one extra
+    image for the slowest requests in exchange for a bounded tail.
+    """
+    
+    def __init__(
+        self,
+        generator: AsyncImageGeneratorProtocol,
+        percentile: float = 90.0,
+        min_samples: int = 20
+    ):
+        self._generator = generator
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._latencies = LatencyTracker()
+    
+    def _hedge_delay(self) -> Optional[float]:
+        if len(self._latencies) < self._min_samples:
+            return None
+        return self._latencies.percentile(self._percentile)
+    
+    async def generate_single_image(
+        self, 
+        prompt: str, 
+        config: ImageGenerationConfig
+    ) -> str:
+        """
+        Generate an image, sending a duplicate request if the first one is slow.
+        
+        Args:
+            prompt: Text prompt for image generation
+            config: Configuration for generation
+            
+        Returns:
+            URL of the first successfully generated image
+        """
+        started: Dict[asyncio.Future, float] = {}
+        
+        def launch() -> asyncio.Future:
+            task = asyncio.ensure_future(self._generator.generate_single_image(prompt, config))
+            started[task] = time.perf_counter()
+            return task
+        
+        primary = launch()
+        pending = {primary}
+        hedged = False
+        error: Optional[BaseException] = None
+        try:
+            delay = self._hedge_delay()
+            if delay is not None:
+                await asyncio.wait(pending, timeout=delay)
+                if not primary.done():
+                    hedged = True
+                    pending.add(launch())
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        # Cancelled from below, not by our caller; the other request may still win
+                        error = error or ImageGenerationError("Image request was cancelled")
+                        continue
+                    if task.exception() is None:
+                        self._latencies.observe(time.perf_counter() - started[task])
+                        if hedged:
+                            IMAGE_HEDGED_REQUESTS.labels(winner="primary" if task is primary else "hedge").inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
 class TextToImageService:
     """
-    Professional text-to-image service with thread-safe batch processing.
+    Professional text-to-image service with non-blocking batch processing.
     
     This service provides robust image generation capabilities using OpenAI's
     DALL-E API with comprehensive error handling, logging, and performance monitoring.
@@ -158,7 +394,8 @@ class TextToImageService:
     def __init__(
         self, 
         image_generator: Optional[ImageGeneratorProtocol] = None,
-        default_config: Optional[ImageGenerationConfig] = None
+        default_config: Optional[ImageGenerationConfig] = None,
+        async_image_generator: Optional[AsyncImageGeneratorProtocol] = None
     ):
         """
         Initialize the text-to-image service.
@@ -166,9 +403,21 @@ class TextToImageService:
         Args:
             image_generator: Image generator implementation (defaults to DALL-E)
             default_config: Default configuration for image generation
+            async_image_generator: Non-blocking generator used by the async API (defaults to DALL-E)
         """
-        self._image_generator = image_generator or DallEImageGenerator(client)
+        self._image_generator = image_generator or DallEImageGenerator(client_without_retries)
+        self._async_image_generator = async_image_generator or AsyncDallEImageGenerator(async_client_without_retries)
         self._default_config = default_config or ImageGenerationConfig()
+    
+    @property
+    def default_config(self) -> ImageGenerationConfig:
+        return self._default_config
+        
+    @staticmethod
+    def _format_prompt(text: str, prompt_template: str) -> str:
+        if "{text}" not in prompt_template:
+            raise ValueError("Prompt template must contain {text} placeholder")
+        return prompt_template.format(text=text)
         
     def generate_image_for_text(
         self,
@@ -190,10 +439,7 @@ class TextToImageService:
         config = config or self._default_config
         
         try:
-            if "{text}" not in prompt_template:
-                raise ValueError("Prompt template must contain {text} placeholder")
-                
-            prompt = prompt_template.format(text=text)
+            prompt = self._format_prompt(text, prompt_template)
             url = self._image_generator.generate_single_image(prompt, config)
             
             logger.debug(f"Successfully generated image for text: {text}")
@@ -204,14 +450,55 @@ class TextToImageService:
             logger.warning(error_msg)
             return ImageGenerationResult(text=text, url=None, error=error_msg)
     
-    def generate_images_batch(
+    async def generate_image_for_text_async(
+        self,
+        text: str,
+        prompt_template: str = DEFAULT_PROMPT_TEMPLATE,
+        config: Optional[ImageGenerationConfig] = None
+    ) -> ImageGenerationResult:
+        """
+        Non-blocking variant of generate_image_for_text, limited to config.timeout_seconds.
+        
+        Args:
+            text: Input text to generate image for
+            prompt_template: Template for formatting the prompt (must contain {text})
+            config: Generation configuration (uses default if not provided)
+            
+        Returns:
+            ImageGenerationResult containing the result and metadata
+        """
+        config = config or self._default_config
+        
+        try:
+            prompt = self._format_prompt(text, prompt_template)
+            url = await asyncio.wait_for(
+                self._async_image_generator.generate_single_image(prompt, config),
+                timeout=config.timeout_seconds
+            )
+            
+            logger.debug(f"Successfully generated image for text: {text}")
+            return ImageGenerationResult(text=text, url=url)
+            
+        except asyncio.TimeoutError:
+            IMAGE_DEADLINE_EXCEEDED.labels(scope="image").inc()
+            error_msg = f"Image for text '{text}' timed out after {config.timeout_seconds:.0f}s"
+            logger.warning(error_msg)
+            return ImageGenerationResult(text=text, url=None, error=error_msg)
+        except Exception as e:
+            error_msg = f"Failed to generate image for text '{text}': {str(e)}"
+            logger.warning(error_msg)
+            return ImageGenerationResult(text=text, url=None, error=error_msg)
+    
+    async def generate_images_async(
         self,
         texts: List[str],
         prompt_template: str = DEFAULT_PROMPT_TEMPLATE,
         config: Optional[ImageGenerationConfig] = None
     ) -> BatchGenerationResult:
         """
-        Generate images for multiple texts using thread pool for parallel processing.
+        Generate images for multiple texts concurrently on the event loop.
+        
+        At most config.max_workers requests are in flight at once.
         
         Args:
             texts: List of texts to generate images for
@@ -221,121 +508,339 @@ class TextToImageService:
         Returns:
             BatchGenerationResult with detailed metrics and results
         """
-        if not texts:
-            return BatchGenerationResult(
-                results=[], 
-                total_count=0, 
-                successful_count=0, 
-                failed_count=0,
-                execution_time_seconds=0.0
-            )
-            
         config = config or self._default_config
         start_time = time.time()
+        semaphore = asyncio.Semaphore(config.max_workers)
         
-        logger.info(f"Starting batch image generation for {len(texts)} texts with {config.max_workers} workers")
-        
-        # Initialize results list to maintain order
-        results: List[Optional[ImageGenerationResult]] = [None] * len(texts)
-        
-        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-            # Submit all tasks
-            future_to_index = {
-                executor.submit(
-                    self.generate_image_for_text,
-                    text,
-                    prompt_template,
-                    config
-                ): index
-                for index, text in enumerate(texts)
-            }
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_index):
-                index = future_to_index[future]
-                try:
-                    result = future.result(timeout=config.timeout_seconds)
-                    results[index] = result
-                    
-                    if result.is_success:
-                        logger.debug(f"Generated image {index + 1}/{len(texts)}")
-                    else:
-                        logger.warning(f"Failed to generate image {index + 1}/{len(texts)}: {result.error}")
-                        
-                except Exception as e:
-                    error_msg = f"Thread execution failed for text '{texts[index]}': {str(e)}"
-                    logger.error(error_msg)
-                    results[index] = ImageGenerationResult(
-                        text=texts[index], 
-                        url=None, 
-                        error=error_msg
-                    )
+        async def generate(text: str) -> ImageGenerationResult:
+            async with semaphore:
+                return await self.generate_image_for_text_async(text, prompt_template, config)
         
-        # Calculate metrics
-        final_results = [r for r in results if r is not None]
-        successful_count = sum(1 for r in final_results if r.is_success)
-        failed_count = len(final_results) - successful_count
+        results = list(await asyncio.gather(*(generate(text) for text in texts)))
+        successful_count = sum(1 for r in results if r.is_success)
         execution_time = time.time() - start_time
         
         batch_result = BatchGenerationResult(
-            results=final_results,
+            results=results,
             total_count=len(texts),
             successful_count=successful_count,
-            failed_count=failed_count,
+            failed_count=len(results) - successful_count,
             execution_time_seconds=execution_time
         )
         
         logger.info(
-            f"Batch generation completed in {execution_time:.2f}s: "
+            f"Async batch generation completed in {execution_time:.2f}s: "
             f"{successful_count}/{len(texts)} successful ({batch_result.success_rate:.1f}%)"
         )
         
         return batch_result
+
+
+def deadline_placeholder(text: str) -> ImageGenerationResult:
+    """Failed result standing in for an image dropped on a batch deadline."""
+    IMAGE_DEADLINE_EXCEEDED.labels(scope="batch").inc()
+    return ImageGenerationResult(text=text, url=None, error="Image batch deadline exceeded")
+
+
+@dataclass
+class _ImageJob:
+    """Single queued image request."""
+    text: str
+    prompt_template: str
+    config: Optional[ImageGenerationConfig]
+    future: asyncio.Future
+
+
+class ImageGenerationScheduler:
+    """
+    Process-wide scheduler for image generation.
     
-    async def generate_images_async(
+    All crossword requests share one service, one generator and a fixed
+    number of worker tasks, which bounds the number of concurrent DALL-E
+    calls globally. Batches are served round-robin, so a large batch can't
+    starve requests that arrive after it. Under load (a deep queue or an
+    open circuit of the primary model) images go to the fallback service.
+    """
+    
+    def __init__(
+        self,
+        service: Optional[TextToImageService] = None,
+        max_concurrency: int = IMAGE_MAX_CONCURRENCY,
+        fallback_service: Optional[TextToImageService] = None,
+        fallback_queue_depth: int = IMAGE_FALLBACK_QUEUE_DEPTH,
+        primary_model: str = IMAGE_MODEL
+    ):
+        """
+        Initialize the scheduler. Workers start lazily on the running event loop.
+        
+        Args:
+            service: Service used to generate images (defaults to DALL-E)
+            max_concurrency: Maximum number of images generated at once
+            fallback_service: Faster service used under load (no fallback if None)
+            fallback_queue_depth: Queue depth from which the fallback service is used
+            primary_model: Model of `service`, whose circuit state triggers the fallback
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._service = service or create_tti_service()
+        self._fallback_service = fallback_service
+        self._fallback_queue_depth = fallback_queue_depth
+        self._primary_model = primary_model
+        self._max_concurrency = max_concurrency
+        self._batch_ids = itertools.count()
+        self._queues: "OrderedDict[int, Deque[_ImageJob]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._available: Optional[asyncio.Semaphore] = None
+        self._workers: List[asyncio.Task] = []
+        self._active = 0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of images waiting for a free worker."""
+        return sum(len(queue) for queue in self._queues.values())
+    
+    @property
+    def active_count(self) -> int:
+        """Number of images currently being generated."""
+        return self._active
+    
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            # A worker can only stop by being cancelled; keep the pool at full size
+            for i, worker in enumerate(self._workers):
+                if worker.done():
+                    logger.warning(f"Image worker {i} stopped, restarting it")
+                    self._workers[i] = loop.create_task(self._worker(), name=f"image-worker-{i}")
+            return
+        # First use, or the previous loop is gone: start a fresh worker set
+        self._loop = loop
+        self._queues.clear()
+        self._available = asyncio.Semaphore(0)
+        self._workers = [
+            loop.create_task(self._worker(), name=f"image-worker-{i}")
+            for i in range(self._max_concurrency)
+        ]
+        logger.info(f"Started image generation scheduler with {self._max_concurrency} workers")
+    
+    def _next_job(self) -> Optional[_ImageJob]:
+        """Pop the next job, rotating across batches."""
+        while self._queues:
+            batch_id, queue = self._queues.popitem(last=False)
+            job = queue.popleft()
+            if queue:
+                self._queues[batch_id] = queue
+            if not job.future.done():
+                IMAGE_QUEUE_DEPTH.set(self.queue_depth)
+                return job
+        IMAGE_QUEUE_DEPTH.set(self.queue_depth)
+        return None
+    
+    def _fallback_reason(self) -> Optional[str]:
+        """Why the next image should use the fallback service, if it should."""
+        if self._fallback_service is None:
+            return None
+        if get_rate_limiter(self._primary_model).circuit.is_open:
+            return "circuit"
+        if self._fallback_queue_depth > 0 and self.queue_depth >= self._fallback_queue_depth:
+            return "queue"
+        return None
+    
+    def _route(self, job: _ImageJob) -> Tuple[TextToImageService, Optional[ImageGenerationConfig]]:
+        reason = self._fallback_reason()
+        if reason is None:
+            return self._service, job.config
+        IMAGE_FALLBACKS.labels(reason=reason).inc()
+        if job.config is None:
+            return self._fallback_service, None
+        fallback_config = self._fallback_service.default_config
+        return self._fallback_service, replace(job.config, size=fallback_config.size, quality=fallback_config.quality)
+    
+    async def _worker(self) -> None:
+        while True:
+            await self._available.acquire()
+            job = self._next_job()
+            if job is None:
+                continue
+            self._active += 1
+            IMAGE_ACTIVE.inc()
+            try:
+                service, config = self._route(job)
+                call = asyncio.ensure_future(service.generate_image_for_text_async(
+                    job.text, job.prompt_template, config
+                ))
+                # A cancelled job (its requester went away) stops the running call too
+                job.future.add_done_callback(
+                    lambda future, call=call: call.cancel() if future.cancelled() else None
+                )
+                result = await call
+                if not job.future.done():
+                    job.future.set_result(result)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    if not job.future.done():
+                        job.future.cancel()
+                    raise
+                # Cancelled from inside the call (e.g. a shared in-flight task), not this worker
+                if not job.future.done():
+                    job.future.set_result(ImageGenerationResult(text=job.text, url=None, error="Image generation cancelled"))
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_result(ImageGenerationResult(text=job.text, url=None, error=str(e)))
+            finally:
+                self._active -= 1
+                IMAGE_ACTIVE.dec()
+    
+    def submit_batch(
         self,
         texts: List[str],
-        prompt_template: str = DEFAULT_PROMPT_TEMPLATE,
+        prompt_template: str = TextToImageService.DEFAULT_PROMPT_TEMPLATE,
         config: Optional[ImageGenerationConfig] = None
+    ) -> List[asyncio.Future]:
+        """
+        Queue a batch of images.
+        
+        Args:
+            texts: List of texts to generate images for
+            prompt_template: Template for formatting prompts
+            config: Generation configuration
+            
+        Returns:
+            One future per text (in input order) resolving to an ImageGenerationResult
+        """
+        self._ensure_workers()
+        loop = asyncio.get_running_loop()
+        jobs = deque(
+            _ImageJob(text, prompt_template, config, loop.create_future())
+            for text in texts
+        )
+        futures = [job.future for job in jobs]
+        if jobs:
+            self._queues[next(self._batch_ids)] = jobs
+            IMAGE_QUEUE_DEPTH.set(self.queue_depth)
+            for _ in jobs:
+                self._available.release()
+        return futures
+    
+    async def generate_batch(
+        self,
+        texts: List[str],
+        prompt_template: str = TextToImageService.DEFAULT_PROMPT_TEMPLATE,
+        config: Optional[ImageGenerationConfig] = None,
+        deadline_seconds: Optional[float] = None
     ) -> BatchGenerationResult:
         """
-        Async wrapper for batch image generation.
+        Queue a batch of images and wait for them, at most deadline_seconds.
         
         Args:
             texts: List of texts to generate images for
             prompt_template: Template for formatting prompts
             config: Generation configuration
+            deadline_seconds: Time after which unfinished images are dropped (no limit if None)
             
         Returns:
-            BatchGenerationResult with detailed metrics and results
+            BatchGenerationResult with detailed metrics and results; images
+            missing at the deadline are failed placeholder results
         """
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            self.generate_images_batch,
-            texts,
-            prompt_template,
-            config
+        start_time = time.time()
+        futures = self.submit_batch(texts, prompt_template, config)
+        try:
+            if futures:
+                await asyncio.wait(futures, timeout=deadline_seconds)
+        except asyncio.CancelledError:
+            # Drop queued jobs of an abandoned batch
+            for future in futures:
+                future.cancel()
+            raise
+        
+        results: List[ImageGenerationResult] = []
+        for text, future in zip(texts, futures):
+            if future.done() and not future.cancelled():
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append(deadline_placeholder(text))
+        
+        successful_count = sum(1 for r in results if r.is_success)
+        execution_time = time.time() - start_time
+        logger.info(
+            f"Scheduled batch completed in {execution_time:.2f}s: {successful_count}/{len(texts)} successful, "
+            f"{self.queue_depth} images still queued"
+        )
+        return BatchGenerationResult(
+            results=results,
+            total_count=len(texts),
+            successful_count=successful_count,
+            failed_count=len(results) - successful_count,
+            execution_time_seconds=execution_time
         )
+    
+    async def close(self) -> None:
+        """Stop the workers and cancel every queued image."""
+        for queue in self._queues.values():
+            for job in queue:
+                job.future.cancel()
+        self._queues.clear()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
 
 
 # Factory function for backward compatibility and ease of use
 def create_tti_service(
-    model: str = "dall-e-3",
-    config: Optional[ImageGenerationConfig] = None
+    model: str = IMAGE_MODEL,
+    config: Optional[ImageGenerationConfig] = None,
+    size: str = IMAGE_SIZE
 ) -> TextToImageService:
     """
     Factory function to create a TTI service instance.
     
     Args:
         model: DALL-E model to use
-        config: Default configuration
+        config: Default configuration (defaults to the configured image tier)
+        size: Image size of the default configuration, adjusted to what the model supports
         
     Returns:
-        Configured TextToImageService instance
+        Configured TextToImageService instance (async generation is hedged
+        when IMAGE_HEDGE_ENABLED is set and goes through the local image
+        cache when IMAGE_CACHE_ENABLED is set)
+    """
+    if config is None:
+        config = ImageGenerationConfig(
+            size=supported_size(model, ImageSize(size)),
+            # HD is a dall-e-3 option
+            quality=ImageQuality(IMAGE_QUALITY) if model == "dall-e-3" else ImageQuality.STANDARD
+        )
+    generator = DallEImageGenerator(client_without_retries, model)
+    async_generator: AsyncImageGeneratorProtocol = AsyncDallEImageGenerator(async_client_without_retries, model)
+    if IMAGE_HEDGE_ENABLED:
+        # Below the cache, whose single-flight would merge the duplicate into the original
+        async_generator = HedgedImageGenerator(async_generator, IMAGE_HEDGE_PERCENTILE, IMAGE_HEDGE_MIN_SAMPLES)
+    if IMAGE_CACHE_ENABLED:
+        async_generator = CachedImageGenerator(async_generator, get_image_cache(), model)
+    return TextToImageService(generator, config, async_generator)
+
+
+_scheduler: Optional[ImageGenerationScheduler] = None
+
+
+def get_image_scheduler() -> ImageGenerationScheduler:
+    """
+    Get the process-wide image generation scheduler.
+    
+    Returns:
+        Shared ImageGenerationScheduler instance
     """
-    generator = DallEImageGenerator(client, model)
-    return TextToImageService(generator, config)
+    global _scheduler
+    if _scheduler is None:
+        fallback_service = None
+        if IMAGE_FALLBACK_QUEUE_DEPTH > 0 and IMAGE_FALLBACK_MODEL and IMAGE_FALLBACK_MODEL != IMAGE_MODEL:
+            fallback_service = create_tti_service(IMAGE_FALLBACK_MODEL, size=IMAGE_FALLBACK_SIZE)
+        _scheduler = ImageGenerationScheduler(fallback_service=fallback_service)
+    return _scheduler
 
 
 # Convenience function for crossword generation (backward compatibility)
@@ -349,8 +854,7 @@ async def generate_images_for_crossword(definitions: List[str]) -> List[Optional
     Returns:
         List of image URLs (None for failed generations)
     """
-    service = create_tti_service()
-    result = await service.generate_images_async(definitions)
+    result = await get_image_scheduler().generate_batch(definitions, deadline_seconds=IMAGE_BATCH_DEADLINE_SECONDS)
     
     # Convert to legacy format for backward compatibility
     return [r.url for r in result.results]
@@ -9,14 +9,32 @@ from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMe
 
 from typing import Optional, Union
 
-from app.core.openai import client
+from app.core.metrics import OPENAI_REQUEST_LATENCY, OPENAI_TOKENS
+from app.core.openai import async_client_without_retries, client_without_retries
+from app.core.ratelimit import get_rate_limiter
+from app.core.usage import record_usage
 
 import json
 import logging
+import time
 
 
 logger = logging.getLogger(__name__)
 
+# Tokens reserved for the completion of a call, on top of the prompt estimate
+COMPLETION_TOKEN_ALLOWANCE = 1000
+
+
+def _estimate_tokens(params: dict) -> int:
+    """Rough token count of a completion call (about 4 characters per token)."""
+    prompt = json.dumps([params.get("messages", []), params.get("tools", [])], ensure_ascii=False, default=str)
+    return len(prompt) // 4 + COMPLETION_TOKEN_ALLOWANCE
+
+
+def _json_schema_format(name: str, schema: dict) -> dict:
+    """Response format of a strict structured-output call."""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
 
 class TTT:
     """
@@ -30,7 +48,7 @@ class TTT:
         Args:
             model: OpenAI model name
         """
-        self.client = client
+        self.client = client_without_retries
         self.model = model
 
     def generate_response(
@@ -49,8 +67,7 @@ class TTT:
             Generated text response
         """
         try:
-            response: ChatCompletion = self.client.chat.completions.create(
-                model=self.model,
+            response: ChatCompletion = self._create_completion(
                 messages=messages,
                 # temperature=kwargs.get('temperature', 0.7),
                 # max_tokens=kwargs.get('max_tokens', 1000),
@@ -63,7 +80,7 @@ class TTT:
 
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
-            raise Exception(f"Error generating response: {str(e)}")
+            raise
 
     def generate_response_with_tools(
         self, 
@@ -89,8 +106,7 @@ class TTT:
                 # If no tools provided, use regular chat completion
                 return self.generate_response(messages, **kwargs)
 
-            response: ChatCompletion = self.client.chat.completions.create(
-                model=self.model,
+            response: ChatCompletion = self._create_completion(
                 messages=messages,
                 tools=tools,
                 tool_choice=tool_choice,
@@ -98,32 +114,134 @@ class TTT:
                 # max_tokens=kwargs.get('max_tokens', 1000)
             )
             
-            choice = response.choices[0]
-            message: ChatCompletionMessage = choice.message
-            
-            # Check if AI wants to call a function
-            if message.tool_calls:
-                tool_call: ChatCompletionMessageToolCall = message.tool_calls[0]
-                logger.info(f"Tool call: {tool_call.function.name}")
-                
-                try:
-                    # Parse function arguments
-                    args = json.loads(tool_call.function.arguments)
-                    return {
-                        "function_name": tool_call.function.name,
-                        "arguments": args,
-                        "tool_call_id": tool_call.id
-                    }
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse function arguments: {e}")
-                    return {"error": f"Invalid function arguments: {str(e)}"}
-            
-            # Return regular text response if no function call
-            return message.content or ""
+            return self._parse_tool_response(response)
             
         except Exception as e:
             logger.error(f"Error generating response with function: {str(e)}")
-            raise Exception(f"Error generating response with function: {str(e)}")
+            raise
+
+    def generate_structured_response(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        name: str,
+        schema: dict
+    ) -> dict:
+        """
+        Generate a response that conforms to a JSON schema (strict structured outputs)
+        
+        Args:
+            messages: List of properly typed chat completion messages
+            name: Name of the schema
+            schema: JSON schema of the response; every object must list all
+                its properties as required and disallow additional ones
+            
+        Returns:
+            The parsed response
+        """
+        try:
+            response: ChatCompletion = self._create_completion(
+                messages=messages,
+                response_format=_json_schema_format(name, schema)
+            )
+            
+            return self._parse_structured_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating structured response: {str(e)}")
+            raise
+
+    def _create_completion(self, **params) -> ChatCompletion:
+        """
+        Call the Chat Completions API for this model and record its metrics
+        
+        Blocks on the model's shared rate limiter, which also retries
+        rate-limited and transient failures.
+        
+        Args:
+            **params: Parameters of the API call (except model)
+            
+        Returns:
+            Chat completion returned by the API
+        """
+        start_time = time.perf_counter()
+        try:
+            response: ChatCompletion = get_rate_limiter(self.model).call_blocking(
+                lambda: self.client.chat.completions.with_raw_response.create(model=self.model, **params),
+                tokens=_estimate_tokens(params)
+            )
+        except Exception:
+            self._record_call(start_time, None)
+            raise
+        self._record_call(start_time, response)
+        return response
+
+    def _record_call(self, start_time: float, response: Optional[ChatCompletion]) -> None:
+        """
+        Record latency and token usage of a completion call
+        
+        Args:
+            start_time: perf_counter value taken before the call
+            response: Completion, or None if the call failed
+        """
+        outcome = "success" if response is not None else "error"
+        OPENAI_REQUEST_LATENCY.labels(model=self.model, endpoint="chat", outcome=outcome).observe(
+            time.perf_counter() - start_time
+        )
+        if response is not None and response.usage is not None:
+            OPENAI_TOKENS.labels(model=self.model, type="prompt").inc(response.usage.prompt_tokens)
+            OPENAI_TOKENS.labels(model=self.model, type="completion").inc(response.usage.completion_tokens)
+            record_usage(response.usage.total_tokens)
+
+    def _parse_structured_response(self, response: ChatCompletion) -> dict:
+        """
+        Parse the content of a structured-output completion
+        
+        Args:
+            response: Chat completion returned by the API
+            
+        Returns:
+            The parsed response
+            
+        Raises:
+            ValueError: If the model refused or the content is not JSON
+        """
+        message: ChatCompletionMessage = response.choices[0].message
+        if getattr(message, "refusal", None):
+            raise ValueError(f"Model refused the request: {message.refusal}")
+        return json.loads(message.content or "")
+
+    def _parse_tool_response(self, response: ChatCompletion) -> Union[str, dict[str, any]]:
+        """
+        Extract the first tool call (or the text content) from a completion
+        
+        Args:
+            response: Chat completion returned by the API
+            
+        Returns:
+            Either text response or function call arguments
+        """
+        choice = response.choices[0]
+        message: ChatCompletionMessage = choice.message
+        
+        # Check if AI wants to call a function
+        if message.tool_calls:
+            tool_call: ChatCompletionMessageToolCall = message.tool_calls[0]
+            logger.info(f"Tool call: {tool_call.function.name}")
+            
+            try:
+                # Parse function arguments
+                args = json.loads(tool_call.function.arguments)
+                return {
+                    "function_name": tool_call.function.name,
+                    "arguments": args,
+                    "tool_call_id": tool_call.id
+                }
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse function arguments: {e}")
+                return {"error": f"Invalid function arguments: {str(e)}"}
+        
+        # Return regular text response if no function call
+        return message.content or ""
 
     def create_chat_message(
         self, 
@@ -208,4 +326,143 @@ class TTT:
         Returns:
             Properly typed assistant message
         """
-        return {"role": "assistant", "content": content}
\ No newline at end of file
+        return {"role": "assistant", "content": content}
+
+
+class AsyncTTT(TTT):
+    """
+    Text to Text on the shared async client
+
+    Same API as TTT, but the completion calls are coroutines, so they
+    don't block the event loop while waiting for the model.
+    """
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        """
+        Initialize async OpenAI client
+        
+        Args:
+            model: OpenAI model name
+        """
+        super().__init__(model)
+        self.client = async_client_without_retries
+
+    async def _create_completion(self, **params) -> ChatCompletion:
+        """
+        Call the Chat Completions API for this model and record its metrics
+        
+        The call goes through the model's shared rate limiter, which also
+        retries rate-limited and transient failures.
+        
+        Args:
+            **params: Parameters of the API call (except model)
+            
+        Returns:
+            Chat completion returned by the API
+        """
+        start_time = time.perf_counter()
+        try:
+            response: ChatCompletion = await get_rate_limiter(self.model).call(
+                lambda: self.client.chat.completions.with_raw_response.create(model=self.model, **params),
+                tokens=_estimate_tokens(params)
+            )
+        except Exception:
+            self._record_call(start_time, None)
+            raise
+        self._record_call(start_time, response)
+        return response
+
+    async def generate_response(
+        self, 
+        messages: list[ChatCompletionMessageParam], 
+        **kwargs
+    ) -> str:
+        """
+        Generate text response using OpenAI Chat Completions API
+        
+        Args:
+            messages: List of properly typed chat completion messages
+            **kwargs: Additional parameters for the API call
+            
+        Returns:
+            Generated text response
+        """
+        try:
+            response: ChatCompletion = await self._create_completion(
+                messages=messages,
+                top_p=kwargs.get('top_p', 1.0),
+                frequency_penalty=kwargs.get('frequency_penalty', 0.0),
+                presence_penalty=kwargs.get('presence_penalty', 0.0)
+            )
+            
+            return response.choices[0].message.content or ""
+
+        except Exception as e:
+            logger.error(f"Error generating response: {str(e)}")
+            raise
+
+    async def generate_response_with_tools(
+        self, 
+        messages: list[ChatCompletionMessageParam], 
+        tools: Optional[list[ChatCompletionToolParam]] = None,
+        tool_choice: Optional[ChatCompletionToolChoiceOptionParam] = "auto",
+        **kwargs
+    ) -> Union[str, dict[str, any]]:
+        """
+        Generate response with function/tool calling capability
+        
+        Args:
+            messages: List of properly typed chat completion messages
+            tools: List of properly typed tool definitions
+            tool_choice: "auto", "none", or specific tool choice
+            **kwargs: Additional parameters
+            
+        Returns:
+            Either text response or function call arguments
+        """
+        try:
+            if not tools:
+                # If no tools provided, use regular chat completion
+                return await self.generate_response(messages, **kwargs)
+
+            response: ChatCompletion = await self._create_completion(
+                messages=messages,
+                tools=tools,
+                tool_choice=tool_choice,
+            )
+            
+            return self._parse_tool_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating response with function: {str(e)}")
+            raise
+
+    async def generate_structured_response(
+        self,
+        messages: list[ChatCompletionMessageParam],
+        name: str,
+        schema: dict
+    ) -> dict:
+        """
+        Generate a response that conforms to a JSON schema (strict structured outputs)
+        
+        Args:
+            messages: List of properly typed chat completion messages
+            name: Name of the schema
+            schema: JSON schema of the response; every object must list all
+                its properties as required and disallow additional ones
+            
+        Returns:
+            The parsed response
+        """
+        try:
+            response: ChatCompletion = await self._create_completion(
+                messages=messages,
+                response_format=_json_schema_format(name, schema)
+            )
+            
+            return self._parse_structured_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error generating structured response: {str(e)}")
+            raise
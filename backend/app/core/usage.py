@@ -0,0 +1,40 @@
+"""
+Token usage accounting of the current task.
+
+Code that wants to bound the tokens spent on its behalf opens a
+UsageCounter with count_usage(); every completion recorded in that
+context, including tasks spawned from it, is added to the counter.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class UsageCounter:
+    """Tokens used by the model calls of one unit of work."""
+    tokens: int = 0
+
+
+_counter: ContextVar[Optional[UsageCounter]] = ContextVar("usage_counter", default=None)
+
+
+@contextmanager
+def count_usage(counter: UsageCounter) -> Iterator[UsageCounter]:
+    """Add the tokens of every call made inside the block to `counter`."""
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
+
+
+def record_usage(tokens: int) -> None:
+    """Add tokens to the counter of the current context, if any."""
+    counter = _counter.get()
+    if counter is not None:
+        counter.tokens += tokens
@@ -0,0 +1,196 @@
+"""
+Persistent vocabulary store for crossword words.
+
+Every word list returned by the model is added to a SQLite pool keyed by
+(theme, language, level). Once a pool is large enough, the word stage
+samples a fresh random subset from it instead of calling the model.
+Database reads and writes run in worker threads, off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import VOCABULARY_CACHE_POOLS, VOCABULARY_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    theme TEXT NOT NULL,
+    language TEXT NOT NULL,
+    level TEXT NOT NULL,
+    word TEXT NOT NULL,
+    word_key TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (theme, language, level, word_key)
+)
+"""
+
+
+def pool_key(theme: str, language: str, level: str) -> PoolKey:
+    """Normalize generation parameters into a pool key."""
+    return theme.strip().lower(), language.strip().lower(), level.strip().lower()
+
+
+def _is_valid_word(item: dict) -> bool:
+    word = str(item.get("word", "")).strip()
+    return len(word) >= 2 and word.isalpha() and bool(str(item.get("definition", "")).strip())
+
+
+class VocabularyStore:
+    """
+    SQLite-backed word pools with an in-memory copy for fast sampling.
+
+    Pools are loaded from disk on first access and the most recently used
+    ones are kept in memory, so sampling a warm pool never touches the
+    database.
+    """
+
+    def __init__(self, path: str = VOCABULARY_DB_PATH, cache_pools: int = VOCABULARY_CACHE_POOLS):
+        """
+        Open (or create) the vocabulary database.
+
+        Args:
+            path: SQLite database file
+            cache_pools: Number of pools kept in memory
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+        self._lock = threading.Lock()
+        self._cache_pools = cache_pools
+        self._pools: "OrderedDict[PoolKey, Dict[str, dict]]" = OrderedDict()
+
+    async def _pool(self, key: PoolKey) -> Dict[str, dict]:
+        pool = self._pools.get(key)
+        if pool is None:
+            rows = await asyncio.to_thread(self._read_pool, key)
+            # A concurrent load of the same pool may have finished first; keep its copy
+            pool = self._pools.setdefault(
+                key, {word_key: {"word": word, "definition": definition} for word, word_key, definition in rows}
+            )
+        self._pools.move_to_end(key)
+        while len(self._pools) > self._cache_pools:
+            self._pools.popitem(last=False)
+        return pool
+
+    def _read_pool(self, key: PoolKey) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT word, word_key, definition FROM words WHERE theme = ? AND language = ? AND level = ?",
+                key
+            ).fetchall()
+
+    def _insert(self, rows: List[Tuple[Any, ...]]) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO words "
+                    "(theme, language, level, word, word_key, definition, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+
+    async def count(self, theme: str, language: str, level: str, max_length: Optional[int] = None) -> int:
+        """Number of distinct words in a pool, only counting words of at most `max_length` letters if given."""
+        pool = await self._pool(pool_key(theme, language, level))
+        if max_length is None:
+            return len(pool)
+        return sum(1 for item in pool.values() if len(item["word"].strip()) <= max_length)
+
+    async def add_words(self, theme: str, language: str, level: str, words: List[dict]) -> int:
+        """
+        Add model-generated words to a pool, ignoring duplicates and invalid entries.
+
+        Args:
+            theme: Theme of the words
+            language: Language of the words
+            level: Difficulty level of the words
+            words: List of dictionaries with 'word' and 'definition' keys
+
+        Returns:
+            Number of new words added
+        """
+        key = pool_key(theme, language, level)
+        pool = await self._pool(key)
+        now = time.time()
+        new_rows = []
+        for item in words:
+            if not _is_valid_word(item):
+                continue
+            word = item["word"].strip()
+            word_key = word.lower()
+            if word_key in pool:
+                continue
+            pool[word_key] = {"word": word, "definition": item["definition"].strip()}
+            new_rows.append((*key, word, word_key, pool[word_key]["definition"], now))
+
+        if new_rows:
+            await asyncio.to_thread(self._insert, new_rows)
+            logger.info(f"Added {len(new_rows)} words to vocabulary pool {key} ({len(pool)} total)")
+        return len(new_rows)
+
+    async def sample(
+        self,
+        theme: str,
+        language: str,
+        level: str,
+        k: int,
+        rng: Optional[random.Random] = None,
+        max_length: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Draw a random subset of a pool in random order.
+
+        Args:
+            theme: Theme of the words
+            language: Language of the words
+            level: Difficulty level of the words
+            k: Number of words to draw (fewer if the pool is smaller)
+            rng: Random generator (defaults to the module one)
+            max_length: Only draw words of at most this many letters
+
+        Returns:
+            List of dictionaries with 'word' and 'definition' keys
+        """
+        pool = list((await self._pool(pool_key(theme, language, level))).values())
+        if max_length is not None:
+            pool = [item for item in pool if len(item["word"].strip()) <= max_length]
+        words = (rng or random).sample(pool, min(k, len(pool)))
+        return [dict(item) for item in words]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+_store: Optional[VocabularyStore] = None
+
+
+def get_vocabulary_store() -> VocabularyStore:
+    """
+    Get the process-wide vocabulary store.
+
+    Returns:
+        Shared VocabularyStore instance
+    """
+    global _store
+    if _store is None:
+        _store = VocabularyStore()
+    return _store
@@ -0,0 +1,132 @@
+"""
+Canonical compact grid of a crossword layout.
+
+The board is stored row-major: a flat string with one letter per cell
+(BLOCK for cells no word covers) and, per direction, a cell-to-word index
+with one byte per cell (0 for none, otherwise 1 + the index of the word
+covering the cell), sent base64-encoded. Word starts, directions and
+lengths follow from the index, so words are served without coordinates.
+Clue numbers are assigned in (row, col) order of the word starts, the
+numbering the frontend used to compute itself. Puzzles are served with the
+letters masked as OPEN and the solution's letters as sorted tiles; the
+solution itself stays on the server. The grid is built once per
+layout and travels with the puzzle, so clients and server-side checks read
+cells without rebuilding.
+"""
+
+from __future__ import annotations
+
+import base64
+from typing import List, Sequence
+
+from pydantic import BaseModel
+
+from app.crossword.models import CrosswordWord
+
+BLOCK = "."
+OPEN = "_"
+DOWN = "down"
+NO_WORD = 0
+# Owners are stored as 1 + word index in one byte
+MAX_WORDS = 255 - 1
+
+
+def _encode_owners(owners: Sequence[int]) -> str:
+    return base64.b64encode(bytes(owners)).decode()
+
+
+def _decode_owners(encoded: str) -> List[int]:
+    return list(base64.b64decode(encoded))
+
+
+class CrosswordGrid(BaseModel):
+    letters: str
+    across: str
+    down: str
+    numbers: List[int]
+
+    def masked(self) -> "CrosswordGrid":
+        """The same grid with every letter replaced by OPEN, as served to players."""
+        return self.model_copy(update={
+            "letters": "".join(BLOCK if letter == BLOCK else OPEN for letter in self.letters)
+        })
+
+    def tiles(self) -> str:
+        """Letters of the solution in alphabetical order, the tiles players place."""
+        return "".join(sorted(letter for letter in self.letters if letter != BLOCK))
+
+    def permuted(self, order: Sequence[int]) -> "CrosswordGrid":
+        """
+        The grid of the same board with the words reordered.
+
+        Args:
+            order: New word order; new word i is old word order[i]
+
+        Returns:
+            CrosswordGrid whose word indexes and numbers follow the new order
+        """
+        new_owner = {old + 1: new + 1 for new, old in enumerate(order)}
+        new_owner[NO_WORD] = NO_WORD
+        return CrosswordGrid(
+            letters=self.letters,
+            across=_encode_owners([new_owner[owner] for owner in _decode_owners(self.across)]),
+            down=_encode_owners([new_owner[owner] for owner in _decode_owners(self.down)]),
+            numbers=[self.numbers[old] for old in order]
+        )
+
+
+def build_grid(words: Sequence[CrosswordWord], rows: int, cols: int) -> CrosswordGrid:
+    """
+    Build the compact grid of a layout.
+
+    Cells outside the board are dropped and the first word written to a
+    cell keeps its letter, as the frontend grid did.
+
+    Args:
+        words: Placed words; grid word indexes refer to this order
+        rows: Number of board rows
+        cols: Number of board columns
+
+    Returns:
+        CrosswordGrid of the layout
+
+    Raises:
+        ValueError: If a word is not made of letters only (BLOCK would
+            corrupt the grid) or there are more words than the index holds
+    """
+    if len(words) > MAX_WORDS:
+        raise ValueError(f"A grid holds at most {MAX_WORDS} words, got {len(words)}")
+
+    size = rows * cols
+    letters: List[str] = [BLOCK] * size
+    across: List[int] = [NO_WORD] * size
+    down: List[int] = [NO_WORD] * size
+
+    for index, word in enumerate(words):
+        text = word.word.strip().upper()
+        if not text.isalpha():
+            raise ValueError(f"Word {word.id} has characters other than letters: {word.word!r}")
+        dr, dc = (1, 0) if word.direction == DOWN else (0, 1)
+        owners = down if word.direction == DOWN else across
+        for offset, letter in enumerate(text):
+            r, c = word.row + dr * offset, word.col + dc * offset
+            if not (0 <= r < rows and 0 <= c < cols):
+                continue
+            position = r * cols + c
+            if letters[position] == BLOCK:
+                letters[position] = letter
+            if owners[position] == NO_WORD:
+                owners[position] = index + 1
+
+    # Stable sort: words starting on the same cell keep their relative order
+    numbers = [0] * len(words)
+    starts = sorted(range(len(words)), key=lambda i: (words[i].row, words[i].col))
+    for number, index in enumerate(starts, start=1):
+        numbers[index] = number
+
+    return CrosswordGrid(
+        letters="".join(letters),
+        across=_encode_owners(across),
+        down=_encode_owners(down),
+        numbers=numbers
+    )
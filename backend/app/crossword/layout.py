@@ -0,0 +1,331 @@
+"""
+Deterministic crossword layout engine.
+
+Places a list of words on a board of configurable size using a
+backtracking search over an intersection index (letter -> board cells). Runs fully in-process,
+so a layout takes milliseconds instead of an o3 round-trip.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from app.crossword.models import CrosswordOutput, CrosswordWord
+
+logger = logging.getLogger(__name__)
+
+ACROSS = "across"
+DOWN = "down"
+
+Cell = Tuple[int, int]
+
+
+class LayoutMode(str, Enum):
+    """Available implementations of the coordinate stage.
+
+    FUSED lays out with the local engine too, but also asks the model for the
+    words in a single strict structured-output call sized to the board.
+    """
+    AGENT = "agent"
+    LOCAL = "local"
+    FUSED = "fused"
+
+
+@dataclass(frozen=True)
+class LayoutConfig:
+    """Configuration for the layout search."""
+    rows: int = 10
+    cols: int = 10
+    max_candidates: int = 8
+    max_nodes: int = 20000
+    max_seconds: float = 0.5
+
+
+@dataclass(frozen=True)
+class Placement:
+    """A word placed on the board."""
+    word: str
+    letters: str
+    row: int
+    col: int
+    direction: str
+
+    def cells(self) -> Iterator[Cell]:
+        """Yield board cells covered by the word, in reading order."""
+        dr, dc = _step(self.direction)
+        for i in range(len(self.letters)):
+            yield self.row + dr * i, self.col + dc * i
+
+
+def _step(direction: str) -> Cell:
+    return (0, 1) if direction == ACROSS else (1, 0)
+
+
+def normalize(word: str) -> str:
+    """Letters of a word as they are placed on the board."""
+    return word.strip().upper()
+
+
+class Board:
+    """
+    Mutable board state backed by bitsets.
+
+    Every row and column keeps an int bitmask of its occupied cells, plus a
+    mask of cells covered by a word running along it, so a placement is
+    checked with a handful of bit operations; only crossing cells are
+    compared letter by letter. An intersection index (letter -> cells)
+    provides the candidate positions.
+    """
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.letters: List[str] = [""] * (rows * cols)
+        self.row_bits: List[int] = [0] * rows
+        self.col_bits: List[int] = [0] * cols
+        self.across_bits: List[int] = [0] * rows
+        self.down_bits: List[int] = [0] * cols
+        self.index: Dict[str, Set[Cell]] = defaultdict(set)
+        self.placements: List[Placement] = []
+
+    def crossings(self, letters: str, row: int, col: int, direction: str) -> Optional[int]:
+        """
+        Check whether a word fits at the given position.
+
+        Returns:
+            Number of crossings with already placed words, or None if the
+            placement is illegal (out of bounds, letter conflict or an
+            unintended adjacent run).
+        """
+        length = len(letters)
+        if direction == ACROSS:
+            if row < 0 or row >= self.rows or col < 0 or col + length > self.cols:
+                return None
+            line, same_direction, start = self.row_bits[row], self.across_bits[row], col
+            before = self.row_bits[row - 1] if row > 0 else 0
+            after = self.row_bits[row + 1] if row + 1 < self.rows else 0
+        else:
+            if col < 0 or col >= self.cols or row < 0 or row + length > self.rows:
+                return None
+            line, same_direction, start = self.col_bits[col], self.down_bits[col], row
+            before = self.col_bits[col - 1] if col > 0 else 0
+            after = self.col_bits[col + 1] if col + 1 < self.cols else 0
+
+        span = ((1 << length) - 1) << start
+        # Cells right before and after the word must stay empty
+        caps = (1 << (start - 1) if start > 0 else 0) | (1 << (start + length))
+        if line & caps:
+            return None
+
+        occupied = line & span
+        new = span & ~occupied
+        # No running along an existing word, and new cells must not touch neighbours sideways
+        if occupied & same_direction or not new or (before | after) & new:
+            return None
+
+        crossings = 0
+        stride = 1 if direction == ACROSS else self.cols
+        base = row * self.cols + col
+        while occupied:
+            lowest = occupied & -occupied
+            offset = lowest.bit_length() - 1 - start
+            if self.letters[base + offset * stride] != letters[offset]:
+                return None
+            crossings += 1
+            occupied ^= lowest
+        return crossings
+
+    def candidates(self, letters: str) -> List[Tuple[int, Placement]]:
+        """Find legal placements that cross at least one placed word."""
+        seen: Set[Tuple[int, int, str]] = set()
+        found: List[Tuple[int, Placement]] = []
+        for i, letter in enumerate(letters):
+            for r, c in self.index.get(letter, ()):
+                # A crossing word runs perpendicular to the word already covering the cell
+                key = (r - i, c, DOWN) if self.across_bits[r] >> c & 1 else (r, c - i, ACROSS)
+                if key in seen:
+                    continue
+                seen.add(key)
+                crossings = self.crossings(letters, *key)
+                if crossings:
+                    found.append((crossings, Placement("", letters, *key)))
+        return found
+
+    def place(self, placement: Placement) -> List[Cell]:
+        """Place a word and return the cells it newly occupied."""
+        added: List[Cell] = []
+        for (r, c), letter in zip(placement.cells(), placement.letters):
+            position = r * self.cols + c
+            if not self.letters[position]:
+                self.letters[position] = letter
+                self.row_bits[r] |= 1 << c
+                self.col_bits[c] |= 1 << r
+                self.index[letter].add((r, c))
+                added.append((r, c))
+        span = (1 << len(placement.letters)) - 1
+        if placement.direction == ACROSS:
+            self.across_bits[placement.row] |= span << placement.col
+        else:
+            self.down_bits[placement.col] |= span << placement.row
+        self.placements.append(placement)
+        return added
+
+    def remove(self, placement: Placement, added: List[Cell]) -> None:
+        """Undo a previous `place` call."""
+        self.placements.pop()
+        span = (1 << len(placement.letters)) - 1
+        if placement.direction == ACROSS:
+            self.across_bits[placement.row] &= ~(span << placement.col)
+        else:
+            self.down_bits[placement.col] &= ~(span << placement.row)
+        for r, c in added:
+            position = r * self.cols + c
+            self.index[self.letters[position]].discard((r, c))
+            self.letters[position] = ""
+            self.row_bits[r] &= ~(1 << c)
+            self.col_bits[c] &= ~(1 << r)
+
+
+class CrosswordLayoutEngine:
+    """
+    Backtracking crossword layout engine.
+
+    Words are tried longest first. Every word is either placed at one of its
+    best-scoring intersections or skipped; the search keeps the layout with
+    the most placed words (ties broken by number of crossings) and stops
+    once every word is placed or the node or time budget is exhausted.
+    """
+
+    def __init__(self, config: Optional[LayoutConfig] = None):
+        self._config = config or LayoutConfig()
+
+    def _prepare(self, words: List[str]) -> List[Tuple[str, str]]:
+        max_length = max(self._config.rows, self._config.cols)
+        prepared: List[Tuple[str, str]] = []
+        seen: Set[str] = set()
+        for word in words:
+            letters = normalize(word)
+            if len(letters) < 2 or len(letters) > max_length or not letters.isalpha():
+                logger.debug(f"Skipping word that cannot be placed: {word!r}")
+                continue
+            if letters in seen:
+                continue
+            seen.add(letters)
+            prepared.append((word.strip(), letters))
+        prepared.sort(key=lambda item: len(item[1]), reverse=True)
+        return prepared
+
+    def _first_placements(self, letters: str) -> List[Placement]:
+        rows, cols = self._config.rows, self._config.cols
+        placements = []
+        if len(letters) <= cols:
+            placements.append(Placement("", letters, rows // 2, (cols - len(letters)) // 2, ACROSS))
+        if len(letters) <= rows:
+            placements.append(Placement("", letters, (rows - len(letters)) // 2, cols // 2, DOWN))
+        return placements
+
+    def layout(self, words: List[str]) -> List[Placement]:
+        """
+        Lay out as many words as possible on the board.
+
+        Args:
+            words: Words to place (case-insensitive, duplicates ignored)
+
+        Returns:
+            Placements of the best layout found
+        """
+        prepared = self._prepare(words)
+        if not prepared:
+            return []
+
+        board = Board(self._config.rows, self._config.cols)
+        best: List[Placement] = []
+        best_score = (-1, -1)
+        nodes = 0
+        total = len(prepared)
+        deadline = time.perf_counter() + self._config.max_seconds
+
+        def search(index: int, crossings: int) -> bool:
+            nonlocal best, best_score, nodes
+            nodes += 1
+            placed = len(board.placements)
+            score = (placed, crossings)
+            if score > best_score:
+                best, best_score = list(board.placements), score
+            if placed == total:
+                return True
+            if index == total or nodes >= self._config.max_nodes:
+                return False
+            # Checking the clock on every node is measurable; every 256th is enough
+            if nodes & 0xFF == 0 and time.perf_counter() > deadline:
+                nodes = self._config.max_nodes
+                return False
+            # Not enough words left to reach the best layout; a tie may still win on crossings
+            if placed + (total - index) < best_score[0]:
+                return False
+
+            word, letters = prepared[index]
+            if not board.placements:
+                options = [(0, p) for p in self._first_placements(letters)]
+            else:
+                options = board.candidates(letters)
+                options.sort(key=lambda item: (-item[0], item[1].row, item[1].col, item[1].direction))
+                options = options[: self._config.max_candidates]
+
+            for option_crossings, option in options:
+                placement = Placement(word, letters, option.row, option.col, option.direction)
+                added = board.place(placement)
+                done = search(index + 1, crossings + option_crossings)
+                board.remove(placement, added)
+                if done:
+                    return True
+            return search(index + 1, crossings)
+
+        search(0, 0)
+        logger.debug(f"Layout search visited {nodes} nodes, placed {len(best)}/{total} words")
+        return best
+
+
+def placements_to_output(placements: List[Placement]) -> CrosswordOutput:
+    """Convert placements into agent-compatible output, numbered in reading order."""
+    ordered = sorted(placements, key=lambda p: (p.row, p.col, p.direction))
+    return CrosswordOutput(
+        words=[
+            CrosswordWord(
+                id=str(number),
+                word=placement.word,
+                row=placement.row,
+                col=placement.col,
+                direction=placement.direction
+            )
+            for number, placement in enumerate(ordered, start=1)
+        ]
+    )
+
+
+def generate_local_layout(
+    words: list[dict],
+    config: Optional[LayoutConfig] = None
+) -> CrosswordOutput:
+    """
+    Generate crossword coordinates without any model calls.
+
+    Args:
+        words (list[dict]): A list of dictionaries with 'word' and 'definition' keys.
+        config (LayoutConfig): Optional layout configuration.
+
+    Returns:
+        CrosswordOutput: Crossword coordinates in the same format as the agent output.
+    """
+    start_time = time.perf_counter()
+    engine = CrosswordLayoutEngine(config)
+    placements = engine.layout([item["word"] for item in words if item.get("word")])
+    output = placements_to_output(placements)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    logger.info(f"Local layout placed {len(output.words)}/{len(words)} words in {elapsed_ms:.1f}ms")
+    return output
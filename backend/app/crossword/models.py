@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+
+
+class CrosswordWord(BaseModel):
+    id: str = Field(description="Number identifier for the word")
+    word: str = Field(description="The word for the crossword")
+    row: int = Field(description="Starting row position (0-based)")
+    col: int = Field(description="Starting column position (0-based)")
+    direction: str = Field(description="Direction: 'across' or 'down'")
+
+
+class CrosswordOutput(BaseModel):
+    words: list[CrosswordWord] = Field(
+        description="List of words with their positions and coordinates"
+    )
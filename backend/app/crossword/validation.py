@@ -0,0 +1,233 @@
+"""
+Deterministic structural validation of crossword layouts.
+
+Checks bounds, letter conflicts at crossings, unintended adjacent runs and
+connectivity on a dense grid array, and reports the exact cells and words
+involved in every problem.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.crossword.models import CrosswordWord
+
+ACROSS = "across"
+DOWN = "down"
+
+WordInput = Union[CrosswordWord, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class CellConflict:
+    """A structural problem located on specific board cells."""
+    reason: str
+    cells: Tuple[Tuple[int, int], ...]
+    word_ids: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "reason": self.reason,
+            "cells": [list(cell) for cell in self.cells],
+            "word_ids": list(self.word_ids)
+        }
+
+
+@dataclass(frozen=True)
+class CrosswordValidationResult:
+    """Result of structural crossword validation."""
+    is_valid_crossword: bool
+    reasoning: str
+    conflicts: List[CellConflict] = field(default_factory=list)
+
+    @property
+    def conflicting_word_ids(self) -> List[str]:
+        """Ids of all words involved in at least one conflict, in first-seen order."""
+        ids: Dict[str, None] = {}
+        for conflict in self.conflicts:
+            for word_id in conflict.word_ids:
+                ids.setdefault(word_id, None)
+        return list(ids)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "is_valid_crossword": self.is_valid_crossword,
+            "reasoning": self.reasoning,
+            "conflicts": [conflict.to_dict() for conflict in self.conflicts],
+            "conflicting_word_ids": self.conflicting_word_ids
+        }
+
+
+def _as_word(item: WordInput) -> CrosswordWord:
+    if isinstance(item, CrosswordWord):
+        return item
+    return CrosswordWord.model_validate(item)
+
+
+def _word_cells(word: CrosswordWord) -> List[Tuple[int, int]]:
+    dr, dc = (0, 1) if word.direction == ACROSS else (1, 0)
+    return [(word.row + dr * i, word.col + dc * i) for i in range(len(word.word.strip()))]
+
+
+def validate_layout(
+    words: Sequence[WordInput],
+    rows: int = 10,
+    cols: int = 10
+) -> CrosswordValidationResult:
+    """
+    Validate the structure of a crossword layout.
+
+    Args:
+        words: Placed words (CrosswordWord instances or equivalent dicts)
+        rows: Number of board rows
+        cols: Number of board columns
+
+    Returns:
+        CrosswordValidationResult with every conflict and the cells involved
+    """
+    placed = [_as_word(item) for item in words]
+    conflicts: List[CellConflict] = []
+
+    if not placed:
+        return CrosswordValidationResult(False, "Crossword contains no words")
+
+    # Dense grid: letter per cell plus the index of the across/down word covering it
+    size = rows * cols
+    letters: List[Optional[str]] = [None] * size
+    across_owner: List[int] = [-1] * size
+    down_owner: List[int] = [-1] * size
+    on_board: List[bool] = [False] * len(placed)
+
+    for index, word in enumerate(placed):
+        text = word.word.strip().upper()
+        if word.direction not in (ACROSS, DOWN):
+            conflicts.append(CellConflict("invalid_direction", (), (word.id,)))
+            continue
+        if len(text) < 2 or not text.isalpha():
+            conflicts.append(CellConflict("invalid_word", (), (word.id,)))
+            continue
+
+        cells = _word_cells(word)
+        outside = tuple(cell for cell in cells if not (0 <= cell[0] < rows and 0 <= cell[1] < cols))
+        if outside:
+            conflicts.append(CellConflict("out_of_bounds", outside, (word.id,)))
+            continue
+
+        on_board[index] = True
+        owners = across_owner if word.direction == ACROSS else down_owner
+        for (r, c), letter in zip(cells, text):
+            position = r * cols + c
+            if owners[position] != -1:
+                other = placed[owners[position]]
+                conflicts.append(CellConflict("overlap", ((r, c),), (other.id, word.id)))
+            else:
+                owners[position] = index
+            if letters[position] is None:
+                letters[position] = letter
+            elif letters[position] != letter:
+                crossing = across_owner[position] if word.direction == DOWN else down_owner[position]
+                ids = (placed[crossing].id, word.id) if crossing != -1 else (word.id,)
+                conflicts.append(CellConflict("letter_conflict", ((r, c),), ids))
+
+    conflicts.extend(_adjacent_runs(placed, letters, across_owner, down_owner, rows, cols, ACROSS))
+    conflicts.extend(_adjacent_runs(placed, letters, down_owner, across_owner, rows, cols, DOWN))
+    conflicts.extend(_disconnected(placed, on_board, across_owner, down_owner))
+
+    if conflicts:
+        reasons = sorted({conflict.reason for conflict in conflicts})
+        return CrosswordValidationResult(
+            False,
+            f"Found {len(conflicts)} conflict(s): {', '.join(reasons)}",
+            conflicts
+        )
+    return CrosswordValidationResult(True, f"All {len(placed)} words are placed correctly")
+
+
+def _adjacent_runs(
+    placed: List[CrosswordWord],
+    letters: List[Optional[str]],
+    owners: List[int],
+    crossing_owners: List[int],
+    rows: int,
+    cols: int,
+    direction: str
+) -> List[CellConflict]:
+    """Find runs of two or more filled cells that do not match exactly one word."""
+    conflicts: List[CellConflict] = []
+    lines, length = (rows, cols) if direction == ACROSS else (cols, rows)
+
+    for line in range(lines):
+        i = 0
+        while i < length:
+            if letters[_position(direction, line, i, cols)] is None:
+                i += 1
+                continue
+            start = i
+            while i < length and letters[_position(direction, line, i, cols)] is not None:
+                i += 1
+            if i - start < 2:
+                continue
+
+            run = [_position(direction, line, j, cols) for j in range(start, i)]
+            owner_ids = {owners[position] for position in run}
+            if len(owner_ids) == 1 and -1 not in owner_ids:
+                word = placed[owners[run[0]]]
+                if len(word.word.strip()) == len(run):
+                    continue
+
+            # Cells without a word in this direction belong to perpendicular words that touch
+            involved = {
+                owners[position] if owners[position] != -1 else crossing_owners[position]
+                for position in run
+            }
+            conflicts.append(CellConflict(
+                "adjacent_run",
+                tuple(divmod(position, cols) for position in run),
+                tuple(placed[index].id for index in sorted(involved))
+            ))
+    return conflicts
+
+
+def _position(direction: str, line: int, offset: int, cols: int) -> int:
+    return line * cols + offset if direction == ACROSS else offset * cols + line
+
+
+def _disconnected(
+    placed: List[CrosswordWord],
+    on_board: List[bool],
+    across_owner: List[int],
+    down_owner: List[int]
+) -> List[CellConflict]:
+    """Report words outside the largest connected group of crossing words."""
+    parent = list(range(len(placed)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in zip(across_owner, down_owner):
+        if a != -1 and b != -1:
+            parent[find(a)] = find(b)
+
+    groups: Dict[int, List[int]] = {}
+    for index, is_on_board in enumerate(on_board):
+        if is_on_board:
+            groups.setdefault(find(index), []).append(index)
+    if len(groups) <= 1:
+        return []
+
+    main = max(groups.values(), key=len)
+    conflicts = []
+    for group in groups.values():
+        if group is main:
+            continue
+        cells = tuple(cell for index in group for cell in _word_cells(placed[index]))
+        conflicts.append(CellConflict(
+            "disconnected",
+            cells,
+            tuple(placed[index].id for index in group)
+        ))
+    return conflicts
@@ -1,9 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.generate_crossword import router as generate_crossword_router
+from app.api.crossword_batch import router as crossword_batch_router, shutdown_layout_executor
+from app.api.crossword_jobs import job_manager, router as crossword_jobs_router
+from app.api.crosswords import router as crosswords_router
+from app.api.game_sessions import router as game_sessions_router
+from app.api.generate_crossword import crossword_pool, router as generate_crossword_router
+from app.api.images import router as images_router
+from app.api.metrics import router as metrics_router
+from app.api.stats import router as stats_router
+from app.core.config import POOL_ENABLED
+from app.core.player_stats import get_player_stats_store
+from app.core.tti import get_image_scheduler
 import uvicorn
 
-app = FastAPI(title="Crossword API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_manager.start()
+    get_player_stats_store().start()
+    if POOL_ENABLED:
+        crossword_pool.start()
+    yield
+    await crossword_pool.stop()
+    await job_manager.stop()
+    await get_player_stats_store().stop()
+    await get_image_scheduler().close()
+    shutdown_layout_executor()
+
+
+app = FastAPI(title="Crossword API", version="1.0.0", lifespan=lifespan)
 
 # CORS настройки
 app.add_middleware(
@@ -16,6 +42,13 @@ app.add_middleware(
 
 # Routers
 app.include_router(generate_crossword_router)
+app.include_router(crossword_jobs_router)
+app.include_router(crosswords_router)
+app.include_router(crossword_batch_router)
+app.include_router(game_sessions_router)
+app.include_router(stats_router)
+app.include_router(images_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     uvicorn.run(
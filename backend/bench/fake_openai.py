@@ -0,0 +1,247 @@
+"""
+Local stand-in for the OpenAI API used by the benchmarks.
+
+Implements the chat completions (with tool calls and structured outputs)
+and image generation endpoints the pipeline uses, with configurable latency
+and failure distributions, so the pipeline can be measured without API
+spend or network jitter. Agent mode runs on chat completions too: the
+orchestrator generates coordinates, validates them and answers with the
+layout, which the stand-in computes with the local layout engine.
+
+    python -m bench.fake_openai --port 8100 --chat-latency-ms 1500 --image-latency-ms 6000
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import asyncio
+import base64
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from app.crossword.layout import LayoutConfig, generate_local_layout
+
+BOARD_SIZE_PATTERN = re.compile(r"board size:\s*(\d+)\s*[x×]\s*(\d+)", re.IGNORECASE)
+
+# 1x1 transparent PNG
+PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+WORDS = [
+    ("elephant", "Large grey animal with a trunk"),
+    ("giraffe", "Tallest animal with a long neck"),
+    ("tiger", "Striped big cat"),
+    ("lion", "King of the jungle"),
+    ("zebra", "Horse-like animal with black and white stripes"),
+    ("monkey", "Playful primate that climbs trees"),
+    ("panda", "Black and white bear that eats bamboo"),
+    ("koala", "Australian marsupial that sleeps in eucalyptus trees"),
+    ("otter", "Aquatic mammal that floats on its back"),
+    ("camel", "Desert animal with humps"),
+    ("horse", "Animal people ride"),
+    ("snake", "Legless reptile"),
+    ("rabbit", "Animal with long ears that hops"),
+    ("parrot", "Colourful talking bird"),
+    ("dolphin", "Smart marine mammal"),
+    ("penguin", "Flightless bird of the Antarctic"),
+    ("turtle", "Reptile with a shell"),
+    ("beaver", "Rodent that builds dams"),
+    ("eagle", "Large bird of prey"),
+    ("shark", "Predatory fish with sharp teeth"),
+]
+
+
+@dataclass
+class FakeConfig:
+    """Latency and failure distributions of the fake server."""
+    chat_latency_ms: float = 1500.0
+    image_latency_ms: float = 6000.0
+    latency_sigma: float = 0.3
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    words_per_response: int = 12
+
+
+def _latency(median_ms: float, sigma: float) -> float:
+    """Log-normal latency in seconds with the given median."""
+    return random.lognormvariate(0.0, sigma) * median_ms / 1000.0
+
+
+def _error(config: FakeConfig) -> Response | None:
+    roll = random.random()
+    if roll < config.rate_limit_rate:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after-ms": "500", "x-ratelimit-remaining-requests": "0"},
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+        )
+    if roll < config.rate_limit_rate + config.failure_rate:
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "Internal server error", "type": "server_error", "code": None}}
+        )
+    return None
+
+
+def _user_content(messages: List[Dict[str, Any]]) -> str:
+    content = next((m.get("content") for m in messages if m.get("role") == "user"), "")
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+def _layout(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Coordinates of the words listed in the prompt ('Board size: RxC' and '- word' lines)."""
+    content = _user_content(messages)
+    size = BOARD_SIZE_PATTERN.search(content)
+    rows, cols = (int(size.group(1)), int(size.group(2))) if size else (10, 10)
+    words = [{"word": line.strip()[2:].strip()} for line in content.splitlines() if line.strip().startswith("- ")]
+    output = generate_local_layout(words, LayoutConfig(rows=rows, cols=cols))
+    return {"words": [word.model_dump() for word in output.words]}
+
+
+def _tool_output(content: Any) -> Dict[str, Any]:
+    try:
+        return json.loads(content)
+    except (TypeError, ValueError):
+        return ast.literal_eval(content)
+
+
+def _orchestrator_message(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Next orchestrator step: generate coordinates, validate them, then answer with the layout."""
+    names = {
+        call["id"]: call["function"]["name"]
+        for message in messages if message.get("role") == "assistant"
+        for call in message.get("tool_calls") or []
+    }
+    results = [(names.get(m.get("tool_call_id")), m.get("content")) for m in messages if m.get("role") == "tool"]
+    if not results:
+        return _tool_call_message("generate_coordinates", {"input": _user_content(messages)})
+    if results[-1][0] == "generate_coordinates":
+        return _tool_call_message("validate_crossword", {"input": json.dumps(_tool_output(results[-1][1]))})
+    layout = next((_tool_output(c) for n, c in reversed(results) if n == "generate_coordinates"), {})
+    return {"role": "assistant", "content": json.dumps({"words": layout.get("words", [])})}
+
+
+def _tool_call_message(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)}
+        }]
+    }
+
+
+def _tool_arguments(name: str, config: FakeConfig) -> Dict[str, Any]:
+    if name == "generate_words_list":
+        sample = random.sample(WORDS, min(config.words_per_response, len(WORDS)))
+        return {"words": [{"word": word, "definition": definition} for word, definition in sample]}
+    if name == "validate_crossword":
+        return {"is_valid_crossword": True, "reasoning": "Fake validation"}
+    return {}
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await asyncio.sleep(_latency(config.chat_latency_ms, config.latency_sigma))
+        error = _error(config)
+        if error is not None:
+            return error
+
+        messages = body.get("messages") or []
+        tools = body.get("tools") or []
+        tool_names = {tool["function"]["name"] for tool in tools}
+        response_format = body.get("response_format") or {}
+        if len(tool_names) > 1:
+            # The agent-mode orchestrator
+            message = _orchestrator_message(messages)
+        elif response_format.get("type") == "json_schema":
+            name = "generate_words_list" if response_format["json_schema"]["name"] == "words_list" else ""
+            message = {"role": "assistant", "content": json.dumps(_tool_arguments(name, config))}
+        elif tools:
+            name = tools[0]["function"]["name"]
+            arguments = _layout(messages) if name == "generate_coordinates" else _tool_arguments(name, config)
+            message = _tool_call_message(name, arguments)
+        else:
+            message = {"role": "assistant", "content": "ok"}
+
+        return JSONResponse(
+            headers={
+                "x-ratelimit-limit-requests": "10000",
+                "x-ratelimit-remaining-requests": "9999",
+                "x-ratelimit-reset-requests": "6ms",
+            },
+            content={
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if message.get("tool_calls") else "stop"}],
+                "usage": {"prompt_tokens": 250, "completion_tokens": 400, "total_tokens": 650},
+            }
+        )
+
+    @app.post("/v1/images/generations")
+    async def images_generations(request: Request):
+        await request.json()
+        await asyncio.sleep(_latency(config.image_latency_ms, config.latency_sigma))
+        error = _error(config)
+        if error is not None:
+            return error
+
+        base_url = str(request.base_url).rstrip("/")
+        return {
+            "created": int(time.time()),
+            "data": [{"url": f"{base_url}/files/{uuid.uuid4().hex}.png"}],
+        }
+
+    @app.get("/files/{name}")
+    async def files(name: str):
+        return Response(content=PNG_BYTES, media_type="image/png")
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in OpenAI server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--chat-latency-ms", type=float, default=FakeConfig.chat_latency_ms)
+    parser.add_argument("--image-latency-ms", type=float, default=FakeConfig.image_latency_ms)
+    parser.add_argument("--latency-sigma", type=float, default=FakeConfig.latency_sigma)
+    parser.add_argument("--failure-rate", type=float, default=FakeConfig.failure_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=FakeConfig.rate_limit_rate)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    config = FakeConfig(
+        chat_latency_ms=args.chat_latency_ms,
+        image_latency_ms=args.image_latency_ms,
+        latency_sigma=args.latency_sigma,
+        failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
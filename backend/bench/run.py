@@ -0,0 +1,251 @@
+"""
+Offline benchmark of the crossword API.
+
+Starts the local stand-in OpenAI server (bench.fake_openai), points the app
+at it, serves the app in-process and drives /api/generate_crossword and/or
+/api/crosswords/random at a chosen concurrency. Reports throughput, request
+and per-stage latency percentiles, event-loop lag and thread counts.
+
+    python -m bench.run --endpoint both --requests 60 --concurrency 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import httpx
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+THEMES = ["animals", "nature", "science", "space", "food"]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 4),
+        "p90": round(percentile(values, 90), 4),
+        "p99": round(percentile(values, 99), 4),
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+def start_fake_server(args: argparse.Namespace) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "bench.fake_openai",
+        "--port", str(args.fake_port),
+        "--chat-latency-ms", str(args.chat_latency_ms),
+        "--image-latency-ms", str(args.image_latency_ms),
+        "--latency-sigma", str(args.latency_sigma),
+        "--failure-rate", str(args.failure_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+    ]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    process = subprocess.Popen(command)
+
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{args.fake_port}/files/ready.png", timeout=1.0)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fake OpenAI server did not start")
+
+
+def configure_environment(args: argparse.Namespace, work_dir: str) -> None:
+    """Point the app at the fake server; must run before the app is imported."""
+    os.environ["OPENAI_API_KEY"] = "bench"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.fake_port}/v1"
+    os.environ["PUBLIC_BASE_URL"] = f"http://127.0.0.1:{args.app_port}"
+    os.environ["POOL_ENABLED"] = "true" if args.pool else "false"
+    os.environ["LAYOUT_MODE"] = args.layout_mode
+    # Agent runs would export their traces to the real OpenAI API
+    os.environ["OPENAI_AGENTS_DISABLE_TRACING"] = "true"
+    os.environ["VOCABULARY_ENABLED"] = "false" if args.no_vocabulary else "true"
+    os.environ["IMAGE_CACHE_ENABLED"] = "false" if args.no_image_cache else "true"
+    os.environ["IMAGE_CACHE_DIR"] = os.path.join(work_dir, "images")
+    os.environ["VOCABULARY_DB_PATH"] = os.path.join(work_dir, "vocabulary.sqlite3")
+    os.environ["CROSSWORD_DB_PATH"] = os.path.join(work_dir, "crosswords.sqlite3")
+    os.environ["STATS_DB_PATH"] = os.path.join(work_dir, "stats.sqlite3")
+
+
+class Probe:
+    """Samples event-loop lag and thread counts while the benchmark runs."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lag: List[float] = []
+        self.threads: List[int] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lag.append(max(0.0, time.perf_counter() - start - self.interval))
+            self.threads.append(threading.active_count())
+
+
+async def drive(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    from app.core.stages import add_stage_listener
+
+    stages: Dict[str, List[float]] = defaultdict(list)
+    add_stage_listener(lambda stage, seconds: stages[stage].append(seconds))
+
+    endpoints = ["generate", "random"] if args.endpoint == "both" else [args.endpoint]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    probe = Probe()
+
+    async def one(client: httpx.AsyncClient, index: int) -> None:
+        endpoint = endpoints[index % len(endpoints)]
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if endpoint == "generate":
+                    response = await client.post("/api/generate_crossword", json={
+                        "theme": THEMES[index % len(THEMES)] if args.vary_theme else THEMES[0],
+                        "language": "en",
+                        "level": DIFFICULTIES[index % len(DIFFICULTIES)],
+                        "board_size": {"rows": args.board_size, "cols": args.board_size},
+                    })
+                else:
+                    response = await client.get(
+                        "/api/crosswords/random",
+                        params={
+                            "difficulty": DIFFICULTIES[index % len(DIFFICULTIES)],
+                            "rows": args.board_size,
+                            "cols": args.board_size,
+                        }
+                    )
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies[endpoint].append(time.perf_counter() - start)
+
+    probe.start()
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        await asyncio.gather(*(one(client, i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    await probe.stop()
+
+    return {
+        "config": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output",)
+        },
+        "wall_seconds": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 3) if elapsed else 0.0,
+        "statuses": dict(statuses),
+        "latency_seconds": {endpoint: summarize(values) for endpoint, values in latencies.items()},
+        "stage_seconds": {stage: summarize(values) for stage, values in stages.items()},
+        "event_loop_lag_seconds": summarize(probe.lag),
+        "threads": {"max": max(probe.threads, default=0), "final": threading.active_count()},
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.app_port, log_level="warning"))
+    server_task = asyncio.get_running_loop().create_task(server.serve())
+    while not server.started:
+        if server_task.done():
+            raise RuntimeError("App server failed to start")
+        await asyncio.sleep(0.05)
+
+    try:
+        if args.pool:
+            # Let the pool fill before measuring
+            await asyncio.sleep(args.pool_warmup_seconds)
+        return await drive(args, f"http://127.0.0.1:{args.app_port}")
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"\nRequests: {report['config']['requests']} at concurrency {report['config']['concurrency']}")
+    print(f"Wall time: {report['wall_seconds']}s, throughput: {report['throughput_rps']} req/s")
+    print(f"Statuses: {report['statuses']}")
+    print(f"{'':<24}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    rows = [(f"request {name}", stats) for name, stats in report["latency_seconds"].items()]
+    rows += [(f"stage {name}", stats) for name, stats in report["stage_seconds"].items()]
+    rows.append(("event loop lag", report["event_loop_lag_seconds"]))
+    for name, stats in rows:
+        print(f"{name:<24}{stats['count']:>8}{stats['p50']:>10.3f}{stats['p90']:>10.3f}{stats['p99']:>10.3f}{stats['max']:>10.3f}")
+    print(f"Threads: max {report['threads']['max']}, final {report['threads']['final']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline crossword API benchmark")
+    parser.add_argument("--endpoint", choices=["generate", "random", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--vary-theme", action="store_true", help="Use a different theme per request")
+    parser.add_argument("--board-size", type=int, default=10, help="Side of the square board")
+    parser.add_argument("--layout-mode", choices=["local", "fused", "agent"], default="local")
+    parser.add_argument("--pool", action="store_true", help="Enable the pre-generated crossword pool")
+    parser.add_argument("--pool-warmup-seconds", type=float, default=30.0)
+    parser.add_argument("--no-vocabulary", action="store_true", help="Always call the model for words")
+    parser.add_argument("--no-image-cache", action="store_true", help="Disable the local image cache")
+    parser.add_argument("--chat-latency-ms", type=float, default=1500.0)
+    parser.add_argument("--image-latency-ms", type=float, default=6000.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fake-port", type=int, default=8100)
+    parser.add_argument("--app-port", type=int, default=8200)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    fake_server = start_fake_server(args)
+    try:
+        with tempfile.TemporaryDirectory(prefix="crossword-bench-") as work_dir:
+            configure_environment(args, work_dir)
+            report = asyncio.run(run(args))
+    finally:
+        fake_server.terminate()
+        fake_server.wait()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
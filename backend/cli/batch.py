@@ -0,0 +1,71 @@
+"""
+Generate a batch of crosswords into an NDJSON file.
+
+Takes the same puzzle specs as POST /api/crosswords/batch:
+
+    {"puzzles": [{"theme": "animals", "level": "easy", "count": 50},
+                 {"theme": "space", "level": "hard", "board_size": {"rows": 15, "cols": 15}, "count": 20}]}
+
+and writes one JSON record per puzzle as soon as it is finished:
+
+    python -m cli.batch specs.json --output crosswords.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+
+from pydantic import ValidationError
+from pydantic_core import to_json
+
+
+async def run(args: argparse.Namespace) -> int:
+    from app.api.crossword_batch import generate_crossword_batch, parse_puzzle_specs, shutdown_layout_executor
+    from app.api.schemas import BatchRequest
+    from app.core.tti import get_image_scheduler
+
+    with open(args.specs) as file:
+        data = json.load(file)
+    try:
+        specs = parse_puzzle_specs(BatchRequest.model_validate(data))
+    except ValidationError as e:
+        print(f"Invalid specs: {e}", file=sys.stderr)
+        return 2
+
+    failed = 0
+    rng = random.Random(args.seed) if args.seed is not None else None
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        async for record in generate_crossword_batch(specs, rng=rng):
+            output.write(to_json(record) + b"\n")
+            output.flush()
+            if "error" in record:
+                failed += 1
+            if "summary" in record:
+                print(f"Batch finished: {record['summary']}", file=sys.stderr)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        shutdown_layout_executor()
+        await get_image_scheduler().close()
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a batch of crosswords into an NDJSON file")
+    parser.add_argument("specs", help="JSON file with a 'puzzles' list")
+    parser.add_argument("--output", "-o", help="NDJSON file to write (defaults to stdout)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for splitting words across puzzles")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
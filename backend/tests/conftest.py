@@ -0,0 +1,37 @@
+import os
+import random
+import string
+import tempfile
+
+import pytest
+
+# The OpenAI client is created at import time; tests never call it
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+# Stores and caches opened by the app singletons write here, not into the working tree
+_CACHE_DIR = tempfile.mkdtemp(prefix="crossword-tests-")
+os.environ.setdefault("IMAGE_CACHE_DIR", os.path.join(_CACHE_DIR, "images"))
+os.environ.setdefault("VOCABULARY_DB_PATH", os.path.join(_CACHE_DIR, "vocabulary.sqlite3"))
+os.environ.setdefault("CROSSWORD_DB_PATH", os.path.join(_CACHE_DIR, "crosswords.sqlite3"))
+os.environ.setdefault("STATS_DB_PATH", os.path.join(_CACHE_DIR, "stats.sqlite3"))
+
+WORDS = [
+    "elephant", "rabbit", "otter", "horse", "snake", "zebra", "turtle", "camel",
+    "parrot", "monkey", "beaver", "penguin", "tiger", "eagle", "panda", "shark",
+    "dolphin", "giraffe", "lion", "wolf", "bear", "goat", "sheep", "mouse",
+]
+
+
+def random_words(rng: random.Random, count: int, max_length: int) -> list[dict]:
+    """Themed words that fit the board, topped up with random ones."""
+    words = [word for word in WORDS if len(word) <= max_length]
+    rng.shuffle(words)
+    while len(words) < count:
+        length = rng.randint(3, max(3, min(max_length, 8)))
+        words.append("".join(rng.choice("AEIOURSTLNCDM") for _ in range(length)))
+    return [{"word": word, "definition": f"Definition of {word}"} for word in words[:count]]
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    return random.Random(1234)
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+from agents import set_tracing_disabled
+from agents.exceptions import UserError
+from agents.items import ModelResponse
+from agents.models.interface import Model
+from agents.usage import Usage
+from openai.types.responses import ResponseFunctionToolCall
+
+import app.agent.agent as agent_module
+from app.crossword.layout import generate_local_layout
+from app.crossword.models import CrosswordOutput, CrosswordWord
+from app.crossword.repair import RepairResult
+from app.crossword.validation import validate_layout
+
+set_tracing_disabled(True)
+
+WORDS = [{"word": word, "definition": ""} for word in ("elephant", "horse", "otter", "snake", "rabbit", "zebra")]
+
+
+class StubModel(Model):
+    """Calls validate_crossword with a fixed layout on every turn, reporting `tokens` per turn."""
+
+    def __init__(self, layout: list[dict], tokens: int):
+        self.layout = layout
+        self.tokens = tokens
+        self.calls = 0
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        self.calls += 1
+        arguments = json.dumps({"input": json.dumps({"words": self.layout, "board_size": {"rows": 10, "cols": 10}})})
+        return ModelResponse(
+            output=[ResponseFunctionToolCall(
+                id=f"fc_{self.calls}",
+                call_id=f"call_{self.calls}",
+                name="validate_crossword",
+                arguments=arguments,
+                type="function_call",
+                status="completed"
+            )],
+            usage=Usage(requests=1, input_tokens=self.tokens, output_tokens=0, total_tokens=self.tokens),
+            response_id=None
+        )
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def stub_orchestrator(monkeypatch):
+    def install(model: StubModel, max_tokens: int) -> None:
+        monkeypatch.setattr(agent_module, "orchestrator", agent_module.orchestrator.clone(model=model))
+        monkeypatch.setattr(agent_module, "AGENT_MAX_TOKENS", max_tokens)
+        monkeypatch.setattr(agent_module, "AGENT_MAX_TURNS", 10)
+        monkeypatch.setattr(agent_module, "AGENT_MAX_SECONDS", 30)
+    return install
+
+
+def test_token_overrun_before_a_tool_call_returns_the_best_layout(stub_orchestrator):
+    layout = [word.model_dump() for word in generate_local_layout(WORDS).words]
+    model = StubModel(layout, tokens=400)
+    # The first tool call fits the budget and offers its layout; the second one does not
+    stub_orchestrator(model, max_tokens=700)
+
+    output = asyncio.run(agent_module.generate_crossword_agent(WORDS, mode="agent"))
+
+    assert model.calls == 2
+    assert [word.model_dump() for word in output.words] == layout
+
+
+def test_token_overrun_without_a_layout_falls_back_to_local(stub_orchestrator):
+    model = StubModel([], tokens=1000)
+    stub_orchestrator(model, max_tokens=500)
+
+    output = asyncio.run(agent_module.generate_crossword_agent(WORDS, mode="agent"))
+
+    assert model.calls == 1
+    assert output.words
+    assert validate_layout(output.words).is_valid_crossword
+
+
+def test_other_sdk_errors_are_not_swallowed(stub_orchestrator, monkeypatch):
+    async def failing_run(**kwargs):
+        raise UserError("broken tool")
+
+    stub_orchestrator(StubModel([], tokens=1), max_tokens=500)
+    monkeypatch.setattr(agent_module.Runner, "run", failing_run)
+
+    with pytest.raises(UserError):
+        asyncio.run(agent_module.generate_crossword_agent(WORDS, mode="agent"))
+
+
+def test_invalid_local_layout_is_repaired(monkeypatch):
+    clashing = CrosswordOutput(words=[
+        CrosswordWord(id="1", word="horse", row=0, col=0, direction="across"),
+        CrosswordWord(id="2", word="hero", row=0, col=0, direction="down"),
+        CrosswordWord(id="3", word="otter", row=0, col=0, direction="down"),
+    ])
+    monkeypatch.setattr(agent_module, "generate_local_layout", lambda words, config: clashing)
+
+    output = asyncio.run(agent_module.generate_crossword_agent(WORDS, mode="local"))
+
+    assert validate_layout(output.words).is_valid_crossword
+    assert sorted(word.word for word in output.words) == ["hero", "horse", "otter"]
+
+
+def test_unrepairable_local_layout_raises(monkeypatch):
+    invalid = CrosswordOutput(words=[CrosswordWord(id="1", word="horse", row=0, col=8, direction="across")])
+    monkeypatch.setattr(agent_module, "generate_local_layout", lambda words, config: invalid)
+    monkeypatch.setattr(
+        agent_module, "repair_layout",
+        lambda words, rows, cols, validation: RepairResult(output=invalid, validation=validation)
+    )
+
+    with pytest.raises(agent_module.InvalidLayoutError):
+        asyncio.run(agent_module.generate_crossword_agent(WORDS, mode="local"))
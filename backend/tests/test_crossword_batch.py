@@ -0,0 +1,82 @@
+import asyncio
+import random
+
+from app.api import crossword_batch, generate_crossword
+from app.api.crossword_batch import PuzzleSpec
+from app.core.answers import AnswerIndexStore
+from app.core.tti import ImageGenerationResult
+from app.crossword.layout import LayoutConfig, generate_local_layout
+
+from conftest import random_words
+
+
+class StubScheduler:
+    """Resolves every queued image shortly after it is queued, recording the size of each submitted batch."""
+
+    def __init__(self):
+        self.batches = []
+        self.pending = 0
+        self.max_pending = 0
+
+    def submit_batch(self, texts):
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        self.batches.append(len(texts))
+        self.pending += len(texts)
+        self.max_pending = max(self.max_pending, self.pending)
+
+        def resolve():
+            for text, future in zip(texts, futures):
+                self.pending -= 1
+                if not future.done():
+                    future.set_result(ImageGenerationResult(text=text, url=f"https://images.test/{len(text)}"))
+
+        loop.call_later(0.01, resolve)
+        return futures
+
+
+def _run_batch(monkeypatch, specs, words):
+    scheduler = StubScheduler()
+    answers = AnswerIndexStore(b"secret")
+    monkeypatch.setattr(crossword_batch, "get_image_scheduler", lambda: scheduler)
+    monkeypatch.setattr(crossword_batch, "VOCABULARY_ENABLED", False)
+    monkeypatch.setattr(generate_crossword, "get_answer_store", lambda: answers)
+    monkeypatch.setattr(generate_crossword, "CROSSWORD_STORE_ENABLED", False)
+
+    async def generate_words_llm(theme, language, level, count, max_length):
+        return words
+
+    async def layout(words, spec):
+        return generate_local_layout(words, LayoutConfig(rows=spec.rows, cols=spec.cols))
+
+    monkeypatch.setattr(crossword_batch, "generate_words_llm", generate_words_llm)
+    monkeypatch.setattr(crossword_batch, "_layout", layout)
+
+    async def run():
+        return [record async for record in crossword_batch.generate_crossword_batch(specs, rng=random.Random(1))]
+
+    return asyncio.run(run()), scheduler
+
+
+def test_images_are_queued_one_puzzle_at_a_time(monkeypatch, rng):
+    specs = [PuzzleSpec(theme="animals", language="english", level="easy")] * 5
+    words = random_words(rng, 60, 10)
+
+    records, scheduler = _run_batch(monkeypatch, specs, words)
+
+    puzzles = [record for record in records if "crossword" in record]
+    assert len(puzzles) == 5
+    assert records[-1]["summary"]["completed"] == 5
+    assert len(scheduler.batches) == 5
+    assert scheduler.max_pending <= max(spec.word_count for spec in specs)
+
+
+def test_puzzles_sharing_definitions_share_their_images(monkeypatch, rng):
+    specs = [PuzzleSpec(theme="animals", language="english", level="easy")] * 3
+    words = random_words(rng, 12, 10)
+
+    records, scheduler = _run_batch(monkeypatch, specs, words)
+
+    assert records[-1]["summary"]["completed"] == 3
+    # The word pool only covers one puzzle, so later puzzles reuse the queued images
+    assert sum(scheduler.batches) == len(words)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from app.core.crossword_store import CrosswordStore, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CrosswordStore(str(tmp_path / "crosswords.sqlite3"), cache_size=2)
+    yield store
+    store.close()
+
+
+def save(store, crossword_id: str, theme: str = "Animals", created_at: float = 0.0) -> None:
+    asyncio.run(store.save(crossword_id, f'{{"id": "{crossword_id}"}}', theme, "English", "easy", 10, 10, 8, "HORSE"))
+    # Deterministic order independent of the clock
+    store._connection.execute("UPDATE crosswords SET created_at = ? WHERE id = ?", (created_at, crossword_id))
+    store._connection.commit()
+
+
+def test_keyset_pagination_visits_every_crossword_once(store):
+    for i in range(7):
+        save(store, f"c{i}", created_at=float(i // 2))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = asyncio.run(store.list(3, cursor=cursor))
+        seen.extend(summary.id for summary in page)
+        if cursor is None:
+            break
+
+    assert seen == ["c6", "c5", "c4", "c3", "c2", "c1", "c0"]
+
+
+def test_filters_are_normalized(store):
+    save(store, "a", theme="Animals", created_at=1)
+    save(store, "b", theme="Space", created_at=2)
+
+    page, cursor = asyncio.run(store.list(10, theme=" animals "))
+
+    assert [summary.id for summary in page] == ["a"]
+    assert page[0].theme == "animals"
+    assert cursor is None
+
+
+def test_get_reads_through_the_cache(store):
+    for name in ("a", "b", "c"):
+        save(store, name)
+
+    assert asyncio.run(store.get("a")) == '{"id": "a"}'
+    assert asyncio.run(store.get("missing")) is None
+
+
+def test_solution_is_kept_apart_from_the_served_json(store):
+    save(store, "a")
+
+    assert "HORSE" not in asyncio.run(store.get("a"))
+    assert asyncio.run(store.get_solution("a")) == ("HORSE", 10, 10)
+    assert asyncio.run(store.get_solution("missing")) is None
+
+
+def test_saving_an_existing_id_keeps_the_first_copy(store):
+    save(store, "a")
+    store._cache.clear()
+    asyncio.run(store.save("a", '{"id": "other"}', "Animals", "English", "easy", 10, 10, 8, "OTHER"))
+
+    assert asyncio.run(store.get("a")) == '{"id": "a"}'
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(1.5, "abc:def")) == (1.5, "abc:def")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
@@ -0,0 +1,90 @@
+import pytest
+
+from app.core.answers import AnswerIndexStore
+from app.core.game_sessions import GameSessionStore, WrongLetterLimitError
+from app.crossword.grid import build_grid
+from app.crossword.models import CrosswordWord
+
+
+@pytest.fixture
+def answers() -> AnswerIndexStore:
+    return AnswerIndexStore(b"secret", max_puzzles=4)
+
+
+@pytest.fixture
+def index(answers):
+    words = [
+        CrosswordWord(id="1", word="horse", row=1, col=0, direction="across"),
+        CrosswordWord(id="2", word="hero", row=1, col=0, direction="down"),
+    ]
+    return answers.build("puzzle", build_grid(words, 5, 5).letters, 5, 5)
+
+
+def test_answers_are_checked_per_cell(answers, index):
+    results = answers.check(index, [(1, 0, "h"), (1, 1, "X"), (2, 0, "E"), (0, 0, "A"), (9, 9, "A")])
+
+    assert results == [True, False, True, False, False]
+    assert index.total_cells == 8
+
+
+def test_answers_depend_on_the_secret(index):
+    assert AnswerIndexStore(b"other").check(index, [(1, 0, "H")]) == [False]
+
+
+def test_out_of_board_cells_do_not_alias_real_cells(answers, index):
+    sessions = GameSessionStore(answers)
+    session = sessions.create(index)
+
+    assert sessions.submit(session, index, [(1, 0, "H")]) == [True]
+    # Column 5 is past the board; row * cols + col would be cell (1, 0)
+    assert sessions.submit(session, index, [(0, 5, "Z")]) == [False]
+    assert session.solved == {5}
+
+
+def test_wrong_letter_unsolves_and_full_board_completes(answers, index):
+    sessions = GameSessionStore(answers)
+    session = sessions.create(index)
+    cells = [(1, c, letter) for c, letter in enumerate("HORSE")] + [(r, 0, letter) for r, letter in zip((2, 3, 4), "ERO")]
+
+    sessions.submit(session, index, [(1, 1, "O")])
+    sessions.submit(session, index, [(1, 1, "A")])
+    assert session.solved == set()
+
+    sessions.submit(session, index, cells)
+    assert session.completed
+    assert session.end_time is not None
+
+
+def test_store_drops_least_recently_updated_session(answers, index):
+    sessions = GameSessionStore(answers, max_sessions=2)
+    first = sessions.create(index)
+    second = sessions.create(index)
+    sessions.touch(first)
+    sessions.create(index)
+
+    assert sessions.get(first.id) is first
+    assert sessions.get(second.id) is None
+
+
+def test_score_is_computed_from_solved_cells(answers, index):
+    sessions = GameSessionStore(answers, cell_score=10)
+    session = sessions.create(index)
+
+    sessions.submit(session, index, [(1, 0, "H"), (1, 1, "O")])
+
+    assert session.score == 20
+
+
+def test_wrong_letters_are_limited_per_session(answers, index):
+    sessions = GameSessionStore(answers, wrong_letters_per_cell=0.5)
+    session = sessions.create(index)
+
+    # 8 cells: four wrong letters are allowed, clearing a cell is free
+    sessions.submit(session, index, [(1, 1, "A"), (1, 1, "B"), (1, 1, ""), (1, 2, "C")])
+    with pytest.raises(WrongLetterLimitError):
+        sessions.submit(session, index, [(1, 1, "O"), (1, 3, "D"), (1, 4, "F")])
+
+    assert session.wrong_letters == 3
+    assert session.solved == set()
+    sessions.submit(session, index, [(1, 1, "O"), (1, 3, "D")])
+    assert session.solved == {6}
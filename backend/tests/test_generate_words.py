@@ -0,0 +1,93 @@
+import asyncio
+import random
+
+import pytest
+
+import app.agent.tools.generate_words as generate_words_module
+from app.core.vocabulary import VocabularyStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = VocabularyStore(str(tmp_path / "vocabulary.sqlite3"))
+    words = [{"word": word, "definition": f"Definition of {word}"}
+             for word in ("cat", "horse", "otter", "rabbit", "elephant", "crocodile", "hippopotamus")]
+    asyncio.run(store.add_words("Animals", "English", "easy", words))
+    monkeypatch.setattr(generate_words_module, "VOCABULARY_ENABLED", True)
+    monkeypatch.setattr(generate_words_module, "VOCABULARY_MIN_POOL", 1)
+    monkeypatch.setattr(generate_words_module, "get_vocabulary_store", lambda: store)
+    yield store
+    store.close()
+
+
+def test_pool_sampling_respects_max_length(store):
+    assert asyncio.run(store.count("animals", "english", "easy")) == 7
+    assert asyncio.run(store.count("animals", "english", "easy", max_length=5)) == 3
+
+    sample = asyncio.run(store.sample("animals", "english", "easy", 10, rng=random.Random(1), max_length=6))
+    assert sorted(item["word"] for item in sample) == ["cat", "horse", "otter", "rabbit"]
+
+
+def test_generate_words_only_serves_words_that_fit_the_board(store):
+    words = asyncio.run(generate_words_module.generate_words("Animals", "English", "easy", count=1, max_length=5))
+
+    assert len(words) == 1
+    assert len(words[0]["word"]) <= 5
+
+
+def test_pool_miss_uses_the_requested_mode(store, monkeypatch):
+    calls = []
+
+    async def structured(**kwargs):
+        calls.append(kwargs)
+        return [{"word": "tiger", "definition": "Striped big cat"}]
+
+    monkeypatch.setattr(generate_words_module, "LAYOUT_MODE", "local")
+    monkeypatch.setattr(generate_words_module, "generate_words_structured", structured)
+
+    words = asyncio.run(generate_words_module.generate_words(
+        "Space", "English", "easy", count=3, max_length=7, mode="fused"
+    ))
+
+    assert words == [{"word": "tiger", "definition": "Striped big cat"}]
+    assert calls == [{"theme": "Space", "language": "English", "level": "easy", "count": 3, "max_length": 7}]
+
+
+def test_only_recent_pools_stay_in_memory(tmp_path):
+    store = VocabularyStore(str(tmp_path / "vocabulary.sqlite3"), cache_pools=2)
+
+    async def run():
+        for theme in ("birds", "fish", "trees"):
+            await store.add_words(theme, "English", "easy", [{"word": theme, "definition": f"Some {theme}"}])
+        return await store.count("birds", "english", "easy")
+
+    assert asyncio.run(run()) == 1
+    assert list(store._pools) == [("trees", "english", "easy"), ("birds", "english", "easy")]
+    store.close()
+
+
+def test_chat_prompt_asks_for_words_that_fit_the_board(monkeypatch):
+    sent = []
+
+    class StubTTT:
+        def __init__(self, model):
+            pass
+
+        def create_system_message(self, content):
+            return content
+
+        def create_user_message(self, content):
+            return content
+
+        def create_function_tool(self, **kwargs):
+            return kwargs
+
+        async def generate_response_with_tools(self, messages, tools):
+            sent.extend(messages)
+            return {"function_name": "generate_words_list", "arguments": {"words": []}}
+
+    monkeypatch.setattr(generate_words_module, "AsyncTTT", StubTTT)
+
+    asyncio.run(generate_words_module.generate_words_llm("Animals", "English", "easy", count=4, max_length=6, mode="local"))
+
+    assert "at most 6 letters" in sent[-1]
@@ -0,0 +1,78 @@
+import base64
+
+import pytest
+
+from app.api import generate_crossword
+from app.core.answers import AnswerIndexStore
+from app.crossword.grid import build_grid
+from app.crossword.models import CrosswordOutput, CrosswordWord
+
+
+def _words():
+    return [
+        CrosswordWord(id="1", word="hero", row=1, col=0, direction="down"),
+        CrosswordWord(id="2", word="horse", row=1, col=0, direction="across"),
+        CrosswordWord(id="3", word="ox", row=0, col=2, direction="down"),
+    ]
+
+
+def _owners(encoded):
+    return list(base64.b64decode(encoded))
+
+
+def test_grid_has_one_letter_and_owner_per_cell():
+    grid = build_grid(_words(), 5, 5)
+
+    assert grid.letters[5:10] == "HORSE"
+    assert grid.letters[5::5] == "HERO"
+    assert grid.letters[0] == "."
+    across, down = _owners(grid.across), _owners(grid.down)
+    assert across[5:10] == [2] * 5
+    assert down[5::5] == [1] * 4
+    assert down[2] == down[7] == 3
+    assert across[0] == down[0] == 0
+    assert grid.numbers == [2, 3, 1]
+
+
+def test_permuted_grid_remaps_owners_and_numbers():
+    grid = build_grid(_words(), 5, 5)
+
+    permuted = grid.permuted([2, 0, 1])
+
+    assert permuted.letters == grid.letters
+    assert _owners(permuted.across)[5:10] == [3] * 5
+    assert _owners(permuted.down)[2] == 1
+    assert permuted.numbers == [1, 2, 3]
+
+
+@pytest.mark.parametrize("word", ["ho.se", "ho_se", "ho se"])
+def test_words_with_non_letters_are_rejected(word):
+    with pytest.raises(ValueError):
+        build_grid([CrosswordWord(id="1", word=word, row=0, col=0, direction="across")], 5, 5)
+
+
+def test_masked_grid_hides_letters_but_keeps_the_tiles():
+    grid = build_grid(_words(), 5, 5)
+
+    masked = grid.masked()
+
+    assert masked.letters == "".join("." if letter == "." else "_" for letter in grid.letters)
+    assert (masked.across, masked.down, masked.numbers) == (grid.across, grid.down, grid.numbers)
+    assert grid.tiles() == "".join(sorted(grid.letters.replace(".", "")))
+
+
+def test_served_crossword_has_no_solution(monkeypatch):
+    answers = AnswerIndexStore(b"secret")
+    monkeypatch.setattr(generate_crossword, "get_answer_store", lambda: answers)
+    generated_words = [{"word": word.word, "definition": f"clue {index}"} for index, word in enumerate(_words())]
+
+    crossword = generate_crossword._transform_crossword_data(
+        generated_words,
+        CrosswordOutput(words=_words()),
+        [None] * len(generated_words),
+        {"rows": 5, "cols": 5}
+    )
+
+    served = crossword.model_dump_json().upper()
+    assert "HORSE" not in served and "HERO" not in served
+    assert answers.check(answers.get(crossword.id), [(1, 0, "H"), (1, 1, "E")]) == [True, False]
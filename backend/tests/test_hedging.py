@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from app.core.tti import (
+    HedgedImageGenerator,
+    ImageGenerationConfig,
+    ImageGenerationError,
+    ImageGenerationResult,
+    ImageGenerationScheduler,
+    LatencyTracker,
+    TextToImageService,
+)
+
+CONFIG = ImageGenerationConfig()
+
+
+class ScriptedGenerator:
+    """Async generator whose n-th call waits, then returns, raises or is cancelled as outcomes[n] says."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.cancelled = []
+
+    async def generate_single_image(self, prompt, config):
+        index = self.calls
+        self.calls += 1
+        delay, outcome = self.outcomes[index]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(index)
+            raise
+        if outcome == "cancel":
+            raise asyncio.CancelledError()
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def hedged(generator, samples=(0.01,) * 5):
+    hedger = HedgedImageGenerator(generator, percentile=90.0, min_samples=len(samples))
+    for sample in samples:
+        hedger._latencies.observe(sample)
+    return hedger
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker()
+    for seconds in range(1, 11):
+        tracker.observe(float(seconds))
+
+    assert tracker.percentile(50) == 5.0
+    assert tracker.percentile(90) == 9.0
+    assert tracker.percentile(100) == 10.0
+
+
+def test_no_hedge_before_enough_samples():
+    generator = ScriptedGenerator((0.05, "primary"))
+    hedger = hedged(generator, samples=())
+    hedger._min_samples = 5
+
+    assert asyncio.run(hedger.generate_single_image("prompt", CONFIG)) == "primary"
+    assert generator.calls == 1
+
+
+def test_slow_request_is_hedged_and_the_loser_cancelled():
+    generator = ScriptedGenerator((1.0, "primary"), (0.01, "hedge"))
+
+    result = asyncio.run(hedged(generator).generate_single_image("prompt", CONFIG))
+
+    assert result == "hedge"
+    assert generator.calls == 2
+    assert generator.cancelled == [0]
+
+
+def test_failed_request_falls_back_to_the_other_one():
+    generator = ScriptedGenerator((0.05, ImageGenerationError("failed")), (0.1, "hedge"))
+
+    assert asyncio.run(hedged(generator).generate_single_image("prompt", CONFIG)) == "hedge"
+
+
+def test_request_cancelled_from_below_falls_back_to_the_other_one():
+    generator = ScriptedGenerator((0.05, "cancel"), (0.1, "hedge"))
+
+    assert asyncio.run(hedged(generator).generate_single_image("prompt", CONFIG)) == "hedge"
+
+
+def test_both_requests_cancelled_from_below_raise_an_image_error():
+    generator = ScriptedGenerator((0.05, "cancel"), (0.05, "cancel"))
+
+    with pytest.raises(ImageGenerationError):
+        asyncio.run(hedged(generator).generate_single_image("prompt", CONFIG))
+
+
+def test_last_error_is_raised_when_both_fail():
+    generator = ScriptedGenerator((0.05, ImageGenerationError("first")), (0.05, ImageGenerationError("second")))
+
+    with pytest.raises(ImageGenerationError, match="second"):
+        asyncio.run(hedged(generator).generate_single_image("prompt", CONFIG))
+
+
+def test_cancelling_the_caller_cancels_both_requests():
+    generator = ScriptedGenerator((60, "primary"), (60, "hedge"))
+
+    async def run():
+        task = asyncio.ensure_future(hedged(generator).generate_single_image("prompt", CONFIG))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert sorted(generator.cancelled) == [0, 1]
+
+
+def test_single_image_is_limited_to_the_config_timeout():
+    generator = ScriptedGenerator((60, "late"))
+    service = TextToImageService(image_generator=object(), async_image_generator=generator)
+
+    result = asyncio.run(service.generate_image_for_text_async(
+        "cat", config=ImageGenerationConfig(timeout_seconds=0.05)
+    ))
+
+    assert result.url is None and result.error
+    assert generator.cancelled == [0]
+
+
+def test_batch_deadline_replaces_late_images_with_placeholders():
+    class Service:
+        async def generate_image_for_text_async(self, text, prompt_template=None, config=None):
+            await asyncio.sleep(60 if text == "slow" else 0)
+            return ImageGenerationResult(text=text, url=f"https://images.test/{text}")
+
+    async def run():
+        scheduler = ImageGenerationScheduler(service=Service(), max_concurrency=2)
+        try:
+            return await scheduler.generate_batch(["fast", "slow"], deadline_seconds=0.1)
+        finally:
+            await scheduler.close()
+
+    batch = asyncio.run(run())
+
+    assert [result.text for result in batch.results] == ["fast", "slow"]
+    assert batch.results[0].url == "https://images.test/fast"
+    assert batch.results[1].url is None and batch.results[1].error
+    assert (batch.successful_count, batch.failed_count) == (1, 1)
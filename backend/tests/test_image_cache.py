@@ -0,0 +1,183 @@
+import asyncio
+import io
+import os
+
+import httpx
+import pytest
+
+from app.core.config import IMAGE_THUMBNAIL_DEFAULT_WIDTH, IMAGE_THUMBNAIL_WIDTHS
+from app.core.image_cache import (
+    CachedImageGenerator,
+    ImageCache,
+    image_stem,
+    image_url,
+    render_thumbnail,
+    thumbnail_name,
+    thumbnail_srcset,
+)
+from app.core.tti import ImageGenerationConfig
+
+STEM = "ab" * 32
+
+
+@pytest.fixture
+def directory(tmp_path) -> str:
+    return str(tmp_path / "images")
+
+
+def blob(cache: ImageCache, content: bytes) -> str:
+    return cache.write_blob(content)
+
+
+def test_index_survives_a_restart_in_lru_order(directory):
+    cache = ImageCache(directory, max_bytes=1000)
+    for key in ("a", "b", "c"):
+        cache.add(key, blob(cache, key.encode()), 10)
+    cache.get("a")
+    asyncio.run(cache.persist())
+    cache.close()
+
+    reopened = ImageCache(directory, max_bytes=1000)
+    assert list(reopened._entries) == ["b", "c", "a"]
+    assert reopened.total_bytes == 30
+
+
+def test_changes_are_only_written_by_persist(directory):
+    cache = ImageCache(directory, max_bytes=1000)
+    cache.add("a", blob(cache, b"a"), 10)
+
+    def rows():
+        return cache._connection.execute("SELECT key FROM images").fetchall()
+
+    assert rows() == []
+    asyncio.run(cache.persist())
+    assert rows() == [("a",)]
+
+
+def test_shared_blob_is_deleted_with_its_last_key(directory):
+    cache = ImageCache(directory, max_bytes=25)
+    filename = blob(cache, b"same")
+    cache.add("a", filename, 10)
+    cache.add("b", filename, 10)
+    path = os.path.join(directory, filename)
+
+    cache.add("c", blob(cache, b"other"), 10)
+    asyncio.run(cache.persist())
+    assert "a" not in cache._entries and os.path.isfile(path)
+
+    cache.add("d", blob(cache, b"more"), 10)
+    assert "b" not in cache._entries and os.path.isfile(path)
+    asyncio.run(cache.persist())
+    assert not os.path.isfile(path)
+    assert cache._refs == {cache._entries["c"].filename: 1, cache._entries["d"].filename: 1}
+
+
+def test_pinned_blobs_are_not_evicted_across_restarts(directory):
+    cache = ImageCache(directory, max_bytes=25)
+    pinned = blob(cache, b"pinned")
+    cache.add("a", pinned, 10)
+    cache.pin([image_url(pinned), "https://elsewhere.test/image.png"])
+    asyncio.run(cache.persist())
+    cache.close()
+
+    reopened = ImageCache(directory, max_bytes=25)
+    reopened.add("b", blob(reopened, b"b"), 10)
+    reopened.add("c", blob(reopened, b"c"), 10)
+    asyncio.run(reopened.persist())
+
+    assert list(reopened._entries) == ["a", "c"]
+    assert os.path.isfile(os.path.join(directory, pinned))
+
+
+def test_held_blobs_are_evicted_once_released(directory):
+    cache = ImageCache(directory, max_bytes=15)
+    held = blob(cache, b"held")
+    cache.add("a", held, 10)
+    cache.hold([image_url(held)])
+
+    cache.add("b", blob(cache, b"b"), 10)
+    assert list(cache._entries) == ["a", "b"]
+
+    cache.release([image_url(held)])
+    asyncio.run(cache.persist())
+    assert list(cache._entries) == ["b"]
+    assert not os.path.isfile(os.path.join(directory, held))
+
+
+def png(width: int, height: int) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(output, "PNG")
+    return output.getvalue()
+
+
+def test_image_stem_of_blob_and_thumbnail_urls():
+    assert image_stem(image_url(f"{STEM}.png")) == STEM
+    assert image_stem(image_url(thumbnail_name(f"{STEM}.png", 256))) == STEM
+    assert image_stem("https://elsewhere.test/image.png") is None
+    assert image_stem(None) is None
+
+
+def test_srcset_lists_every_thumbnail_width():
+    srcset = thumbnail_srcset(image_url(thumbnail_name(f"{STEM}.png", 256)))
+
+    assert srcset == ", ".join(
+        f"{image_url(f'{STEM}-{width}.webp')} {width}w" for width in sorted(IMAGE_THUMBNAIL_WIDTHS)
+    )
+    assert thumbnail_srcset(image_url(f"{STEM}.png")) is None
+    assert thumbnail_srcset("https://elsewhere.test/image.png") is None
+
+
+def test_thumbnails_are_downscaled_webp():
+    Image = pytest.importorskip("PIL.Image")
+
+    with Image.open(io.BytesIO(render_thumbnail(png(1024, 512), 256))) as thumbnail:
+        assert thumbnail.format == "WEBP"
+        assert thumbnail.size == (256, 128)
+    with Image.open(io.BytesIO(render_thumbnail(png(100, 100), 256))) as thumbnail:
+        assert thumbnail.size == (100, 100)
+
+
+def test_missing_thumbnail_is_rendered_on_request(directory):
+    data = png(600, 600)
+    cache = ImageCache(directory, max_bytes=10 ** 7)
+    filename = cache.write_blob(data)
+    width = IMAGE_THUMBNAIL_WIDTHS[0]
+
+    path = cache.thumbnail(thumbnail_name(filename, width))
+
+    assert path is not None and os.path.isfile(path)
+    assert cache.thumbnail(thumbnail_name(filename, 999)) is None
+    assert cache.thumbnail(thumbnail_name("cd" * 32 + ".png", width)) is None
+
+
+def test_cached_generator_hands_out_the_default_thumbnail(directory):
+    data = png(1024, 1024)
+    downloads = []
+
+    class Generator:
+        async def generate_single_image(self, prompt, config):
+            return "https://cdn.test/generated.png"
+
+    def download(request):
+        downloads.append(str(request.url))
+        return httpx.Response(200, content=data, headers={"content-type": "image/png"})
+
+    async def run():
+        cache = ImageCache(directory, max_bytes=10 ** 7)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(download)) as client:
+            generator = CachedImageGenerator(Generator(), cache, "dall-e-3", http_client=client)
+            first = await generator.generate_single_image("a cat", ImageGenerationConfig())
+            second = await generator.generate_single_image("a cat", ImageGenerationConfig())
+        return cache, first, second
+
+    cache, first, second = asyncio.run(run())
+
+    assert first == second
+    assert first.endswith(f"-{IMAGE_THUMBNAIL_DEFAULT_WIDTH}.webp")
+    assert downloads == ["https://cdn.test/generated.png"]
+    # Every width was written next to the blob and counts toward the budget
+    stem = image_stem(first)
+    for width in IMAGE_THUMBNAIL_WIDTHS:
+        assert os.path.isfile(os.path.join(directory, f"{stem}-{width}.webp"))
+    assert cache.total_bytes > len(data)
@@ -0,0 +1,171 @@
+import asyncio
+
+from app.core.ratelimit import get_rate_limiter
+from app.core.tti import (
+    ImageGenerationConfig,
+    ImageGenerationResult,
+    ImageGenerationScheduler,
+    ImageQuality,
+    ImageSize,
+    supported_size,
+)
+
+
+class StubService:
+    """Image service whose calls for texts in `cancelled` raise CancelledError from inside the call."""
+
+    def __init__(self, cancelled=()):
+        self.cancelled = set(cancelled)
+
+    async def generate_image_for_text_async(self, text, prompt_template=None, config=None):
+        await asyncio.sleep(0)
+        if text in self.cancelled:
+            raise asyncio.CancelledError()
+        return ImageGenerationResult(text=text, url=f"https://images.test/{text}")
+
+
+def test_cancelled_service_call_does_not_stop_the_worker():
+    async def run():
+        scheduler = ImageGenerationScheduler(service=StubService(cancelled={"lost"}), max_concurrency=1)
+        first = scheduler.submit_batch(["lost"])
+        await asyncio.wait(first, timeout=1)
+        second = scheduler.submit_batch(["found"])
+        await asyncio.wait(second, timeout=1)
+        return first[0], second[0], [worker.done() for worker in scheduler._workers]
+
+    first, second, workers = asyncio.run(run())
+
+    assert not first.cancelled() and first.result().url is None
+    assert second.done() and second.result().url == "https://images.test/found"
+    assert workers == [False] * len(workers)
+
+
+def test_stopped_workers_are_restarted():
+    async def run():
+        scheduler = ImageGenerationScheduler(service=StubService(), max_concurrency=2)
+        scheduler.submit_batch([])
+        scheduler._workers[0].cancel()
+        await asyncio.sleep(0)
+        futures = scheduler.submit_batch(["a", "b", "c"])
+        await asyncio.wait(futures, timeout=1)
+        return futures, [worker.done() for worker in scheduler._workers]
+
+    futures, workers = asyncio.run(run())
+
+    assert [future.result().url for future in futures] == [f"https://images.test/{t}" for t in "abc"]
+    assert workers == [False] * len(workers)
+
+
+def test_cancelling_a_running_job_cancels_its_call():
+    started, stopped = asyncio.Event(), asyncio.Event()
+
+    class SlowService:
+        async def generate_image_for_text_async(self, text, prompt_template=None, config=None):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+    async def run():
+        scheduler = ImageGenerationScheduler(service=SlowService(), max_concurrency=1)
+        futures = scheduler.submit_batch(["slow"])
+        await asyncio.wait_for(started.wait(), timeout=1)
+        futures[0].cancel()
+        await asyncio.wait_for(stopped.wait(), timeout=1)
+        await asyncio.sleep(0.01)
+        return scheduler.active_count, [worker.done() for worker in scheduler._workers]
+
+    active, workers = asyncio.run(run())
+
+    assert active == 0
+    assert workers == [False]
+
+
+class RecordingService:
+    """Image service that records the configs it was called with."""
+
+    def __init__(self, name, default_config=None):
+        self.name = name
+        self.default_config = default_config or ImageGenerationConfig()
+        self.calls = []
+
+    async def generate_image_for_text_async(self, text, prompt_template=None, config=None):
+        self.calls.append((text, config))
+        await asyncio.sleep(0)
+        return ImageGenerationResult(text=text, url=f"https://images.test/{self.name}/{text}")
+
+
+def test_deep_queue_goes_to_the_fallback_service():
+    primary = RecordingService("primary")
+    fallback = RecordingService("fallback", ImageGenerationConfig(size=ImageSize.MEDIUM))
+    config = ImageGenerationConfig(size=ImageSize.SQUARE, quality=ImageQuality.HD, timeout_seconds=7)
+
+    async def run():
+        scheduler = ImageGenerationScheduler(
+            service=primary, max_concurrency=1, fallback_service=fallback,
+            fallback_queue_depth=2, primary_model="scheduler-test-queue"
+        )
+        futures = scheduler.submit_batch(["a", "b", "c", "d"], config=config)
+        await asyncio.wait(futures, timeout=1)
+        await scheduler.close()
+        return [future.result().url for future in futures]
+
+    urls = asyncio.run(run())
+
+    # Picked with 3 and 2 images left in the queue, then 1 and 0
+    assert urls == [
+        "https://images.test/fallback/a",
+        "https://images.test/fallback/b",
+        "https://images.test/primary/c",
+        "https://images.test/primary/d",
+    ]
+    # The fallback keeps the request's other settings but uses its own size and quality
+    assert fallback.calls[0][1] == ImageGenerationConfig(
+        size=ImageSize.MEDIUM, quality=ImageQuality.STANDARD, timeout_seconds=7
+    )
+    assert primary.calls[0][1] == config
+
+
+def test_open_circuit_goes_to_the_fallback_service():
+    primary, fallback = RecordingService("primary"), RecordingService("fallback")
+    circuit = get_rate_limiter("scheduler-test-circuit").circuit
+    for _ in range(circuit.failure_threshold):
+        circuit.record_failure()
+
+    async def run():
+        scheduler = ImageGenerationScheduler(
+            service=primary, max_concurrency=1, fallback_service=fallback,
+            fallback_queue_depth=0, primary_model="scheduler-test-circuit"
+        )
+        futures = scheduler.submit_batch(["a"])
+        await asyncio.wait(futures, timeout=1)
+        await scheduler.close()
+        return futures[0].result().url
+
+    try:
+        assert asyncio.run(run()) == "https://images.test/fallback/a"
+        assert fallback.calls == [("a", None)]
+    finally:
+        circuit.record_success()
+
+
+def test_no_fallback_without_a_fallback_service():
+    primary = RecordingService("primary")
+
+    async def run():
+        scheduler = ImageGenerationScheduler(service=primary, max_concurrency=1, fallback_queue_depth=1)
+        futures = scheduler.submit_batch(["a", "b", "c"])
+        await asyncio.wait(futures, timeout=1)
+        await scheduler.close()
+        return [future.result().url for future in futures]
+
+    assert asyncio.run(run()) == [f"https://images.test/primary/{text}" for text in "abc"]
+
+
+def test_unsupported_sizes_map_to_the_closest_supported_one():
+    assert supported_size("dall-e-3", ImageSize.MEDIUM) == ImageSize.SQUARE
+    assert supported_size("dall-e-2", ImageSize.LANDSCAPE) == ImageSize.SQUARE
+    assert supported_size("dall-e-2", ImageSize.SMALL) == ImageSize.SMALL
+    assert supported_size("some-new-model", ImageSize.SMALL) == ImageSize.SMALL
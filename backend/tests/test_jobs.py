@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.core.jobs import JobManager, JobQueueFullError, JobStatus
+
+
+def test_jobs_run_in_the_background_with_stage_timings():
+    async def runner(job):
+        job.record_stage("words")
+        if job.params["fail"]:
+            raise RuntimeError("no words")
+        job.record_stage("layout")
+        return {"theme": job.params["theme"]}
+
+    async def run():
+        manager = JobManager(runner, workers=2)
+        manager.start()
+        done = manager.submit({"theme": "animals", "fail": False})
+        failed = manager.submit({"theme": "space", "fail": True})
+        assert done.status == JobStatus.PENDING
+        await manager._queue.join()
+        await manager.stop()
+        return done, failed
+
+    done, failed = asyncio.run(run())
+
+    assert done.status == JobStatus.COMPLETED and done.result == {"theme": "animals"}
+    assert list(done.stage_timings) == ["words", "layout"]
+    assert failed.status == JobStatus.FAILED and failed.error == "no words"
+    assert "result" not in done.to_dict(include_result=False)
+
+
+def test_full_queue_rejects_new_jobs():
+    async def runner(job):
+        await asyncio.sleep(60)
+
+    async def run():
+        manager = JobManager(runner, workers=1, max_queued=1)
+        with pytest.raises(JobQueueFullError):
+            manager.submit({})
+        manager.start()
+        manager.submit({})
+        await asyncio.sleep(0)
+        manager.submit({})
+        with pytest.raises(JobQueueFullError):
+            manager.submit({})
+        await manager.stop()
+        return [job.status for job in manager._jobs.values()]
+
+    assert asyncio.run(run()) == [JobStatus.FAILED, JobStatus.FAILED]
+
+
+def test_only_the_newest_finished_jobs_are_kept():
+    async def runner(job):
+        return {}
+
+    async def run():
+        manager = JobManager(runner, workers=1, max_finished=2)
+        manager.start()
+        jobs = [manager.submit({}) for _ in range(3)]
+        await manager._queue.join()
+        await manager.stop()
+        return manager, jobs
+
+    manager, jobs = asyncio.run(run())
+
+    assert manager.get(jobs[0].id) is None
+    assert [manager.get(job.id) for job in jobs[1:]] == jobs[1:]
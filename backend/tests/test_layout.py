@@ -0,0 +1,33 @@
+import pytest
+
+from app.crossword.layout import LayoutConfig, generate_local_layout
+from app.crossword.validation import validate_layout
+
+from conftest import random_words
+
+
+@pytest.mark.parametrize("rows,cols", [(5, 5), (7, 12), (10, 10), (15, 15), (25, 25)])
+def test_local_layout_is_valid_across_board_sizes(rng, rows, cols):
+    for _ in range(20):
+        words = random_words(rng, rng.randint(4, 30), max(rows, cols))
+        output = generate_local_layout(words, LayoutConfig(rows=rows, cols=cols, max_seconds=0.05))
+
+        assert output.words
+        validation = validate_layout(output.words, rows=rows, cols=cols)
+        assert validation.is_valid_crossword, validation.reasoning
+
+
+def test_local_layout_numbers_words_in_reading_order():
+    words = [{"word": word, "definition": ""} for word in ("horse", "otter", "snake", "rabbit")]
+    output = generate_local_layout(words)
+
+    assert [word.id for word in output.words] == [str(i) for i in range(1, len(output.words) + 1)]
+    starts = [(word.row, word.col) for word in output.words]
+    assert starts == sorted(starts)
+
+
+def test_local_layout_skips_words_that_cannot_fit():
+    words = [{"word": word, "definition": ""} for word in ("elephants", "horse", "hero", "a1b")]
+    output = generate_local_layout(words, LayoutConfig(rows=5, cols=5))
+
+    assert {word.word for word in output.words} <= {"horse", "hero"}
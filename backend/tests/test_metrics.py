@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.api.metrics import metrics
+from app.core.stages import add_stage_listener, remove_stage_listener, stage_timer
+
+
+def _stage_count(stage):
+    return REGISTRY.get_sample_value("crossword_stage_duration_seconds_count", {"stage": stage}) or 0
+
+
+def test_stage_timer_reports_to_listeners_and_the_histogram():
+    seen = []
+    listener = lambda stage, seconds: seen.append(stage)
+    add_stage_listener(listener)
+    before = _stage_count("test-stage")
+    try:
+        with pytest.raises(RuntimeError):
+            with stage_timer("test-stage"):
+                raise RuntimeError("failed stages are timed too")
+    finally:
+        remove_stage_listener(listener)
+
+    assert seen == ["test-stage"]
+    assert _stage_count("test-stage") == before + 1
+
+
+def test_failing_listener_does_not_break_the_pipeline():
+    def broken(stage, seconds):
+        raise ValueError("broken listener")
+
+    add_stage_listener(broken)
+    try:
+        with stage_timer("test-stage"):
+            pass
+    finally:
+        remove_stage_listener(broken)
+
+
+def test_metrics_endpoint_exposes_the_pipeline_metrics():
+    response = asyncio.run(metrics())
+
+    body = response.body.decode()
+    assert response.media_type.startswith("text/plain")
+    for name in ("crossword_stage_duration_seconds", "openai_request_duration_seconds", "image_queue_depth"):
+        assert f"# TYPE {name}" in body
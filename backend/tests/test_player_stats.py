@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.core.player_stats import PlayerStatsStore
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "stats.sqlite3")
+
+
+def logged(store: PlayerStatsStore) -> int:
+    return store._connection.execute("SELECT COUNT(*) FROM stat_events").fetchone()[0]
+
+
+def test_updates_are_buffered_until_flushed(path):
+    store = PlayerStatsStore(path)
+    store.record_game_started("ann")
+    store.record_game_updated("ann", 0, False, 40, True)
+
+    assert logged(store) == 0
+    assert asyncio.run(store.get("ann")).to_dict() == {
+        "totalGames": 1, "completedGames": 1, "averageScore": 40, "bestScore": 40
+    }
+
+    assert asyncio.run(store.flush()) == 2
+    assert logged(store) == 2
+
+
+def test_cache_is_bounded_and_evicted_players_keep_unwritten_updates(path):
+    store = PlayerStatsStore(path, cache_size=2)
+    store.record_game_started("ann")
+    asyncio.run(store.flush())
+    asyncio.run(store.get("ann"))
+    store.record_game_updated("ann", 0, False, 10, False)
+    for user_id in ("bob", "cid"):
+        store.record_game_started(user_id)
+        asyncio.run(store.get(user_id))
+
+    assert list(store._stats) == ["bob", "cid"]
+    # One flushed game plus an unwritten score update
+    assert asyncio.run(store.get("ann")).to_dict()["averageScore"] == 10
+
+
+def test_stop_persists_everything(path):
+    async def play() -> None:
+        store = PlayerStatsStore(path, compaction_interval_seconds=3600)
+        store.start()
+        for score in (10, 30):
+            store.record_game_started("ann")
+            store.record_game_updated("ann", 0, False, score, score > 20)
+        await store.stop()
+        assert logged(store) == 0
+
+    asyncio.run(play())
+
+    reopened = PlayerStatsStore(path)
+    assert asyncio.run(reopened.get("ann")).to_dict() == {
+        "totalGames": 2, "completedGames": 1, "averageScore": 20, "bestScore": 30
+    }
+
+
+def test_unknown_players_are_not_cached(path):
+    store = PlayerStatsStore(path)
+
+    async def lookups():
+        return [await store.get(f"nobody-{i}") for i in range(3)]
+
+    assert [stats.to_dict()["totalGames"] for stats in asyncio.run(lookups())] == [0, 0, 0]
+    assert len(store._stats) == 0
+
+
+def test_updates_of_uncached_players_are_counted_once(path):
+    store = PlayerStatsStore(path)
+    store.record_game_started("ann")
+    asyncio.run(store.flush())
+    store.record_game_updated("ann", 0, False, 30, True)
+    store.compact()
+    store.record_game_started("ann")
+    asyncio.run(store.flush())
+    store.record_game_updated("ann", 0, False, 10, False)
+
+    assert asyncio.run(store.get("ann")).to_dict() == {
+        "totalGames": 2, "completedGames": 1, "averageScore": 20, "bestScore": 30
+    }
+
+
+def test_loading_a_player_does_not_wait_for_compaction(path):
+    store = PlayerStatsStore(path)
+    store.record_game_started("ann")
+    asyncio.run(store.flush())
+    store.compact()
+
+    async def load():
+        return await asyncio.wait_for(store.get("ann"), timeout=1)
+
+    # A compaction in progress holds the write lock
+    with store._lock:
+        stats = asyncio.run(load())
+
+    assert stats.total_games == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.core.pool import CrosswordPool
+
+
+def test_pool_refills_to_the_watermark_after_a_take():
+    generated = []
+
+    async def factory(level):
+        generated.append(level)
+        return f"{level}-{len(generated)}"
+
+    async def run():
+        pool = CrosswordPool(factory, ["easy", "hard"], watermark=2)
+        pool.start()
+        for _ in range(100):
+            if pool.size("easy") == pool.size("hard") == 2:
+                break
+            await asyncio.sleep(0)
+        taken = pool.take("easy")
+        for _ in range(100):
+            if pool.size("easy") == 2:
+                break
+            await asyncio.sleep(0)
+        sizes = pool.size("easy"), pool.size("hard")
+        await pool.stop()
+        return taken, sizes
+
+    taken, sizes = asyncio.run(run())
+
+    assert taken.startswith("easy-")
+    assert sizes == (2, 2)
+    assert sorted(generated) == ["easy"] * 3 + ["hard"] * 2
+
+
+def test_empty_or_unknown_level_takes_nothing():
+    async def factory(level):
+        return level
+
+    pool = CrosswordPool(factory, ["easy"], watermark=1)
+
+    assert pool.take("easy") is None
+    assert pool.take("impossible") is None
+    assert pool.size("impossible") == 0
+
+
+def test_failed_generation_is_retried():
+    calls = []
+
+    async def factory(level):
+        calls.append(level)
+        if len(calls) == 1:
+            raise RuntimeError("model is down")
+        return level
+
+    async def run():
+        pool = CrosswordPool(factory, ["easy"], watermark=1, retry_delay_seconds=0)
+        pool.start()
+        for _ in range(100):
+            if pool.size("easy") == 1:
+                break
+            await asyncio.sleep(0)
+        size = pool.size("easy")
+        await pool.stop()
+        return size
+
+    assert asyncio.run(run()) == 1
+    assert calls == ["easy", "easy"]
@@ -0,0 +1,189 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.core import ratelimit
+from app.core.ratelimit import CircuitOpenError, CircuitState, ModelLimiter, TokenBucket, parse_duration
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(ratelimit, "OPENAI_BACKOFF_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(ratelimit, "OPENAI_MAX_ATTEMPTS", 3)
+
+
+def status_error(status: int, headers=None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers or {}, request=REQUEST)
+    cls = {400: openai.BadRequestError, 429: openai.RateLimitError, 500: openai.InternalServerError}[status]
+    return cls("error", response=response, body=None)
+
+
+def raw_response(total_tokens=None, headers=None):
+    usage = SimpleNamespace(total_tokens=total_tokens) if total_tokens is not None else None
+    return SimpleNamespace(headers=headers or {}, parse=lambda: SimpleNamespace(usage=usage))
+
+
+def failing_then(errors, result):
+    """Call function raising `errors` in turn, then returning `result`."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return fn, calls
+
+
+def limiter() -> ModelLimiter:
+    return ModelLimiter("test-model", requests_per_minute=600, tokens_per_minute=60000)
+
+
+def test_parse_duration():
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("1.5s") == 1.5
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("2") == 2.0
+    assert parse_duration(None) is None
+    assert parse_duration("soon") is None
+
+
+def test_retryable_errors_are_retried():
+    model = limiter()
+    fn, calls = failing_then([status_error(429), status_error(500)], raw_response())
+
+    async def attempt():
+        return fn()
+
+    asyncio.run(model.call(attempt))
+
+    assert len(calls) == 3
+    assert model.circuit.state == CircuitState.CLOSED
+
+
+def test_non_retryable_error_is_raised_at_once_and_leaves_the_circuit_alone():
+    model = limiter()
+    model.circuit.record_failure()
+    fn, calls = failing_then([status_error(400)], raw_response())
+
+    with pytest.raises(openai.BadRequestError):
+        model.call_blocking(fn)
+
+    assert len(calls) == 1
+    # The failure streak before the rejected request is not reset
+    assert model.circuit._failures == 1
+
+
+def test_non_retryable_error_gives_back_the_probe():
+    model = limiter()
+    for _ in range(model.circuit.failure_threshold):
+        model.circuit.record_failure()
+    model.circuit._opened_at -= model.circuit.reset_seconds
+
+    with pytest.raises(openai.BadRequestError):
+        model.call_blocking(failing_then([status_error(400)], raw_response())[0])
+
+    # Still half-open, and the next call may probe again
+    assert model.circuit.state == CircuitState.HALF_OPEN
+    model.call_blocking(lambda: raw_response())
+    assert model.circuit.state == CircuitState.CLOSED
+
+
+def test_circuit_opens_after_repeated_exhausted_retries():
+    model = limiter()
+    fn, calls = failing_then([status_error(500)] * 100, raw_response())
+
+    for _ in range(model.circuit.failure_threshold):
+        with pytest.raises(openai.InternalServerError):
+            model.call_blocking(fn)
+    attempts = len(calls)
+
+    with pytest.raises(CircuitOpenError):
+        model.call_blocking(fn)
+
+    assert attempts == model.circuit.failure_threshold * ratelimit.OPENAI_MAX_ATTEMPTS
+    assert len(calls) == attempts
+    assert model.circuit.is_open
+
+
+def test_cancelled_call_gives_back_the_probe():
+    model = limiter()
+    for _ in range(model.circuit.failure_threshold):
+        model.circuit.record_failure()
+    model.circuit._opened_at -= model.circuit.reset_seconds
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def run():
+        task = asyncio.ensure_future(model.call(hang))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    model.circuit.before_call()
+    assert model.circuit.state == CircuitState.HALF_OPEN
+
+
+def test_token_estimate_is_settled_against_reported_usage():
+    model = limiter()
+
+    model.call_blocking(lambda: raw_response(total_tokens=100), tokens=1000)
+
+    # 1000 reserved, 100 used: 900 are given back (plus a little refill)
+    assert model.tokens.level == pytest.approx(60000 - 100, abs=5)
+
+    model.call_blocking(lambda: raw_response(total_tokens=3000), tokens=1000)
+
+    assert model.tokens.level == pytest.approx(60000 - 100 - 3000, abs=5)
+
+
+def test_rate_limit_headers_lower_the_buckets():
+    model = limiter()
+
+    model.call_blocking(lambda: raw_response(headers={
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "10",
+        "x-ratelimit-limit-tokens": "40000",
+        "x-ratelimit-remaining-tokens": "1000",
+    }))
+
+    assert model.requests.capacity == 500
+    assert model.requests.level == pytest.approx(10, abs=1)
+    assert model.tokens.capacity == 40000
+    assert model.tokens.level == pytest.approx(1000, abs=5)
+
+
+def test_blocking_acquire_waits_for_the_refill():
+    bucket = TokenBucket(per_minute=600)
+    bucket.level = 0.0
+
+    start = ratelimit.time.monotonic()
+    bucket.acquire_blocking(1)
+    waited = ratelimit.time.monotonic() - start
+
+    # 600 per minute refills one every 0.1 s
+    assert waited == pytest.approx(0.1, abs=0.05)
+
+
+def test_blocking_and_async_callers_share_the_bucket():
+    bucket = TokenBucket(per_minute=600)
+    bucket.level = 1.0
+
+    bucket.acquire_blocking(1)
+
+    async def run():
+        start = asyncio.get_running_loop().time()
+        await bucket.acquire(1)
+        return asyncio.get_running_loop().time() - start
+
+    assert asyncio.run(run()) >= 0.05
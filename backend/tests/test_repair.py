@@ -0,0 +1,56 @@
+from app.crossword.layout import LayoutConfig, generate_local_layout
+from app.crossword.repair import repair_layout
+from app.crossword.validation import validate_layout
+
+from conftest import random_words
+
+
+def test_valid_layout_is_returned_unchanged(rng):
+    output = generate_local_layout(random_words(rng, 10, 10))
+    result = repair_layout(output.words)
+
+    assert result.output == output
+    assert result.moved == [] and result.dropped == []
+
+
+def test_perturbed_layouts_are_repaired(rng):
+    for _ in range(100):
+        rows = cols = rng.randint(5, 25)
+        output = generate_local_layout(random_words(rng, 15, rows), LayoutConfig(rows=rows, cols=cols, max_seconds=0.05))
+        words = [word.model_dump() for word in output.words]
+        for moved in rng.sample(words, min(len(words), rng.randint(1, 3))):
+            moved["row"] = rng.randint(-1, rows - 1)
+            moved["col"] = rng.randint(0, cols - 1)
+            moved["direction"] = rng.choice(["across", "down"])
+
+        result = repair_layout(words, rows=rows, cols=cols)
+
+        assert result.validation.is_valid_crossword, result.validation.reasoning
+        assert validate_layout(result.output.words, rows=rows, cols=cols).is_valid_crossword
+        assert len(result.output.words) + len(result.dropped) == len(words)
+
+
+def test_conflicting_word_is_moved_around_the_core():
+    words = [
+        {"id": "1", "word": "horse", "row": 0, "col": 0, "direction": "across"},
+        {"id": "2", "word": "hero", "row": 0, "col": 0, "direction": "down"},
+        # Clashes with "horse" on its first letter
+        {"id": "3", "word": "otter", "row": 0, "col": 0, "direction": "down"},
+    ]
+    result = repair_layout(words)
+
+    assert result.validation.is_valid_crossword
+    assert sorted(word.word for word in result.output.words) == ["hero", "horse", "otter"]
+    assert result.moved == ["otter"]
+
+
+def test_nothing_in_place_falls_back_to_a_fresh_layout():
+    words = [
+        {"id": "1", "word": "horse", "row": 0, "col": 0, "direction": "sideways"},
+        {"id": "2", "word": "hero", "row": 9, "col": 9, "direction": "down"},
+        {"id": "3", "word": "a1b", "row": 0, "col": 0, "direction": "across"},
+    ]
+    result = repair_layout(words)
+
+    assert result.validation.is_valid_crossword
+    assert result.dropped == ["a1b"]
@@ -0,0 +1,90 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.api import crossword_batch, game_sessions, generate_crossword
+from app.api.schemas import (
+    BatchRequest,
+    BoardSize,
+    CellSubmission,
+    CrosswordRequest,
+    GameSessionUpdateRequest,
+)
+from app.core.config import BATCH_MAX_PUZZLES, BOARD_MAX_SIZE, BOARD_MIN_SIZE
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    for module in (generate_crossword, crossword_batch, game_sessions):
+        app.include_router(module.router)
+    return TestClient(app)
+
+
+def test_board_size_is_bounded():
+    assert BoardSize(rows=BOARD_MIN_SIZE, cols=BOARD_MAX_SIZE).cols == BOARD_MAX_SIZE
+    for rows, cols in ((BOARD_MIN_SIZE - 1, 10), (10, BOARD_MAX_SIZE + 1)):
+        with pytest.raises(ValidationError):
+            BoardSize(rows=rows, cols=cols)
+
+
+def test_crossword_request_defaults_and_strips():
+    request = CrosswordRequest.model_validate({"theme": "  space  "})
+
+    assert request.theme == "space"
+    assert (request.language, request.level) == ("en", "easy")
+    assert (request.board_size.rows, request.board_size.cols) == (10, 10)
+    with pytest.raises(ValidationError):
+        CrosswordRequest(theme="   ")
+    with pytest.raises(ValidationError):
+        CrosswordRequest(theme="x" * 101)
+
+
+def test_batch_total_is_capped():
+    BatchRequest.model_validate({"puzzles": [{"count": BATCH_MAX_PUZZLES - 1}, {"count": 1}]})
+
+    with pytest.raises(ValidationError, match=f"at most {BATCH_MAX_PUZZLES} puzzles"):
+        BatchRequest.model_validate({"puzzles": [{"count": BATCH_MAX_PUZZLES}, {"count": 1}]})
+    with pytest.raises(ValidationError):
+        BatchRequest.model_validate({"puzzles": []})
+    with pytest.raises(ValidationError):
+        BatchRequest.model_validate({"puzzles": [{"count": -1}]})
+
+
+def test_session_update_only_takes_cells():
+    update = GameSessionUpdateRequest.model_validate({
+        "cells": [{"row": 0, "col": 1, "letter": "A"}, {"row": 2, "col": 3, "letter": ""}],
+        "score": 1000,
+        "completed": True,
+    })
+
+    assert update.model_dump() == {"cells": [
+        {"row": 0, "col": 1, "letter": "A"},
+        {"row": 2, "col": 3, "letter": ""},
+    ]}
+
+
+def test_cell_submission_is_bounded():
+    for cell in ({"row": -1, "col": 0, "letter": "A"},
+                 {"row": 0, "col": BOARD_MAX_SIZE, "letter": "A"},
+                 {"row": 0, "col": 0, "letter": "AB"}):
+        with pytest.raises(ValidationError):
+            CellSubmission.model_validate(cell)
+
+
+def test_malformed_requests_are_rejected_before_generation(client, monkeypatch):
+    def generate(*args, **kwargs):
+        raise AssertionError("generation must not run")
+
+    monkeypatch.setattr(generate_crossword, "_generate_crossword_events", generate)
+
+    responses = [
+        client.post("/api/generate_crossword", json={"board_size": {"rows": 1000, "cols": 10}}),
+        client.post("/api/generate_crossword/stream", json={"theme": ""}),
+        client.get("/api/crosswords/random", params={"rows": BOARD_MAX_SIZE + 1}),
+        client.post("/api/crosswords/batch", json={"puzzles": [{"count": BATCH_MAX_PUZZLES + 1}]}),
+        client.put("/api/game-sessions/session", json={"cells": [{"row": 0, "col": 0, "letter": "AB"}]}),
+    ]
+
+    assert [response.status_code for response in responses] == [422] * len(responses)
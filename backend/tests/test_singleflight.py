@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.api import generate_crossword
+from app.core.answers import AnswerIndexStore
+from app.core.singleflight import SingleFlight
+from app.crossword.models import CrosswordOutput, CrosswordWord
+
+
+def test_concurrent_calls_share_one_result():
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(3)))
+        return results, flight.in_flight("key")
+
+    results, in_flight = asyncio.run(run())
+
+    assert calls == [1]
+    assert sorted(results) == [("result", False), ("result", True), ("result", True)]
+    assert not in_flight
+
+
+def test_shared_call_survives_until_its_last_caller_is_cancelled():
+    started, cancelled = asyncio.Event(), []
+
+    async def fn():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("key", fn))
+        second = asyncio.ensure_future(flight.do("key", fn))
+        await started.wait()
+        first.cancel()
+        await asyncio.sleep(0)
+        still_running = list(cancelled)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        await asyncio.sleep(0)
+        return still_running, list(cancelled)
+
+    still_running, after = asyncio.run(run())
+
+    assert still_running == []
+    assert after == [1]
+
+
+def test_coalesced_requesters_get_their_own_shuffled_copy(monkeypatch):
+    answers = AnswerIndexStore(b"secret")
+    monkeypatch.setattr(generate_crossword, "get_answer_store", lambda: answers)
+    monkeypatch.setattr(generate_crossword, "COALESCE_SHUFFLE_WORDS", True)
+    layout = CrosswordOutput(words=[
+        CrosswordWord(id="1", word="horse", row=1, col=0, direction="across"),
+        CrosswordWord(id="2", word="hero", row=1, col=0, direction="down"),
+        CrosswordWord(id="3", word="ox", row=0, col=2, direction="down"),
+    ])
+    generated_words = [{"word": word.word, "definition": f"clue {word.id}"} for word in layout.words]
+    calls = []
+
+    async def generate(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.01)
+        return generate_crossword._transform_crossword_data(
+            generated_words, layout, [None] * len(generated_words), kwargs["board_size"]
+        )
+
+    monkeypatch.setattr(generate_crossword, "_generate_crossword_data", generate)
+
+    async def run():
+        return await asyncio.gather(*(
+            generate_crossword._generate_crossword_data_coalesced("Animals", "english", "easy", {"rows": 5, "cols": 5})
+            for _ in range(3)
+        ))
+
+    crosswords = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert len({id(crossword) for crossword in crosswords}) == 3
+    original = crosswords[0]
+    numbers = {word.id: number for word, number in zip(original.words, original.grid.numbers)}
+    for crossword in crosswords[1:]:
+        assert crossword.id == original.id
+        # Every word keeps its clue number whatever its position in the copy
+        assert {word.id: number for word, number in zip(crossword.words, crossword.grid.numbers)} == numbers
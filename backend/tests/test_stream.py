@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from app.api import generate_crossword
+from app.core.answers import AnswerIndexStore
+from app.core.tti import ImageGenerationResult
+from app.crossword.models import CrosswordOutput, CrosswordWord
+
+WORDS = [{"word": "horse", "definition": "clue 0"}, {"word": "hero", "definition": "clue 1"}]
+LAYOUT = CrosswordOutput(words=[
+    CrosswordWord(id="1", word="horse", row=1, col=0, direction="across"),
+    CrosswordWord(id="2", word="hero", row=1, col=0, direction="down"),
+])
+
+
+async def _events(theme, language, level, board_size):
+    yield "words", WORDS
+    yield "layout", LAYOUT
+    yield "image", (0, ImageGenerationResult(text="clue 0", url="https://images.test/0"))
+
+
+def _stream(monkeypatch):
+    answers = AnswerIndexStore(b"secret")
+    monkeypatch.setattr(generate_crossword, "get_answer_store", lambda: answers)
+    monkeypatch.setattr(generate_crossword, "_generate_crossword_events", _events)
+    monkeypatch.setattr(generate_crossword, "CROSSWORD_STORE_ENABLED", False)
+
+    async def run():
+        return [
+            event async for event in generate_crossword._stream_crossword_events(
+                "animals", "english", "easy", {"rows": 5, "cols": 5}
+            )
+        ]
+
+    events = []
+    for chunk in asyncio.run(run()):
+        name, data = chunk.strip().split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_events_carry_no_answers(monkeypatch):
+    events = _stream(monkeypatch)
+
+    assert [name for name, _ in events] == ["words", "layout", "image", "done"]
+    assert events[0][1] == {"count": 2}
+    assert events[2][1]["id"] == "1" and "word" not in events[2][1]
+    served = json.dumps([data for _, data in events]).upper()
+    assert "HORSE" not in served and "HERO" not in served
+
+
+def test_failure_after_the_pipeline_emits_an_error_event(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise RuntimeError("store is down")
+
+    monkeypatch.setattr(generate_crossword, "_save_crossword", fail)
+
+    events = _stream(monkeypatch)
+
+    assert events[-1] == ("error", {"detail": "Crossword generation failed"})
@@ -0,0 +1,52 @@
+from app.crossword.validation import validate_layout
+
+
+def word(id: str, text: str, row: int, col: int, direction: str) -> dict:
+    return {"id": id, "word": text, "row": row, "col": col, "direction": direction}
+
+
+def reasons(result) -> set:
+    return {conflict.reason for conflict in result.conflicts}
+
+
+def test_valid_crossing():
+    result = validate_layout([word("1", "horse", 0, 0, "across"), word("2", "hero", 0, 0, "down")])
+
+    assert result.is_valid_crossword
+    assert result.conflicts == []
+
+
+def test_letter_conflict_names_both_words():
+    result = validate_layout([word("1", "horse", 0, 0, "across"), word("2", "otter", 0, 1, "down"),
+                              word("3", "bear", 0, 2, "down")])
+
+    assert not result.is_valid_crossword
+    assert "letter_conflict" in reasons(result)
+    assert {"1", "3"} <= set(result.conflicting_word_ids)
+
+
+def test_out_of_bounds_and_invalid_words():
+    result = validate_layout([word("1", "horse", 0, 7, "across"), word("2", "a1", 3, 3, "down")])
+
+    assert {"out_of_bounds", "invalid_word"} <= reasons(result)
+
+
+def test_disconnected_group_is_reported():
+    result = validate_layout([
+        word("1", "horse", 0, 0, "across"),
+        word("2", "hero", 0, 0, "down"),
+        word("3", "camel", 8, 0, "across"),
+    ])
+
+    assert "disconnected" in reasons(result)
+    assert result.conflicting_word_ids == ["3"]
+
+
+def test_adjacent_parallel_words():
+    result = validate_layout([word("1", "horse", 0, 0, "across"), word("2", "otter", 1, 0, "across")])
+
+    assert "adjacent_run" in reasons(result)
+
+
+def test_empty_layout_is_invalid():
+    assert not validate_layout([]).is_valid_crossword
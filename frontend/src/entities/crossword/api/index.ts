@@ -3,7 +3,9 @@ import type {
   CrosswordData, 
   CreateCrosswordRequest, 
   GameSession,
-  CrosswordApiResponse 
+  GameSessionUpdate,
+  CrosswordApiResponse,
+  CrosswordListResponse
 } from '@/entities/crossword/types'
 
 export const crosswordApi = {
@@ -20,13 +22,12 @@ export const crosswordApi = {
     return apiClient.post<CrosswordData>('/crosswords', data)
   },
 
-  async getCrosswords(page = 1, limit = 10): Promise<{
-    crosswords: CrosswordData[]
-    total: number
-    page: number
-    totalPages: number
-  }> {
-    return apiClient.get(`/crosswords?page=${page}&limit=${limit}`)
+  async getCrosswords(cursor?: string | null, limit = 10): Promise<CrosswordListResponse> {
+    const params = new URLSearchParams({ limit: String(limit) })
+    if (cursor) {
+      params.set('cursor', cursor)
+    }
+    return apiClient.get<CrosswordListResponse>(`/crosswords?${params}`)
   },
 
   async startGameSession(crosswordId: string): Promise<GameSession> {
@@ -35,7 +36,7 @@ export const crosswordApi = {
 
   async updateGameSession(
     sessionId: string, 
-    data: Partial<Pick<GameSession, 'score' | 'completed' | 'endTime'>>
+    data: GameSessionUpdate
   ): Promise<GameSession> {
     return apiClient.put<GameSession>(`/game-sessions/${sessionId}`, data)
   },
@@ -1,97 +1,126 @@
-import type { CrosswordApiResponse, CrosswordData, GridCell, Word, ApiWord } from '@/entities/crossword/types'
+import type { CompactGrid, CrosswordApiResponse, CrosswordData, GridCell, Word, ApiWord } from '@/entities/crossword/types'
 
-function transformWords(apiWords: ApiWord[]): Word[] {
-  const transformedWords = apiWords.map((apiWord: ApiWord) => ({
-    id: apiWord.id,
-    word: apiWord.word,
-    clue: apiWord.definition,
-    clueImage: apiWord.clueImage,
-    direction: apiWord.coordinate.direction,
-    coordinate: {
-      row: apiWord.coordinate.row,
-      col: apiWord.coordinate.col
-    },
-    number: 0
-  }))
-  
-  const sortedWords = [...transformedWords].sort((a, b) => {
-    if (a.coordinate.row !== b.coordinate.row) {
-      return a.coordinate.row - b.coordinate.row
-    }
-    return a.coordinate.col - b.coordinate.col
-  })
+const BLOCK = '.'
+const NO_WORD = 0
+
+interface WordSpan {
+  start: number
+  length: number
+  direction: 'across' | 'down'
+}
 
-  return sortedWords.map((word, index) => ({
-    ...word,
-    number: index + 1
-  }))
+function decodeOwners(encoded: string): Uint8Array {
+  return Uint8Array.from(atob(encoded), (char) => char.charCodeAt(0))
 }
 
-function createGrid(words: Word[], size: { rows: number; cols: number }): (GridCell | null)[][] {
-  const grid: (GridCell | null)[][] = Array(size.rows)
-    .fill(null)
-    .map(() => Array(size.cols).fill(null))
+// Start, direction and length of every word, read off the cell-to-word index
+function readSpans(across: Uint8Array, down: Uint8Array, wordCount: number): WordSpan[] {
+  const spans: WordSpan[] = Array.from({ length: wordCount }, () => ({ start: -1, length: 0, direction: 'across' }))
+  const directions: ['across' | 'down', Uint8Array][] = [['across', across], ['down', down]]
 
-  words.forEach((word) => {
-    const { row, col } = word.coordinate
-    const letters = word.word.split('')
-    
-    letters.forEach((letter, index) => {
-      const currentRow = word.direction === 'down' ? row + index : row
-      const currentCol = word.direction === 'across' ? col + index : col
-      
-      if (currentRow < size.rows && currentCol < size.cols) {
-        if (!grid[currentRow][currentCol]) {
-          grid[currentRow][currentCol] = {
-            letter: '',
-            isCorrect: false,
-            isEmpty: true,
-            wordIds: [],
-            correct: letter.toUpperCase(),
-            isWordStart: false
-          }
-        }
-        
-        if (index === 0) {
-          grid[currentRow][currentCol]!.isWordStart = true
-          grid[currentRow][currentCol]!.wordNumber = word.number
-        }
-        
-        grid[currentRow][currentCol]!.wordIds.push(word.id)
+  for (let position = 0; position < across.length; position++) {
+    directions.forEach(([direction, owners]) => {
+      const owner = owners[position]
+      if (owner === NO_WORD) return
+      const span = spans[owner - 1]
+      if (span.start === -1) {
+        span.start = position
+        span.direction = direction
       }
+      span.length++
     })
-  })
+  }
 
-  return grid
+  return spans
 }
 
-function generateAvailableLetters(grid: (GridCell | null)[][]): string[] {
-  const availableLetters: string[] = []
-  
-  grid.forEach((row) => {
-    row.forEach((cell) => {
-      if (cell && cell.correct) {
-        availableLetters.push(cell.correct)
+function transformWords(apiWords: ApiWord[], spans: WordSpan[], numbers: number[], cols: number): Word[] {
+  return apiWords
+    .map((apiWord: ApiWord, index: number) => ({
+      id: apiWord.id,
+      length: spans[index].length,
+      clue: apiWord.definition,
+      clueImage: apiWord.clueImage,
+      clueImageSrcSet: apiWord.clueImageSrcSet || undefined,
+      direction: spans[index].direction,
+      coordinate: {
+        row: Math.floor(spans[index].start / cols),
+        col: spans[index].start % cols
+      },
+      number: numbers[index]
+    }))
+    .sort((a, b) => a.number - b.number)
+}
+
+function createGridFromCompact(
+  compact: CompactGrid,
+  across: Uint8Array,
+  down: Uint8Array,
+  apiWords: ApiWord[],
+  words: Word[],
+  size: { rows: number; cols: number }
+): (GridCell | null)[][] {
+  const cells = Array.from(compact.letters)
+  const byNumber = (a: number, b: number) => compact.numbers[a - 1] - compact.numbers[b - 1]
+
+  const grid: (GridCell | null)[][] = []
+  for (let row = 0; row < size.rows; row++) {
+    const line: (GridCell | null)[] = []
+    for (let col = 0; col < size.cols; col++) {
+      const position = row * size.cols + col
+      const cell = cells[position]
+      if (!cell || cell === BLOCK) {
+        line.push(null)
+        continue
       }
-    })
+      const owners = [across[position], down[position]]
+        .filter((owner) => owner !== NO_WORD)
+        .sort(byNumber)
+      line.push({
+        letter: '',
+        isCorrect: false,
+        isEmpty: true,
+        wordIds: owners.map((owner) => apiWords[owner - 1].id),
+        isWordStart: false
+      })
+    }
+    grid.push(line)
+  }
+
+  // Words are sorted by number, so a shared start cell shows the last number
+  words.forEach((word) => {
+    const cell = grid[word.coordinate.row]?.[word.coordinate.col]
+    if (cell) {
+      cell.isWordStart = true
+      cell.wordNumber = word.number
+    }
   })
-  
+
+  return grid
+}
+
+function generateAvailableLetters(tiles: string): string[] {
+  const availableLetters = Array.from(tiles)
   availableLetters.sort(() => Math.random() - 0.5)
   return availableLetters
 }
 
 export function transformApiData(apiData: CrosswordApiResponse): CrosswordData {
   const size = apiData.board_size
-  const words = transformWords(apiData.words)
-  const grid = createGrid(words, size)
-  const availableLetters = generateAvailableLetters(grid)
+  const compact = apiData.grid
+  const across = decodeOwners(compact.across)
+  const down = decodeOwners(compact.down)
+  const spans = readSpans(across, down, apiData.words.length)
+  const words = transformWords(apiData.words, spans, compact.numbers, size.cols)
+  const grid = createGridFromCompact(compact, across, down, apiData.words, words, size)
+  const availableLetters = generateAvailableLetters(apiData.tiles)
 
   return {
     grid,
     words,
     availableLetters,
     size,
-    id: `crossword-${Date.now()}`
+    id: apiData.id
   }
 }
 
@@ -1,7 +1,7 @@
 import { useState, useCallback, useEffect } from 'react'
 import { crosswordApi } from '../api'
 import { useAsync } from '@/shared/hooks/useAsync'
-import type { GameSession, CrosswordApiResponse } from '@/entities/crossword/types'
+import type { GameSession, GameSessionUpdate, CrosswordApiResponse } from '@/entities/crossword/types'
 
 export function useCrossword(crosswordId?: string) {
   const {
@@ -52,7 +52,7 @@ export function useGameSession() {
     loading: updateLoading,
     error: updateError,
     execute: executeUpdateSession
-  } = useAsync<GameSession, [string, Partial<Pick<GameSession, 'score' | 'completed' | 'endTime'>>]>(crosswordApi.updateGameSession)
+  } = useAsync<GameSession, [string, GameSessionUpdate]>(crosswordApi.updateGameSession)
 
   // Обновляем локальное состояние когда приходят новые данные
   useEffect(() => {
@@ -77,9 +77,8 @@ export function useGameSession() {
     }
   }, [executeStartSession, sessionData])
 
-  const updateSession = useCallback(async (
-    data: Partial<Pick<GameSession, 'score' | 'completed' | 'endTime'>>
-  ) => {
+  // Счет и завершение игры сервер считает сам по отправленным ячейкам
+  const updateSession = useCallback(async (data: GameSessionUpdate) => {
     if (!session) return null
     
     try {
@@ -91,19 +90,10 @@ export function useGameSession() {
     }
   }, [session, executeUpdateSession, updateData])
 
-  const endSession = useCallback(async (score: number): Promise<GameSession | null> => {
-    return await updateSession({
-      score,
-      completed: true,
-      endTime: new Date().toISOString()
-    })
-  }, [updateSession])
-
   return {
     session,
     startSession,
     updateSession,
-    endSession,
     loading: startLoading || updateLoading,
     error: startError || updateError,
   }
@@ -53,7 +53,7 @@ export function validateWord(word: Word, gridSize: { rows: number; cols: number
     errors.push(`Слово ${index + 1}: отсутствует ID`)
   }
 
-  if (!word.word || word.word.length === 0) {
+  if (!word.length || word.length <= 0) {
     errors.push(`Слово ${index + 1}: пустое слово`)
   }
 
@@ -80,7 +80,7 @@ export function validateWord(word: Word, gridSize: { rows: number; cols: number
     }
 
     // Проверка, что слово помещается в сетку
-    const wordLength = word.word.length
+    const wordLength = word.length
     if (word.direction === 'across' && col + wordLength > gridSize.cols) {
       errors.push(`Слово ${index + 1}: выходит за границы сетки по горизонтали`)
     }
@@ -99,49 +99,17 @@ export function validateWord(word: Word, gridSize: { rows: number; cols: number
 }
 
 /**
- * Валидация состояния игры
- */
-export function validateGameState(
-  grid: (GridCell | null)[][],
-  words: Word[]
-): { isValid: boolean; errors: string[] } {
-  const errors: string[] = []
-
-  // Проверка соответствия букв в сетке
-  words.forEach((word) => {
-    const { row, col } = word.coordinate
-    const letters = word.word.split('')
-
-    letters.forEach((expectedLetter, index) => {
-      const currentRow = word.direction === 'down' ? row + index : row
-      const currentCol = word.direction === 'across' ? col + index : col
-
-      const cell = grid[currentRow]?.[currentCol]
-      if (cell && cell.letter && cell.letter !== expectedLetter.toUpperCase()) {
-        errors.push(`Неправильная буква в позиции [${currentRow}, ${currentCol}] для слова "${word.word}"`)
-      }
-    })
-  })
-
-  return {
-    isValid: errors.length === 0,
-    errors
-  }
-}
-
-/**
- * Проверка завершенности слова
+ * Проверка завершенности слова: все его ячейки подтверждены сервером
  */
 export function isWordComplete(word: Word, grid: (GridCell | null)[][]): boolean {
   const { row, col } = word.coordinate
-  const letters = word.word.split('')
 
-  return letters.every((expectedLetter, index) => {
+  return Array.from({ length: word.length }).every((_, index) => {
     const currentRow = word.direction === 'down' ? row + index : row
     const currentCol = word.direction === 'across' ? col + index : col
 
     const cell = grid[currentRow]?.[currentCol]
-    return cell && cell.letter === expectedLetter.toUpperCase()
+    return cell?.isCorrect === true
   })
 }
 
@@ -1,8 +1,9 @@
 export interface Word {
   id: string
-  word: string
+  length: number
   clue: string
   clueImage?: string
+  clueImageSrcSet?: string
   direction: "across" | "down"
   coordinate: {
     row: number
@@ -13,14 +14,9 @@ export interface Word {
 
 export interface ApiWord {
   id: string
-  word: string
   definition: string
   clueImage?: string
-  coordinate: {
-    row: number
-    col: number
-    direction: "across" | "down"
-  }
+  clueImageSrcSet?: string
 }
 
 export interface GridCell {
@@ -28,17 +24,49 @@ export interface GridCell {
   isCorrect: boolean
   isEmpty: boolean
   wordIds: string[]
-  correct?: string
   isWordStart?: boolean
   wordNumber?: number
 }
 
+export interface CompactGrid {
+  // Row-major cells, "_" for open and "." for blocked cells; letters stay on the server
+  letters: string
+  // Per cell, base64 bytes: 1 + index into words of the across/down word covering it, or 0
+  across: string
+  down: string
+  // Clue number of each word, in words order
+  numbers: number[]
+}
+
 export interface CrosswordApiResponse {
+  id?: string
   words: ApiWord[]
   board_size: {
     rows: number
     cols: number
   }
+  grid: CompactGrid
+  // Letters to place, in alphabetical order
+  tiles: string
+}
+
+export interface CrosswordSummary {
+  id: string
+  theme: string
+  language: string
+  level: string
+  board_size: {
+    rows: number
+    cols: number
+  }
+  wordCount: number
+  createdAt: number
+}
+
+export interface CrosswordListResponse {
+  crosswords: CrosswordSummary[]
+  // Cursor of the next page, null on the last page
+  nextCursor: string | null
 }
 
 export interface CrosswordData {
@@ -75,4 +103,19 @@ export interface GameSession {
   endTime?: string
   createdAt: string
   updatedAt: string
+  solvedCells?: number
+  totalCells?: number
+  // Correctness of each cell of the last submission, in submission order
+  results?: boolean[]
+}
+
+export interface CellSubmission {
+  row: number
+  col: number
+  letter: string
+}
+
+// Score, completion and end time are computed by the server from the solved cells
+export interface GameSessionUpdate {
+  cells: CellSubmission[]
 }
\ No newline at end of file
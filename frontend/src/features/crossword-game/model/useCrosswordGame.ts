@@ -1,7 +1,33 @@
-import { useState, useCallback } from 'react'
+import { useState, useCallback, useRef } from 'react'
 import type { GridCell, Word, GameState, CrosswordData } from '@/entities/crossword/types'
+import { crosswordApi } from '@/entities/crossword/api'
 import { isWordComplete } from '@/entities/crossword/model/validation'
 
+// Отмечаем слова, все ячейки которых подтверждены сервером
+function withCompletedWords(state: GameState, words: Word[]): GameState {
+  const completedWords = new Set(
+    words.filter((word) => isWordComplete(word, state.grid)).map((word) => word.id)
+  )
+
+  return { ...state, completedWords }
+}
+
+function withCell(
+  grid: (GridCell | null)[][],
+  rowIndex: number,
+  colIndex: number,
+  update: Partial<GridCell>
+): (GridCell | null)[][] {
+  return grid.map((row, rIdx) =>
+    row.map((cell, cIdx) => {
+      if (rIdx === rowIndex && cIdx === colIndex && cell) {
+        return { ...cell, ...update }
+      }
+      return cell
+    })
+  )
+}
+
 export function useCrosswordGame(initialData?: CrosswordData) {
   const [gameState, setGameState] = useState<GameState>(() => ({
     grid: initialData?.grid || [],
@@ -11,10 +37,13 @@ export function useCrosswordGame(initialData?: CrosswordData) {
     selectedClue: null,
   }))
 
+  // Id игровой сессии, в которой сервер проверяет буквы (null без сессии, например у демо-данных)
+  const session = useRef<Promise<string | null>>(Promise.resolve(null))
+
   // Инициализация игры с новыми данными
   const initializeGame = useCallback((data: CrosswordData) => {
     setGameState({
-      grid: data.grid.map(row => 
+      grid: data.grid.map(row =>
         row.map(cell => cell ? { ...cell, letter: "", isCorrect: false } : null)
       ),
       availableLetters: [...data.availableLetters],
@@ -22,70 +51,45 @@ export function useCrosswordGame(initialData?: CrosswordData) {
       score: 0,
       selectedClue: null,
     })
-  }, [])
 
-  const updateLetterCorrectness = useCallback((
-    currentGrid: (GridCell | null)[][],
-    words: Word[]
-  ) => {
-    return currentGrid.map((row, rowIndex) => 
-      row.map((cell, colIndex) => {
-        if (!cell || !cell.letter) return cell
-        
-        const isCorrect = words.some(word => {
-          const { row: startRow, col: startCol } = word.coordinate
-          const letters = word.word.split('')
-          
-          return letters.some((correctLetter, letterIndex) => {
-            const cellRow = word.direction === 'down' ? startRow + letterIndex : startRow
-            const cellCol = word.direction === 'across' ? startCol + letterIndex : startCol
-            return cellRow === rowIndex && 
-                   cellCol === colIndex && 
-                   cell.letter === correctLetter.toUpperCase()
+    session.current = data.id
+      ? crosswordApi.startGameSession(data.id)
+          .then((started) => started.id)
+          .catch((error) => {
+            console.error('Failed to start session:', error)
+            return null
           })
-        })
-        
-        return { ...cell, isCorrect }
-      })
-    )
+      : Promise.resolve(null)
   }, [])
 
-  const checkCompletedWords = useCallback((
-    currentGrid: (GridCell | null)[][],
-    words: Word[]
-  ) => {
-    const completedWords = new Set(gameState.completedWords)
-    let score = gameState.score
-
-    words.forEach((word) => {
-      if (isWordComplete(word, currentGrid) && !completedWords.has(word.id)) {
-        completedWords.add(word.id)
-        score += word.word.length * 10
-      }
-    })
-
-    return { completedWords, score }
-  }, [gameState.completedWords, gameState.score])
-
-  // Вспомогательная функция для обновления состояния игры
-  const updateGameState = useCallback((
-    newGrid: (GridCell | null)[][],
-    newAvailableLetters: string[],
+  // Проверка буквы на сервере; ответ применяется, только если ячейка с тех пор не изменилась.
+  // Счет тоже считает сервер по решенным ячейкам
+  const submitCell = useCallback(async (
+    rowIndex: number,
+    colIndex: number,
+    letter: string,
     words: Word[]
   ) => {
-    const gridWithCorrectness = updateLetterCorrectness(newGrid, words)
-    const { completedWords, score } = checkCompletedWords(gridWithCorrectness, words)
+    const pending = session.current
+    const sessionId = await pending
+    if (!sessionId) return
 
-    setGameState(prev => ({
-      ...prev,
-      grid: gridWithCorrectness,
-      availableLetters: newAvailableLetters,
-      completedWords,
-      score,
-    }))
+    try {
+      const { results, score } = await crosswordApi.updateGameSession(sessionId, {
+        cells: [{ row: rowIndex, col: colIndex, letter }]
+      })
+      if (session.current !== pending) return
 
-    return true
-  }, [updateLetterCorrectness, checkCompletedWords])
+      const isCorrect = results?.[0] === true
+      setGameState(prev => {
+        const cell = prev.grid[rowIndex]?.[colIndex]
+        if (!cell || cell.letter !== letter) return { ...prev, score }
+        return withCompletedWords({ ...prev, score, grid: withCell(prev.grid, rowIndex, colIndex, { isCorrect }) }, words)
+      })
+    } catch (error) {
+      console.error('Failed to check letter:', error)
+    }
+  }, [])
 
   // Размещение буквы на сетке
   const placeLetter = useCallback((
@@ -100,16 +104,7 @@ export function useCrosswordGame(initialData?: CrosswordData) {
 
     // Запоминаем старую букву для возврата в доступные
     const oldLetter = cell.letter
-
-    // Создаем новую сетку с обновленной ячейкой
-    const newGrid = gameState.grid.map((row, rIdx) =>
-      row.map((cell, cIdx) => {
-        if (rIdx === rowIndex && cIdx === colIndex && cell) {
-          return { ...cell, letter: letter.toUpperCase() }
-        }
-        return cell
-      })
-    )
+    const newLetter = letter.toUpperCase()
 
     // Обновляем доступные буквы
     const newAvailableLetters = [...gameState.availableLetters]
@@ -118,31 +113,33 @@ export function useCrosswordGame(initialData?: CrosswordData) {
       newAvailableLetters.push(oldLetter)
     }
 
-    return updateGameState(newGrid, newAvailableLetters, words)
-  }, [gameState.grid, gameState.availableLetters, updateGameState])
+    setGameState(prev => ({
+      ...prev,
+      grid: withCell(prev.grid, rowIndex, colIndex, { letter: newLetter, isCorrect: false }),
+      availableLetters: newAvailableLetters,
+    }))
+    submitCell(rowIndex, colIndex, newLetter, words)
+
+    return true
+  }, [gameState.grid, gameState.availableLetters, submitCell])
 
   // Удаление буквы с сетки
   const removeLetter = useCallback((rowIndex: number, colIndex: number, words: Word[]) => {
     const cell = gameState.grid[rowIndex]?.[colIndex]
     if (!cell?.letter) return false
 
-    const removedLetter = cell.letter
-
-    // Создаем новую сетку с очищенной ячейкой
-    const newGrid = gameState.grid.map((row, rIdx) =>
-      row.map((cell, cIdx) => {
-        if (rIdx === rowIndex && cIdx === colIndex && cell) {
-          return { ...cell, letter: "", isCorrect: false }
-        }
-        return cell
-      })
-    )
-
     // Возвращаем букву в доступные
-    const newAvailableLetters = [...gameState.availableLetters, removedLetter]
+    const newAvailableLetters = [...gameState.availableLetters, cell.letter]
 
-    return updateGameState(newGrid, newAvailableLetters, words)
-  }, [gameState.grid, gameState.availableLetters, updateGameState])
+    setGameState(prev => ({
+      ...prev,
+      grid: withCell(prev.grid, rowIndex, colIndex, { letter: "", isCorrect: false }),
+      availableLetters: newAvailableLetters,
+    }))
+    submitCell(rowIndex, colIndex, "", words)
+
+    return true
+  }, [gameState.grid, gameState.availableLetters, submitCell])
 
   // Обработчик drag & drop
   const handleLetterDrop = useCallback((
@@ -177,4 +174,4 @@ export function useCrosswordGame(initialData?: CrosswordData) {
     selectClue,
     isGameComplete,
   }
-}
\ No newline at end of file
+}
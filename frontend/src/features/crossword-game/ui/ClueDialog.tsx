@@ -30,14 +30,16 @@ export function ClueDialog({ word, open, onOpenChange }: ClueDialogProps) {
               {word.number}
             </Badge>
             <Badge variant="outline" className="text-sm px-3 py-1">
-              {getDirectionText(word.direction, word.word.length)}
+              {getDirectionText(word.direction, word.length)}
             </Badge>
           </div>
 
           <div className="w-full">
             <img
               src={word.clueImage || "/placeholder.svg"}
-              alt={`Clue for ${word.word}`}
+              srcSet={word.clueImage ? word.clueImageSrcSet : undefined}
+              sizes="(max-width: 640px) 95vw, 512px"
+              alt={`Clue ${word.number}`}
               className="w-full h-48 object-cover rounded-lg border border-gray-200 shadow-sm"
             />
           </div>
@@ -44,7 +44,7 @@ export function TextClues({
                 {word.clue}
               </span>
               <Badge variant="secondary" className="text-xs">
-                {word.word.length}
+                {word.length}
               </Badge>
               {completedWords.has(word.id) && (
                 <CheckCircle className="w-4 h-4 text-green-600" />
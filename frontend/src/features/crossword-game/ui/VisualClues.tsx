@@ -33,7 +33,9 @@ export function VisualClues({
             <div className="bg-white rounded-lg border-2 border-gray-200 shadow-sm hover:shadow-md transition-shadow">
               <img
                 src={word.clueImage || "/placeholder.svg"}
-                alt={`Подсказка для слова ${word.word}`}
+                srcSet={word.clueImage ? word.clueImageSrcSet : undefined}
+                sizes="160px"
+                alt={`Подсказка ${word.number}`}
                 className="w-full h-20 object-cover rounded-t-lg"
               />
               <div className="p-2">
@@ -54,7 +56,7 @@ export function VisualClues({
             </div>
             <div className="absolute top-1 right-1">
               <Badge variant="outline" className="text-xs">
-                {word.direction === "across" ? "→" : "↓"} {word.word.length}
+                {word.direction === "across" ? "→" : "↓"} {word.length}
               </Badge>
             </div>
             {completedWords.has(word.id) && (